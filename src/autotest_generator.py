@@ -3,18 +3,22 @@ import json
 import re
 import codecs
 import os
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 from pathlib import Path
 
 from .test_case_models import TestSuite, TestCase
 from .mistral_client import MistralClient
 from .files_util import FilesUtil
-from .test_case_parser import extract_json_from_response, extract_assistant_content, extract_code_from_response # Updated import
+from .test_case_parser import extract_json_from_response, extract_assistant_content, extract_code_from_response, IncrementalCodeExtractor
 
 class AutotestGenerator:
     GENERATION_PROMPT_PATH = "prompts/03_autotest_from_testcase.txt"
     CODE_REVIEW_PROMPT_PATH = "prompts/04_code_review.txt" # Now for consolidated review
     OUTPUT_DIR = "tests"
+    MAX_WORKERS = 4 # Concurrent LLM calls for per-test-case generation
+    STREAM_RESPONSES = True # Stream completions and stop as soon as the ```python block is closed
 
     @staticmethod
     def _sanitize_test_name(title: str, test_id: str) -> str:
@@ -27,11 +31,76 @@ class AutotestGenerator:
         return f"test_{sanitized_title.lower()}_{test_id.lower()}"
 
     @staticmethod
-    def generate_for_test_suite(test_suite_json_path: str, page_object_code: str):
+    def _generate_for_test_case(test_case: TestCase, generation_prompt_template: str, page_object_code: str,
+                                output_dir: str = ".") -> Tuple[str, str]:
+        """
+        Generates and saves the autotest file for a single test case.
+
+        Args:
+            test_case: The test case to generate an autotest for.
+            generation_prompt_template: The autotest generation prompt template.
+            page_object_code: The Python code of the Page Object used by the test.
+            output_dir: Directory the tests/ directory is created in.
+
+        Returns:
+            A tuple of the generated test file name and the generated code.
+        """
+        # Prepare the prompt for this specific test case
+        test_case_json_str = test_case.model_dump_json(indent=2)
+        prompt_for_llm = generation_prompt_template.replace("{{TEST_CASE_JSON}}", test_case_json_str)
+        prompt_for_llm = prompt_for_llm.replace("{{PAGE_OBJECT_CODE}}", page_object_code)
+
+        raw_llm_response_code = "N/A"
+        try:
+            if AutotestGenerator.STREAM_RESPONSES:
+                # Stream the completion and cut it off once the code block is complete
+                generated_code_str = MistralClient.call_streaming(prompt_for_llm, IncrementalCodeExtractor())
+            else:
+                # Call LLM to generate code
+                raw_llm_response_code = MistralClient.call(prompt_for_llm)
+
+                # Extract the assistant's content from the raw API response JSON
+                llm_response_content_for_code = extract_assistant_content(raw_llm_response_code)
+
+                # Extract clean code from markdown fences within the content
+                generated_code_str = extract_code_from_response(llm_response_content_for_code)
+
+            # Decode escape sequences like \n and \t into real characters
+            final_code = codecs.decode(generated_code_str, 'unicode_escape')
+
+            # Sanitize test name for filename and function name
+            file_name_base = AutotestGenerator._sanitize_test_name(test_case.title, test_case.id)
+            test_file_name = file_name_base + ".py"
+            output_test_file_path = Path(output_dir) / AutotestGenerator.OUTPUT_DIR / test_file_name
+
+            FilesUtil.write(str(output_test_file_path), final_code)
+            return test_file_name, final_code
+        except Exception as e:
+            raise RuntimeError(f"{e} (raw LLM response: {raw_llm_response_code})") from e
+
+    @staticmethod
+    def generate_for_test_suite(test_suite_json_path: str, page_object_code: str, max_workers: Optional[int] = None,
+                                output_dir: str = "."):
         """
         Generates autotest files for each test case, then performs a single consolidated
         code review for all generated tests.
+
+        Test cases are generated concurrently by up to `max_workers` threads, since each
+        generation is almost entirely LLM network wait. The consolidated review always
+        lists the tests in test suite order, and a failed test case does not stop the others.
+
+        Args:
+            test_suite_json_path: Path to the JSON file with the test suite.
+            page_object_code: The Python code of the Page Object used by the tests.
+            max_workers: Maximum number of concurrent LLM calls. Defaults to MAX_WORKERS;
+                         1 generates test cases sequentially.
+            output_dir: Directory the tests/ and generated/ directories are created in
+                        (the project root by default).
         """
+        if max_workers is None:
+            max_workers = AutotestGenerator.MAX_WORKERS
+        max_workers = max(1, max_workers)
+
         try:
             test_suite_json = FilesUtil.read(test_suite_json_path)
             test_suite: TestSuite = TestSuite.model_validate_json(test_suite_json)
@@ -44,59 +113,63 @@ class AutotestGenerator:
             return
 
         # Ensure output directory for tests exists
-        Path(AutotestGenerator.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+        tests_dir = Path(output_dir) / AutotestGenerator.OUTPUT_DIR
+        tests_dir.mkdir(parents=True, exist_ok=True)
         # Ensure 'generated' directory exists for the consolidated review file
-        Path("generated").mkdir(parents=True, exist_ok=True)
+        generated_dir = Path(output_dir) / "generated"
+        generated_dir.mkdir(parents=True, exist_ok=True)
 
 
         autotest_generation_prompt_template = FilesUtil.read(AutotestGenerator.GENERATION_PROMPT_PATH)
         code_review_prompt_template = FilesUtil.read(AutotestGenerator.CODE_REVIEW_PROMPT_PATH)
 
-        all_generated_code_blocks = [] # To collect code for consolidated review
-
-        print(f"\nStarting autotest generation for {len(test_suite.testcases)} test cases...")
-        for test_case in test_suite.testcases:
-            print(f"-> Generating code for Test Case ID: {test_case.id} - '{test_case.title}'")
-
-            # Prepare the prompt for this specific test case
-            test_case_json_str = test_case.model_dump_json(indent=2)
-            prompt_for_llm = autotest_generation_prompt_template.replace("{{TEST_CASE_JSON}}", test_case_json_str)
-            prompt_for_llm = prompt_for_llm.replace("{{PAGE_OBJECT_CODE}}", page_object_code)
+        test_cases = test_suite.testcases
+        # One slot per test case, filled in as generations finish, so ordering stays deterministic
+        generated_files: List[Optional[Tuple[str, str]]] = [None] * len(test_cases)
+        latencies: List[float] = [0.0] * len(test_cases)
 
+        def generate(index: int) -> Tuple[str, str]:
+            started_at = time.perf_counter()
             try:
-                # Call LLM to generate code
-                raw_llm_response_code = MistralClient.call(prompt_for_llm)
-                
-                # Extract the assistant's content from the raw API response JSON
-                llm_response_content_for_code = extract_assistant_content(raw_llm_response_code)
-                
-                # Extract clean code from markdown fences within the content
-                generated_code_str = extract_code_from_response(llm_response_content_for_code)
-                
-                # Decode escape sequences like \n and \t into real characters
-                final_code = codecs.decode(generated_code_str, 'unicode_escape')
-
-                # Sanitize test name for filename and function name
-                file_name_base = AutotestGenerator._sanitize_test_name(test_case.title, test_case.id)
-                test_file_name = file_name_base + ".py"
-                output_test_file_path = Path(AutotestGenerator.OUTPUT_DIR) / test_file_name
-
-                FilesUtil.write(str(output_test_file_path), final_code)
-                print(f"   Generated: {output_test_file_path}")
-
-                # Collect code for consolidated review
-                all_generated_code_blocks.append(f"\n--- FILE: {test_file_name} ---\n\n{final_code}")
-
-
-            except Exception as e:
-                print(f"   Error generating code for {test_case.id}: {e}")
-                print(f"   Raw LLM response (code generation): {raw_llm_response_code if 'raw_llm_response_code' in locals() else 'N/A'}")
+                return AutotestGenerator._generate_for_test_case(
+                    test_cases[index], autotest_generation_prompt_template, page_object_code, output_dir
+                )
+            finally:
+                latencies[index] = time.perf_counter() - started_at
+
+        print(f"\nStarting autotest generation for {len(test_cases)} test cases ({max_workers} worker(s))...")
+        generation_started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(generate, index): index for index in range(len(test_cases))}
+            for future in as_completed(futures):
+                index = futures[future]
+                test_case = test_cases[index]
+                try:
+                    generated_files[index] = future.result()
+                    output_test_file_path = tests_dir / generated_files[index][0]
+                    print(f"-> Generated {test_case.id} - '{test_case.title}': {output_test_file_path} ({latencies[index]:.1f}s)")
+                except Exception as e:
+                    print(f"   Error generating code for {test_case.id} ({latencies[index]:.1f}s): {e}")
+        wall_time = time.perf_counter() - generation_started_at
+
+        # Collect code for consolidated review in test suite order
+        all_generated_code_blocks = [
+            f"\n--- FILE: {test_file_name} ---\n\n{final_code}"
+            for test_file_name, final_code in filter(None, generated_files)
+        ]
+
+        total_latency = sum(latencies)
+        speedup = total_latency / wall_time if wall_time > 0 else 1.0
+        print(
+            f"-> {len(all_generated_code_blocks)}/{len(test_cases)} autotests generated in {wall_time:.1f}s "
+            f"(sum of per-case latencies {total_latency:.1f}s, speedup x{speedup:.2f})"
+        )
 
         print("\nAutotest generation finished.")
 
         # --- Perform Consolidated Code Review for all tests ---
         if all_generated_code_blocks:
-            print(f"\nPerforming consolidated code review for {len(test_suite.testcases)} tests...")
+            print(f"\nPerforming consolidated code review for {len(all_generated_code_blocks)} tests...")
             full_code_for_review = "".join(all_generated_code_blocks)
             
             review_prompt_for_llm = code_review_prompt_template.replace("{{ALL_TEST_CODE}}", full_code_for_review)
@@ -104,7 +177,7 @@ class AutotestGenerator:
             
             review_content = extract_assistant_content(raw_llm_response_review)
             
-            consolidated_review_path = "generated/all_code_reviews.txt"
+            consolidated_review_path = str(generated_dir / "all_code_reviews.txt")
             FilesUtil.write(consolidated_review_path, review_content)
             print(f"-> Consolidated code review report saved to '{consolidated_review_path}'")
         else:
@@ -17,7 +17,8 @@ class BugDetector:
         original_checklist: str,
         generated_test_cases_json: str,
         generated_autotests_code: str,
-        ai_code_review: str
+        ai_code_review: str,
+        output_dir: str = "."
     ) -> Path:
         """
         Analyzes all generated artifacts to detect potential defects and
@@ -28,6 +29,7 @@ class BugDetector:
             generated_test_cases_json: JSON string of the generated test cases.
             generated_autotests_code: Consolidated code of all generated autotests.
             ai_code_review: Consolidated AI code review for all autotests.
+            output_dir: Directory the generated/ directory is created in.
 
         Returns:
             Path to the generated JSON file (either a bug report or status).
@@ -56,9 +58,10 @@ class BugDetector:
                 bug_detection_output: BugDetectionOutput = NoBugsFoundStatus.model_validate_json(json_str)
             
             # Ensure output directory exists
-            Path("generated").mkdir(parents=True, exist_ok=True)
+            generated_dir = Path(output_dir) / "generated"
+            generated_dir.mkdir(parents=True, exist_ok=True)
             
-            output_file_path = Path("generated") / BugDetector.OUTPUT_FILE_NAME
+            output_file_path = generated_dir / BugDetector.OUTPUT_FILE_NAME
             FilesUtil.write(str(output_file_path), bug_detection_output.model_dump_json(indent=2))
             
             print(f"-> Bug detection report saved to '{output_file_path}'")
@@ -13,7 +13,7 @@ class BugReportGenerator:
     OUTPUT_DIR = "generated"
 
     @staticmethod
-    def generate_bug_report(failure_facts: str, suffix: str = "") -> Path:
+    def generate_bug_report(failure_facts: str, suffix: str = "", output_dir: str = ".") -> Path:
         """
         Generates a structured bug report based on provided failure facts.
 
@@ -21,6 +21,7 @@ class BugReportGenerator:
             failure_facts: A string containing details about the test failure
                            (steps, input data, expected/actual results, errors, stack traces).
             suffix: An optional string suffix to append to the bug report filename (e.g., "_1", "_2").
+            output_dir: Directory the generated/ directory is created in.
 
         Returns:
             Path to the generated bug report JSON file.
@@ -41,10 +42,11 @@ class BugReportGenerator:
             bug_report_data = BugReport.model_validate_json(json_str)
             
             # Ensure output directory exists
-            Path(BugReportGenerator.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+            report_dir = Path(output_dir) / BugReportGenerator.OUTPUT_DIR
+            report_dir.mkdir(parents=True, exist_ok=True)
             
             output_file_name = f"bug_report{suffix}.json"
-            output_file_path = Path(BugReportGenerator.OUTPUT_DIR) / output_file_name
+            output_file_path = report_dir / output_file_name
             FilesUtil.write(str(output_file_path), bug_report_data.model_dump_json(indent=2))
             
             print(f"-> Structured bug report saved to '{output_file_path}'")
@@ -1,47 +1,92 @@
 # src/config_loader.py
-import re
-import yaml
-from typing import List, Dict, Any
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from .pii_rule_set import PiiRuleSet
 
 class ConfigLoader:
-    """A singleton class to load and cache configuration from config.yaml."""
+    """
+    A singleton class to load and cache configuration from config.yaml.
+
+    The compiled rules are held in a PiiRuleSet that is rebuilt when the file's mtime
+    changes, so long-running processes pick up rule edits without a restart.
+    The file is first read when the rules are first needed, not at import.
+    """
     _instance = None
-    _rules: List[Dict[str, Any]] = []
+    # PII_CONFIG_PATH overrides the config.yaml at the project root
+    CONFIG_PATH = os.getenv("PII_CONFIG_PATH", str(Path(__file__).resolve().parent.parent / "config.yaml"))
+    # The file's mtime is checked at most this often, so scans don't pay a stat() each
+    RELOAD_CHECK_SECONDS = 1.0
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ConfigLoader, cls).__new__(cls)
-            cls._instance._load_config()
+            cls._instance._rule_set: Optional[PiiRuleSet] = None
+            cls._instance._checked_at = 0.0
+            cls._instance._lock = threading.Lock()
         return cls._instance
 
     def _load_config(self):
-        """Loads and compiles PII rules from config.yaml."""
+        """Loads and compiles PII rules from config.yaml if it changed since the last load."""
+        path = ConfigLoader.CONFIG_PATH
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            if self._rule_set is None or self._rule_set.version != PiiRuleSet.EMPTY_VERSION:
+                self._rule_set = PiiRuleSet.empty()
+            return
+
+        current = self._rule_set
+        if current is not None and current.path == path and current.mtime == mtime:
+            return
         try:
-            with open("config.yaml", "r") as f:
-                config = yaml.safe_load(f)
-            
-            loaded_rules = config.get("pii_rules", [])
-            
-            # Compile regex patterns for efficiency
-            for rule in loaded_rules:
-                # Use mask_pattern if it exists, otherwise fall back to the main pattern
-                mask_pattern_str = rule.get("mask_pattern", rule["pattern"])
-                rule["compiled_mask_pattern"] = re.compile(mask_pattern_str)
-            
-            self._rules = loaded_rules
-        except FileNotFoundError:
-            self._rules = []
-        except Exception as e:
-            print(f"Error loading or parsing config.yaml: {e}")
-            self._rules = []
+            with open(path, "rb") as f:
+                content = f.read()
+            if current is not None and current.path == path and current.version == PiiRuleSet.version_of(content):
+                # Touched but unchanged: keep the compiled rules
+                current.mtime = mtime
+                return
+            rule_set = PiiRuleSet.from_bytes(content, path, mtime)
+        except (OSError, RuntimeError) as e:
+            print(f"Error loading or parsing {path}: {e}")
+            if current is None:
+                self._rule_set = PiiRuleSet.empty()
+            else:
+                # Keep serving the last good rules until the file is fixed
+                current.mtime = mtime
+            return
+
+        if current is not None and current.version != PiiRuleSet.EMPTY_VERSION:
+            print(f"Reloaded PII rules from {path} (version {rule_set.version})")
+        self._rule_set = rule_set
+
+    def get_rule_set(self) -> PiiRuleSet:
+        """Returns the current compiled rule set, reloading it first if config.yaml changed."""
+        now = time.monotonic()
+        if self._rule_set is None or now - self._checked_at >= ConfigLoader.RELOAD_CHECK_SECONDS:
+            with self._lock:
+                if self._rule_set is None or now - self._checked_at >= ConfigLoader.RELOAD_CHECK_SECONDS:
+                    self._load_config()
+                    self._checked_at = now
+        return self._rule_set
 
     def get_rules(self) -> List[Dict[str, Any]]:
         """Returns the cached PII rules."""
-        return self._rules
+        return self.get_rule_set().rules
 
     def get_configured_entity_names(self) -> List[str]:
         """Returns a list of entity names configured in the PII rules."""
-        return [rule["name"] for rule in self._rules]
+        return self.get_rule_set().entity_names
+
+    def get_nlp_entities(self) -> List[str]:
+        """Returns the NLP-based Presidio entities to detect (empty for regex-only scanning)."""
+        return self.get_rule_set().nlp_entities
+
+    def get_spacy_model(self) -> str:
+        """Returns the spaCy model Presidio loads when NLP entities are configured."""
+        return self.get_rule_set().spacy_model
 
 
 # Create a single instance of the loader to be imported by other modules
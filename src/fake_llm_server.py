@@ -0,0 +1,272 @@
+# src/fake_llm_server.py
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from .llm_response_cache import LlmResponseCache
+
+
+class CassetteStore:
+    """
+    Recorded chat completion responses ("cassettes"), one JSON file per request,
+    keyed by the same request hash as the LlmResponseCache.
+    """
+
+    def __init__(self, cassette_dir: str):
+        self.cassette_dir = Path(cassette_dir)
+
+    @staticmethod
+    def make_key(request_body: dict) -> str:
+        """Returns the cassette key of a request body; streamed and regular requests share cassettes."""
+        body = {k: v for k, v in request_body.items() if k != "stream"}
+        return LlmResponseCache.make_key(body)
+
+    def load(self, request_body: dict) -> Optional[str]:
+        """Returns the recorded raw response for a request body, or None if there is no cassette."""
+        cassette_path = self.cassette_dir / f"{CassetteStore.make_key(request_body)}.json"
+        try:
+            return json.loads(cassette_path.read_text(encoding="utf-8"))["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, request_body: dict, raw_response: str):
+        """Records the raw response for a request body."""
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+        cassette_path = self.cassette_dir / f"{CassetteStore.make_key(request_body)}.json"
+        cassette = {"request": request_body, "response": raw_response}
+        cassette_path.write_text(json.dumps(cassette, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+class FakeLlmServer:
+    """
+    A local stand-in for the Mistral `/v1/chat/completions` endpoint.
+
+    In 'replay' mode it answers from recorded cassettes (or with `default_content` when a
+    prompt has no cassette); in 'record' mode it forwards unknown requests to the real API
+    and records the responses. Latency and jitter can be injected to simulate the network,
+    and `stream=true` requests are answered as server-sent events.
+
+    Point the pipeline at it with MISTRAL_API_URL (or MistralClient.API_URL).
+    """
+    UPSTREAM_API_URL = "https://api.mistral.ai/v1/chat/completions"
+    STREAM_CHUNK_CHARS = 16
+
+    def __init__(
+        self,
+        cassette_dir: str = "generated/cassettes",
+        mode: str = "replay",
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        default_content: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown fake LLM server mode: {mode}")
+        self.cassettes = CassetteStore(cassette_dir)
+        self.mode = mode
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.default_content = default_content
+        self.requests_served = 0
+        self.cassette_misses = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), FakeLlmServer._make_handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """The chat completions URL served by this instance."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> "FakeLlmServer":
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serves in the current thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stops the server and releases its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeLlmServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency_seconds + random.uniform(-self.jitter_seconds, self.jitter_seconds))
+
+    def _record(self, request_body: dict) -> str:
+        """Forwards a request to the real API (non-streamed) and records the response."""
+        api_key = os.getenv("MISTRAL_API_KEY")
+        if not api_key:
+            raise RuntimeError("MISTRAL_API_KEY must be set to record cassettes")
+        upstream_body = {k: v for k, v in request_body.items() if k != "stream"}
+        response = requests.post(
+            FakeLlmServer.UPSTREAM_API_URL,
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"},
+            json=upstream_body,
+            timeout=120,
+        )
+        response.raise_for_status()
+        self.cassettes.save(request_body, response.text)
+        return response.text
+
+    def _default_response(self, request_body: dict) -> str:
+        prompt = request_body.get("messages", [{}])[-1].get("content", "")
+        return json.dumps({
+            "id": f"fake-{CassetteStore.make_key(request_body)[:12]}",
+            "object": "chat.completion",
+            "model": request_body.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.default_content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(self.default_content) // 4,
+                "total_tokens": (len(prompt) + len(self.default_content)) // 4,
+            },
+        })
+
+    def resolve(self, request_body: dict) -> Optional[str]:
+        """Returns the raw response to serve for a request body, or None if there is none."""
+        raw_response = self.cassettes.load(request_body)
+        if raw_response is not None:
+            return raw_response
+        with self._lock:
+            self.cassette_misses += 1
+        if self.mode == "record":
+            return self._record(request_body)
+        if self.default_content is not None:
+            return self._default_response(request_body)
+        return None
+
+    @staticmethod
+    def _make_handler(server: "FakeLlmServer"):
+        class FakeLlmRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status: int, payload: str):
+                data = payload.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, raw_response: str):
+                response = json.loads(raw_response)
+                content = response["choices"][0]["message"]["content"]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def send_event(event: str):
+                    data = f"data: {event}\n\n".encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+
+                step = FakeLlmServer.STREAM_CHUNK_CHARS
+                for start in range(0, len(content), step):
+                    chunk = {"choices": [{"index": 0, "delta": {"content": content[start:start + step]}}]}
+                    send_event(json.dumps(chunk))
+                send_event(json.dumps({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                                       "usage": response.get("usage")}))
+                send_event("[DONE]")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, json.dumps({"message": f"Unknown endpoint: {self.path}"}))
+                    return
+                try:
+                    request_body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                except ValueError:
+                    self._send_json(400, json.dumps({"message": "Request body is not valid JSON"}))
+                    return
+
+                time.sleep(server._delay())
+                try:
+                    raw_response = server.resolve(request_body)
+                except Exception as e:
+                    self._send_json(502, json.dumps({"message": f"Recording failed: {e}"}))
+                    return
+                if raw_response is None:
+                    self._send_json(404, json.dumps({"message": "No cassette recorded for this request"}))
+                    return
+
+                with server._lock:
+                    server.requests_served += 1
+                try:
+                    if request_body.get("stream"):
+                        self._send_stream(raw_response)
+                    else:
+                        self._send_json(200, raw_response)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client cut a streamed generation off early
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return FakeLlmRequestHandler
+
+
+def main():
+    """
+    Runs the fake LLM server from the command line, e.g.:
+
+        python -m src.fake_llm_server --cassettes generated/cassettes --latency 0.5 --jitter 0.2
+    """
+    parser = argparse.ArgumentParser(description="Local record/replay stand-in for the Mistral chat completions API.")
+    parser.add_argument("--cassettes", default="generated/cassettes", help="Directory with recorded responses.")
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request, in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- jitter added to the latency, in seconds.")
+    parser.add_argument("--default-content", default=None,
+                        help="Assistant content returned for prompts without a cassette (404 if omitted).")
+    args = parser.parse_args()
+
+    server = FakeLlmServer(
+        cassette_dir=args.cassettes,
+        mode=args.mode,
+        latency_seconds=args.latency,
+        jitter_seconds=args.jitter,
+        default_content=args.default_content,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Fake LLM server ({args.mode}) listening on {server.url}")
+    print(f"Run the pipeline against it with MISTRAL_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed {server.requests_served} request(s), {server.cassette_misses} without a cassette.")
+
+
+if __name__ == "__main__":
+    main()
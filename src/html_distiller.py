@@ -0,0 +1,243 @@
+# src/html_distiller.py
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class DistillationResult:
+    """The distilled HTML of a page and how much smaller it is than the original."""
+    html: str
+    original_chars: int
+    distilled_chars: int
+
+    @property
+    def original_tokens(self) -> int:
+        # Rough estimate of ~4 characters per token, good enough to compare prompt sizes
+        return self.original_chars // 4
+
+    @property
+    def distilled_tokens(self) -> int:
+        return self.distilled_chars // 4
+
+    @property
+    def reduction_percent(self) -> float:
+        if not self.original_chars:
+            return 0.0
+        return (1 - self.distilled_chars / self.original_chars) * 100
+
+    def summary(self) -> str:
+        return (
+            f"~{self.original_tokens} -> ~{self.distilled_tokens} tokens "
+            f"({self.reduction_percent:.1f}% reduction)"
+        )
+
+
+class DistilledElement:
+    """An element kept by the HtmlDistiller: its tag, kept attributes, nesting depth and visible text."""
+    __slots__ = ("tag", "attrs", "depth", "text", "has_children", "leading_text_parts")
+
+    def __init__(self, tag: str, attrs: List[tuple], depth: int):
+        self.tag = tag
+        self.attrs = attrs
+        self.depth = depth
+        self.text: List[str] = []
+        self.has_children = False
+        # Text parts seen before the first kept child; the rest follow that child in the output
+        self.leading_text_parts = 0
+
+    @property
+    def leading_text(self) -> str:
+        return " ".join(self.text[:self.leading_text_parts] if self.has_children else self.text)
+
+
+class DistilledText:
+    """Text of a container that follows one of its kept children, emitted at its place in the document."""
+    __slots__ = ("text", "depth")
+
+    def __init__(self, text: str, depth: int):
+        self.text = text
+        self.depth = depth
+
+
+class HtmlDistiller(HTMLParser):
+    """
+    Reduces a page's HTML to the elements that matter for locators: interactive elements,
+    elements carrying an id, data-test, name, role or label, and status/error elements
+    known only by their class (e.g. div.error-message-container), with their visible text.
+    Scripts, styles, SVG and other markup are dropped.
+
+    The parser is incremental, so multi-megabyte pages can be fed in chunks.
+    """
+    INTERACTIVE_TAGS = {"a", "button", "form", "input", "label", "option", "select", "textarea"}
+    HEADING_TAGS = {"title", "h1", "h2", "h3", "h4", "h5", "h6"}
+    SKIPPED_TAGS = {"script", "style", "svg", "noscript", "template", "canvas", "iframe", "object"}
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+    IDENTIFYING_ATTRIBUTES = ("id", "name", "role", "aria-label", "data-test", "data-testid", "data-qa")
+    KEPT_ATTRIBUTES = (
+        "id", "name", "type", "role", "aria-label", "data-test", "data-testid", "data-qa",
+        "placeholder", "for", "href", "value", "title", "alt", "class",
+    )
+    # Class names of elements showing errors and status messages, which tests check
+    STATUS_CLASS = re.compile(r"(?:^|[-_\s])(?:error|alert|message|toast|notification|status|warning)(?:[-_\s]|$)", re.IGNORECASE)
+    MAX_TEXT_CHARS = 80
+    MAX_ATTRIBUTE_CHARS = 120
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._elements: List[DistilledElement] = []
+        # Kept elements and trailing container text, in document order
+        self._nodes: List[object] = []
+        # Open elements as (tag, kept element or None)
+        self._open: List[tuple] = []
+        self._kept_depth = 0
+        self._skipping: Optional[str] = None
+        self._skip_nesting = 0
+        self._original_chars = 0
+
+    def feed(self, data: str):
+        self._original_chars += len(data)
+        super().feed(data)
+
+    def _is_kept(self, tag: str, attrs: dict) -> bool:
+        if tag in HtmlDistiller.INTERACTIVE_TAGS or tag in HtmlDistiller.HEADING_TAGS:
+            return True
+        if any(attrs.get(name) for name in HtmlDistiller.IDENTIFYING_ATTRIBUTES):
+            return True
+        return bool(attrs.get("class")) and bool(HtmlDistiller.STATUS_CLASS.search(attrs["class"]))
+
+    def handle_starttag(self, tag, attrs):
+        if self._skipping is not None:
+            if tag == self._skipping:
+                self._skip_nesting += 1
+            return
+        if tag in HtmlDistiller.SKIPPED_TAGS:
+            self._skipping, self._skip_nesting = tag, 1
+            return
+
+        attr_map = dict(attrs)
+        element = None
+        if self._is_kept(tag, attr_map):
+            kept_attrs = [
+                (name, attr_map[name][:HtmlDistiller.MAX_ATTRIBUTE_CHARS])
+                for name in HtmlDistiller.KEPT_ATTRIBUTES
+                if attr_map.get(name)
+            ]
+            element = DistilledElement(tag, kept_attrs, self._kept_depth)
+            self._elements.append(element)
+            self._nodes.append(element)
+            for _, parent in reversed(self._open):
+                if parent is not None:
+                    if not parent.has_children:
+                        parent.has_children = True
+                        parent.leading_text_parts = len(parent.text)
+                    break
+
+        if tag in HtmlDistiller.VOID_TAGS:
+            return
+        self._open.append((tag, element))
+        if element is not None:
+            self._kept_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._skipping is not None or tag in HtmlDistiller.SKIPPED_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in HtmlDistiller.VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skipping is not None:
+            if tag == self._skipping:
+                self._skip_nesting -= 1
+                if self._skip_nesting == 0:
+                    self._skipping = None
+            return
+        # Tolerate unclosed tags by popping up to the matching open element
+        if not any(open_tag == tag for open_tag, _ in self._open):
+            return
+        while self._open:
+            open_tag, element = self._open.pop()
+            if element is not None:
+                self._kept_depth -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._skipping is not None:
+            return
+        text = " ".join(data.split())
+        if not text:
+            return
+        for _, element in reversed(self._open):
+            if element is not None:
+                if sum(len(part) for part in element.text) < HtmlDistiller.MAX_TEXT_CHARS:
+                    element.text.append(text)
+                    if element.has_children:
+                        self._nodes.append(DistilledText(text, element.depth + 1))
+                break
+
+    def result(self) -> DistillationResult:
+        """Closes the parser and returns the distilled HTML."""
+        self.close()
+        lines = []
+        open_containers: List[DistilledElement] = []
+        for element in self._nodes:
+            while open_containers and open_containers[-1].depth >= element.depth:
+                container = open_containers.pop()
+                lines.append(f"{'  ' * container.depth}</{container.tag}>")
+            indent = "  " * element.depth
+            if isinstance(element, DistilledText):
+                lines.append(f"{indent}{element.text[:HtmlDistiller.MAX_TEXT_CHARS]}")
+                continue
+            attributes = "".join(f' {name}="{value}"' for name, value in element.attrs)
+            text = element.leading_text[:HtmlDistiller.MAX_TEXT_CHARS]
+            if element.tag in HtmlDistiller.VOID_TAGS:
+                lines.append(f"{indent}<{element.tag}{attributes}>")
+            elif element.has_children:
+                # Containers are closed after their kept children, which follow in document order
+                lines.append(f"{indent}<{element.tag}{attributes}>{text}")
+                open_containers.append(element)
+            else:
+                lines.append(f"{indent}<{element.tag}{attributes}>{text}</{element.tag}>")
+        for container in reversed(open_containers):
+            lines.append(f"{'  ' * container.depth}</{container.tag}>")
+        html = "\n".join(lines)
+        return DistillationResult(html=html, original_chars=self._original_chars, distilled_chars=len(html))
+
+    @property
+    def elements(self) -> List[DistilledElement]:
+        """The elements kept so far, in document order."""
+        return self._elements
+
+    @staticmethod
+    def parse_elements(html: str) -> List[DistilledElement]:
+        """Returns the kept elements of an HTML string, in document order."""
+        distiller = HtmlDistiller()
+        distiller.feed(html)
+        distiller.close()
+        return distiller.elements
+
+    @staticmethod
+    def distill(html: str) -> DistillationResult:
+        """Distills an HTML string."""
+        return HtmlDistiller.distill_chunks([html])
+
+    @staticmethod
+    def distill_chunks(chunks: Iterable[str]) -> DistillationResult:
+        """Distills HTML arriving in chunks, without holding the whole document in memory."""
+        distiller = HtmlDistiller()
+        for chunk in chunks:
+            distiller.feed(chunk)
+        return distiller.result()
+
+    @staticmethod
+    def distill_file(path: str) -> DistillationResult:
+        """Distills an HTML file, reading it in CHUNK_SIZE pieces."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return HtmlDistiller.distill_chunks(iter(lambda: f.read(HtmlDistiller.CHUNK_SIZE), ""))
+        except OSError as e:
+            raise RuntimeError(f"Cannot read file: {path}") from e
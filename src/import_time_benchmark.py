@@ -0,0 +1,138 @@
+# src/import_time_benchmark.py
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+# Heavy dependencies that must only be imported by the stages using them
+HEAVY_MODULES = ("presidio_analyzer", "spacy", "selenium", "webdriver_manager", "pytest", "requests", "pydantic", "yaml")
+# Module -> (import time budget in milliseconds, heavy modules it must not pull in)
+GATES: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "src.pipeline_main": (400.0, HEAVY_MODULES),
+    "src.page_source_getter": (150.0, ("selenium", "webdriver_manager")),
+    "src.mistral_client": (150.0, ("requests",)),
+    "src.config_loader": (150.0, ("yaml",)),
+    "src.test_runner": (150.0, ("pytest",)),
+}
+
+
+def import_times(module: str) -> List[dict]:
+    """
+    Imports a module in a fresh interpreter with `-X importtime` and returns one entry per
+    imported module, in import order: its name, nesting depth, self and cumulative time (in ms).
+    """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+        raise RuntimeError(f"Cannot import {module}: {last_line}")
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "name": name,
+                "depth": len(indent) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+    return entries
+
+
+def total_ms(entries: List[dict], module: str) -> float:
+    """Returns the cumulative import time of `module` itself (0 if it was already imported)."""
+    return next((entry["cumulative_ms"] for entry in entries if entry["name"] == module), 0.0)
+
+
+def subtree(entries: List[dict], module: str) -> List[dict]:
+    """
+    Returns the entries imported by `module` itself, leaving out interpreter startup (site, .pth files).
+    -X importtime lists modules in post-order, so a top-level module's imports are the
+    entries between the previous top-level entry and its own.
+    """
+    for index, entry in enumerate(entries):
+        if entry["name"] == module and entry["depth"] == 0:
+            start = index
+            while start > 0 and entries[start - 1]["depth"] > 0:
+                start -= 1
+            return entries[start:index + 1]
+    return []
+
+
+def heaviest(entries: List[dict], top: int) -> List[dict]:
+    """Returns the `top` top-level packages (and project modules) with the largest cumulative import time."""
+    roots: Dict[str, float] = {}
+    for entry in entries:
+        name = entry["name"]
+        # Project modules are listed individually, third-party packages by their root package
+        key = name if name.startswith("src.") else name.split(".")[0]
+        roots[key] = max(roots.get(key, 0.0), entry["cumulative_ms"])
+    ranked = sorted(roots.items(), key=lambda item: -item[1])[:top]
+    return [{"name": name, "cumulative_ms": ms} for name, ms in ranked]
+
+
+def check(module: str, forbidden: Tuple[str, ...], repeat: int = 3) -> Tuple[float, List[str], List[dict]]:
+    """
+    Measures a module's import time (the fastest of `repeat` cold imports, to damp noise)
+    and which forbidden modules it loads.
+
+    Returns:
+        The import time in ms, the forbidden modules imported and the entries of the fastest run.
+    """
+    best: Optional[Tuple[float, List[dict]]] = None
+    for _ in range(max(1, repeat)):
+        entries = import_times(module)
+        elapsed = total_ms(entries, module)
+        if best is None or elapsed < best[0]:
+            best = (elapsed, entries)
+    elapsed, entries = best
+    imported = {entry["name"] for entry in entries}
+    loaded = [name for name in forbidden if name in imported]
+    return elapsed, loaded, entries
+
+
+def main():
+    """
+    Reports where a module's import time goes, and gates startup regressions, e.g.:
+
+        python -m src.import_time_benchmark src.pipeline_main --top 15
+        python -m src.import_time_benchmark --check     # exit status 1 if a gate in GATES fails
+    """
+    parser = argparse.ArgumentParser(description="Measure module import times with -X importtime.")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: every module in GATES).")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages listed per module.")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold imports per module; the fastest counts.")
+    parser.add_argument("--check", action="store_true",
+                        help="Fail if a module exceeds its budget or imports a heavy dependency it should not.")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules or list(GATES):
+        max_ms, forbidden = GATES.get(module, (float("inf"), HEAVY_MODULES))
+        try:
+            elapsed, loaded, entries = check(module, forbidden, args.repeat)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            failures.append(module)
+            continue
+        budget = f" (budget {max_ms:.0f} ms)" if max_ms != float("inf") else ""
+        print(f"\n{module}: {elapsed:.1f} ms{budget}")
+        for entry in heaviest(subtree(entries, module), args.top):
+            print(f"  {entry['cumulative_ms']:>8.1f} ms  {entry['name']}")
+        if loaded:
+            print(f"  -> imports heavy dependencies at import time: {', '.join(loaded)}")
+        if elapsed > max_ms or loaded:
+            failures.append(module)
+
+    if args.check and failures:
+        print(f"\nImport-time check failed for: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
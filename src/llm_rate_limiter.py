@@ -0,0 +1,220 @@
+# src/llm_rate_limiter.py
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `capacity` tokens per minute.
+    A capacity of 0 or less (or infinity) means no limit: reservations never wait.
+
+    Reservations may drive the bucket into debt; the caller then waits until
+    the debt has been refilled, which keeps concurrent callers in FIFO order.
+    """
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.unlimited = not 0 < self.capacity < math.inf
+        if self.unlimited:
+            self.capacity = 0.0
+        self.rate_per_second = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Takes `amount` tokens and returns how many seconds the caller must wait for them."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate_per_second
+
+    def adjust(self, amount: float, now: float):
+        """Returns (positive) or takes (negative) tokens after the fact."""
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def clamp(self, remaining: float, now: float):
+        """Lowers the bucket to the quota the server reports as remaining."""
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+
+
+class LlmRateLimiter:
+    """
+    Paces LLM API calls to a requests-per-minute and tokens-per-minute quota and
+    computes retry delays for rate-limited or failed calls.
+
+    The limiter is shared by all threads of the process: a 429 response pauses every
+    caller until the server's Retry-After has passed, not just the one that hit it.
+    """
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.retries = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """
+        Blocks until a request with the given estimated token count fits in the quota.
+
+        Returns:
+            The number of seconds the caller waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            pause = max(0.0, self._paused_until - now)
+            # Cap a single reservation at the bucket size so an oversized prompt cannot wait forever
+            tokens = min(float(estimated_tokens), self._tokens.capacity)
+            wait = max(pause, self._requests.reserve(1, now), self._tokens.reserve(tokens, now))
+
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+                self.acquired += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Corrects the token bucket once the API has reported the real token usage of a call."""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens.adjust(min(float(estimated_tokens), self._tokens.capacity) - actual_tokens, time.monotonic())
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Aligns the buckets with the rate-limit headers of an API response.
+        A server-reported remaining quota lower than our own estimate wins.
+        """
+        remaining_requests = LlmRateLimiter._header_number(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = LlmRateLimiter._header_number(
+            headers, "x-ratelimit-remaining-tokens", "x-ratelimitbysize-remaining-minute"
+        )
+        reset_seconds = LlmRateLimiter._header_number(
+            headers, "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens", "ratelimitbysize-reset"
+        )
+        with self._lock:
+            now = time.monotonic()
+            if remaining_requests is not None:
+                self._requests.clamp(remaining_requests, now)
+            if remaining_tokens is not None:
+                self._tokens.clamp(remaining_tokens, now)
+            exhausted = remaining_requests == 0 or remaining_tokens == 0
+            if exhausted and reset_seconds is not None:
+                self._paused_until = max(self._paused_until, now + reset_seconds)
+
+    def pause(self, seconds: float):
+        """Holds back every caller for the given number of seconds (e.g. on a 429 response)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def retry_delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Returns how long to wait before retry number `attempt` (starting at 0).
+
+        The server's Retry-After header is honoured when present; otherwise the delay is
+        exponential backoff with full jitter.
+        """
+        with self._lock:
+            self.retries += 1
+        retry_after = LlmRateLimiter.parse_retry_after(headers or {})
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(LlmRateLimiter.BACKOFF_MAX_SECONDS, LlmRateLimiter.BACKOFF_BASE_SECONDS * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_rate(value: str, name: str) -> float:
+        """
+        Parses a per-minute quota setting such as MISTRAL_REQUESTS_PER_MINUTE.
+        0 or a negative value means unlimited.
+
+        Raises:
+            RuntimeError: If the value is not a number.
+        """
+        try:
+            rate = float(value)
+        except ValueError:
+            rate = math.nan
+        if math.isnan(rate):
+            raise RuntimeError(f"{name} must be a number per minute (0 for no limit), got '{value}'")
+        return max(0.0, rate)
+
+    @staticmethod
+    def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        """Parses a Retry-After header given either in seconds or as an HTTP date."""
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _header_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+        for name in names:
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                return float(value)
+            except ValueError:
+                continue
+        return None
+
+    def metrics(self) -> Dict[str, float]:
+        """Returns the current pacing metrics."""
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "retries": self.retries,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "total_wait_seconds": self.total_wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+    def summary(self) -> str:
+        """Returns a one-line summary of the pacing metrics."""
+        m = self.metrics()
+        return (
+            f"LLM rate limiter: {m['acquired']} request(s), {m['retries']} retry(ies), "
+            f"max queue depth {m['max_queue_depth']}, total wait {m['total_wait_seconds']:.1f}s "
+            f"(max {m['max_wait_seconds']:.1f}s)"
+        )
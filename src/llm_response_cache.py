@@ -0,0 +1,153 @@
+# src/llm_response_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LlmResponseCache:
+    """
+    A persistent, content-addressed cache of raw LLM API responses.
+
+    Entries are keyed by a SHA-256 hash of the request body (model, temperature and
+    messages, which include the prompt) and the endpoint it is sent to, so an identical
+    request to the same API (never a local fake server's reply to a real API call) is answered from disk
+    instead of the API. Old entries are evicted by age and by total cache size.
+
+    An entry's modification time is its last use (written or read). Both get() and evict()
+    expire entries not used for MAX_AGE_SECONDS by that clock, and evict() drops the least
+    recently used entries first. evict() scans the whole cache directory, so put() only runs
+    it every EVICTION_EVERY_PUTS writes, or on the first write EVICTION_INTERVAL_SECONDS
+    after the last run; the limits may be exceeded briefly in between.
+    """
+    CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+    # 'on' reads and writes the cache, 'refresh' skips reads but stores fresh responses,
+    # 'off' bypasses the cache completely.
+    MODE = os.getenv("LLM_CACHE_MODE", "on").lower()
+    MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+    MAX_SIZE_BYTES = 200 * 1024 * 1024
+    MAX_ENTRIES = 2000
+    EVICTION_EVERY_PUTS = 50
+    EVICTION_INTERVAL_SECONDS = 60
+
+    hits = 0
+    misses = 0
+    _lock = threading.Lock()
+    _puts_since_eviction = 0
+    _last_eviction_at = 0.0
+    _evicting = False
+
+    @staticmethod
+    def make_key(request_body: Dict[str, Any], endpoint: Optional[str] = None) -> str:
+        """Returns the content hash identifying a request body, and the endpoint it is sent to if given."""
+        material = request_body if endpoint is None else {"endpoint": endpoint, "body": request_body}
+        canonical = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _entry_path(key: str) -> Path:
+        return Path(LlmResponseCache.CACHE_DIR) / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _count(attribute: str):
+        with LlmResponseCache._lock:
+            setattr(LlmResponseCache, attribute, getattr(LlmResponseCache, attribute) + 1)
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        """
+        Returns the cached response for a key, or None on a miss.
+        Entries not used for MAX_AGE_SECONDS are removed and count as misses.
+        """
+        if LlmResponseCache.MODE != "on":
+            LlmResponseCache._count("misses")
+            return None
+
+        entry_path = LlmResponseCache._entry_path(key)
+        try:
+            # Same clock as evict(): the modification time, i.e. the entry's last use
+            if time.time() - entry_path.stat().st_mtime > LlmResponseCache.MAX_AGE_SECONDS:
+                entry_path.unlink(missing_ok=True)
+                raise KeyError("expired")
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            # Mark the entry as used, so expiry and size-based eviction spare it
+            os.utime(entry_path)
+        except (OSError, ValueError, KeyError):
+            LlmResponseCache._count("misses")
+            return None
+
+        LlmResponseCache._count("hits")
+        return entry["response"]
+
+    @staticmethod
+    def put(key: str, response: str):
+        """Stores a response under a key and, from time to time, evicts old entries (see the class docstring)."""
+        if LlmResponseCache.MODE == "off":
+            return
+
+        entry_path = LlmResponseCache._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial entry
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps({"created_at": time.time(), "response": response}), encoding="utf-8")
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: Could not write LLM response cache entry '{entry_path}': {e}")
+            return
+
+        with LlmResponseCache._lock:
+            LlmResponseCache._puts_since_eviction += 1
+            now = time.time()
+            due = (
+                LlmResponseCache._puts_since_eviction >= LlmResponseCache.EVICTION_EVERY_PUTS
+                or now - LlmResponseCache._last_eviction_at >= LlmResponseCache.EVICTION_INTERVAL_SECONDS
+            )
+            if not due or LlmResponseCache._evicting:
+                return
+            LlmResponseCache._evicting = True
+            LlmResponseCache._puts_since_eviction = 0
+            LlmResponseCache._last_eviction_at = now
+        try:
+            LlmResponseCache.evict()
+        finally:
+            LlmResponseCache._evicting = False
+
+    @staticmethod
+    def evict():
+        """Removes entries not used for MAX_AGE_SECONDS, then the least recently used ones until the size and count limits hold."""
+        cache_dir = Path(LlmResponseCache.CACHE_DIR)
+        if not cache_dir.exists():
+            return
+
+        now = time.time()
+        entries = []
+        for entry_path in cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > LlmResponseCache.MAX_AGE_SECONDS:
+                entry_path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        entries.sort(key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+        while entries and (total_size > LlmResponseCache.MAX_SIZE_BYTES or len(entries) > LlmResponseCache.MAX_ENTRIES):
+            _, size, entry_path = entries.pop(0)
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+
+    @staticmethod
+    def summary() -> str:
+        """Returns a one-line summary of the cache hit/miss counters."""
+        total = LlmResponseCache.hits + LlmResponseCache.misses
+        hit_rate = (LlmResponseCache.hits / total * 100) if total else 0.0
+        return (
+            f"LLM response cache ({LlmResponseCache.MODE}): {LlmResponseCache.hits} hit(s), "
+            f"{LlmResponseCache.misses} miss(es), hit rate {hit_rate:.0f}%"
+        )
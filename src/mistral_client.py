@@ -1,19 +1,182 @@
+import json
 import os
-import requests
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+from .llm_rate_limiter import LlmRateLimiter
+from .llm_response_cache import LlmResponseCache
+from .tracing import Tracer
+
+# requests (and asyncio, for acall) are imported on first use, so importing a generator module stays cheap
+if TYPE_CHECKING:
+    import asyncio
+    import requests
+
+# Load environment variables from .env file (kept at import: every MistralClient setting below can come from it)
 load_dotenv()
 
 class MistralClient:
-    API_URL = "https://api.mistral.ai/v1/chat/completions"
+    DEFAULT_API_URL = "https://api.mistral.ai/v1/chat/completions"
+    # Can point at a local stand-in such as src.fake_llm_server
+    API_URL = os.getenv("MISTRAL_API_URL", DEFAULT_API_URL)
     API_KEY = os.getenv("MISTRAL_API_KEY")
+    MODEL = "mistral-small-latest"
+    TEMPERATURE = 0.2
+    TIMEOUT_SECONDS = 60
+    # Keep-alive connections kept open to the API; also the default concurrency of acall_many
+    POOL_SIZE = 10
+    # Statuses worth retrying: rate limiting and transient server errors
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    MAX_RETRIES = 5
+    # Requests in flight at once across all threads (pipeline stages, fan-outs); streams hold a slot until closed
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MISTRAL_MAX_CONCURRENCY", "4"))
+    # 0 disables either limit
+    RATE_LIMITER = LlmRateLimiter(
+        requests_per_minute=LlmRateLimiter.parse_rate(
+            os.getenv("MISTRAL_REQUESTS_PER_MINUTE", "60"), "MISTRAL_REQUESTS_PER_MINUTE"
+        ),
+        tokens_per_minute=LlmRateLimiter.parse_rate(
+            os.getenv("MISTRAL_TOKENS_PER_MINUTE", "500000"), "MISTRAL_TOKENS_PER_MINUTE"
+        ),
+    )
+
+    _session: Optional["requests.Session"] = None
+    _session_lock = threading.Lock()
+    _request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+    @staticmethod
+    def set_max_concurrency(max_concurrent_requests: int):
+        """Changes the global limit of requests in flight; takes effect for requests started afterwards."""
+        MistralClient.MAX_CONCURRENT_REQUESTS = max(1, max_concurrent_requests)
+        MistralClient._request_slots = threading.BoundedSemaphore(MistralClient.MAX_CONCURRENT_REQUESTS)
+
+    @staticmethod
+    def get_session() -> "requests.Session":
+        """
+        Returns the process-wide HTTP session used for all API calls.
+
+        The session keeps a pool of keep-alive connections, so every generator calling
+        MistralClient shares the same TCP/TLS connections instead of opening a new one per call.
+        """
+        if MistralClient._session is None:
+            with MistralClient._session_lock:
+                if MistralClient._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MistralClient.POOL_SIZE)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    MistralClient._session = session
+        return MistralClient._session
+
+    @staticmethod
+    def close():
+        """Closes the shared HTTP session and its pooled connections."""
+        with MistralClient._session_lock:
+            if MistralClient._session is not None:
+                MistralClient._session.close()
+                MistralClient._session = None
+
+    @staticmethod
+    def _build_body(prompt: str) -> dict:
+        """Builds the chat completion request body for a user prompt."""
+        # The 'requests' library handles JSON serialization, so no manual string escaping is needed.
+        return {
+            "model": MistralClient.MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a QA automation engineer. Return structured output."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": MistralClient.TEMPERATURE,
+        }
+
+    @staticmethod
+    def _post(body: dict, estimated_tokens: int, stream: bool = False, span=None) -> "requests.Response":
+        """
+        Sends a request body to the API, paced by RATE_LIMITER and retried on
+        rate limiting, 5xx and connection failures. Retries are counted on the trace `span`, if given.
+
+        Returns:
+            The successful HTTP response.
+
+        Raises:
+            RuntimeError: If the MISTRAL_API_KEY is not set or if the API call fails.
+        """
+        import requests
+
+        has_api_key = MistralClient.API_KEY and MistralClient.API_KEY != "YOUR_API_KEY_HERE"
+        # A local stand-in endpoint does not need a real key
+        if not has_api_key and MistralClient.API_URL == MistralClient.DEFAULT_API_URL:
+            raise RuntimeError("MISTRAL_API_KEY not set or is a placeholder in .env file")
+
+        headers = {"Content-Type": "application/json"}
+        if has_api_key:
+            headers["Authorization"] = f"Bearer {MistralClient.API_KEY}"
+        if stream:
+            headers["Accept"] = "text/event-stream"
+
+        rate_limiter = MistralClient.RATE_LIMITER
+        for attempt in range(MistralClient.MAX_RETRIES + 1):
+            rate_limiter.acquire(estimated_tokens)
+            try:
+                response = MistralClient.get_session().post(
+                    MistralClient.API_URL, headers=headers, json=body,
+                    timeout=MistralClient.TIMEOUT_SECONDS, stream=stream
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == MistralClient.MAX_RETRIES:
+                    raise RuntimeError(f"API call failed after {attempt + 1} attempts: {e}") from e
+                delay = rate_limiter.retry_delay(attempt)
+                print(f"Warning: API call failed ({e}), retrying in {delay:.1f}s...")
+                if span is not None:
+                    span.add("retries")
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"API call failed: {e}") from e
+
+            rate_limiter.update_from_headers(response.headers)
+            if response.status_code in MistralClient.RETRY_STATUS_CODES and attempt < MistralClient.MAX_RETRIES:
+                response.close()
+                delay = rate_limiter.retry_delay(attempt, response.headers)
+                print(f"Warning: API returned {response.status_code}, retrying in {delay:.1f}s...")
+                if span is not None:
+                    span.add("retries")
+                if response.status_code == 429:
+                    # Rate limits apply to the whole process, so hold back every caller
+                    rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            try:
+                # Raise an exception for bad status codes (4xx or 5xx)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                response.close()
+                raise RuntimeError(f"API call failed: {e}") from e
+            return response
+
+    @staticmethod
+    def _estimate_tokens(body: dict) -> int:
+        """Rough token estimate (~4 characters per token) used for pacing until the API reports real usage."""
+        return sum(len(message["content"]) for message in body["messages"]) // 4
 
     @staticmethod
     def call(prompt: str) -> str:
         """
         Calls the Mistral API with a given prompt.
 
+        Responses are served from the LlmResponseCache when an identical request
+        (same model, temperature and messages, sent to the same API_URL) was answered before. Requests are paced
+        by RATE_LIMITER, and rate-limited (429), 5xx and connection failures are retried
+        with backoff up to MAX_RETRIES times.
+
         Args:
             prompt: The user prompt to send to the model.
 
@@ -23,30 +186,195 @@ class MistralClient:
         Raises:
             RuntimeError: If the MISTRAL_API_KEY is not set or if the API call fails.
         """
-        if not MistralClient.API_KEY or MistralClient.API_KEY == "YOUR_API_KEY_HERE":
-            raise RuntimeError("MISTRAL_API_KEY not set or is a placeholder in .env file")
+        with Tracer.span("MistralClient.call", "llm") as span:
+            body = MistralClient._build_body(prompt)
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {MistralClient.API_KEY}",
-        }
+            cache_key = LlmResponseCache.make_key(body, MistralClient.API_URL)
+            cached_response = LlmResponseCache.get(cache_key)
+            if cached_response is not None:
+                span.set(cache_hit=1)
+                return cached_response
 
-        # The 'requests' library handles JSON serialization, so no manual string escaping is needed.
-        body = {
-            "model": "mistral-small-latest",
-            "messages": [
-                {"role": "system", "content": "You are a QA automation engineer. Return structured output."},
-                {"role": "user", "content": prompt},
-            ],
-            "temperature": 0.2,
-        }
+            estimated_tokens = MistralClient._estimate_tokens(body)
+            with MistralClient._request_slots:
+                response = MistralClient._post(body, estimated_tokens, span=span)
 
-        try:
-            response = requests.post(
-                MistralClient.API_URL, headers=headers, json=body, timeout=60
-            )
-            # Raise an exception for bad status codes (4xx or 5xx)
-            response.raise_for_status()
+            usage = MistralClient._usage(response.text)
+            MistralClient.RATE_LIMITER.record_usage(estimated_tokens, usage.get("total_tokens"))
+            if span.enabled:
+                span.set(
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", 0),
+                    bytes_sent=len(response.request.body or b""),
+                    bytes_received=len(response.content),
+                )
+            LlmResponseCache.put(cache_key, response.text)
             return response.text
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"API call failed: {e}") from e
+
+    @staticmethod
+    def stream(prompt: str) -> Iterator[str]:
+        """
+        Calls the Mistral API with `stream=true` and yields the content deltas as they arrive
+        over server-sent events. Closing the generator early closes the HTTP response,
+        which cuts the generation off.
+
+        Args:
+            prompt: The user prompt to send to the model.
+
+        Yields:
+            Fragments of the assistant's message content.
+
+        Raises:
+            RuntimeError: If the MISTRAL_API_KEY is not set, the API call fails or an event cannot be parsed.
+        """
+        import requests
+
+        body = MistralClient._build_body(prompt)
+        body["stream"] = True
+        estimated_tokens = MistralClient._estimate_tokens(body)
+        with Tracer.span("MistralClient.stream", "llm") as span:
+            request_slots = MistralClient._request_slots
+            request_slots.acquire()
+            try:
+                response = MistralClient._post(body, estimated_tokens, stream=True, span=span)
+            except BaseException:
+                request_slots.release()
+                raise
+
+            usage = {}
+            bytes_received = 0
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    bytes_received += len(line) + 1
+                    # SSE frames look like 'data: {...}'; blank lines and comments separate events
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        event = json.loads(data)
+                    except json.JSONDecodeError as e:
+                        raise RuntimeError(f"Failed to parse streamed LLM event: {data}") from e
+                    if event.get("usage"):
+                        usage = event["usage"]
+                    for choice in event.get("choices", []):
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"API stream failed: {e}") from e
+            finally:
+                response.close()
+                request_slots.release()
+                MistralClient.RATE_LIMITER.record_usage(estimated_tokens, usage.get("total_tokens"))
+                if span.enabled:
+                    span.set(
+                        prompt_tokens=usage.get("prompt_tokens", 0),
+                        completion_tokens=usage.get("completion_tokens", 0),
+                        bytes_sent=len(response.request.body or b""),
+                        bytes_received=bytes_received,
+                    )
+
+    @staticmethod
+    def call_streaming(prompt: str, extractor) -> str:
+        """
+        Streams a completion into an incremental extractor (see IncrementalCodeExtractor and
+        IncrementalJsonExtractor) and returns the payload as soon as it is complete,
+        without waiting for the rest of the generation.
+
+        The streamed content is stored in the LlmResponseCache in the same shape as a
+        non-streamed response. A stream read to its end is stored under the key of call(), so
+        call() and call_streaming() share it; a stream cut off by the extractor holds only part
+        of the completion and is stored under a key of its own, which call() never reads.
+
+        Args:
+            prompt: The user prompt to send to the model.
+            extractor: An object whose feed(delta) returns the payload once it is complete
+                       and whose finish() returns the best-effort payload at the end of the stream.
+
+        Returns:
+            The extracted payload.
+        """
+        body = MistralClient._build_body(prompt)
+        cache_key = LlmResponseCache.make_key(body, MistralClient.API_URL)
+        cut_off_cache_key = LlmResponseCache.make_key({**body, "cut_off_by": type(extractor).__name__}, MistralClient.API_URL)
+        for key in (cache_key, cut_off_cache_key):
+            cached_response = LlmResponseCache.get(key)
+            if cached_response is not None:
+                with Tracer.span("MistralClient.stream", "llm", cache_hit=1):
+                    content = json.loads(cached_response)["choices"][0]["message"]["content"]
+                    return extractor.feed(content) or extractor.finish()
+
+        content_parts = []
+        payload = None
+        cut_off = False
+        deltas = MistralClient.stream(prompt)
+        try:
+            for delta in deltas:
+                content_parts.append(delta)
+                payload = extractor.feed(delta)
+                if payload is not None:
+                    cut_off = True
+                    break
+        finally:
+            deltas.close()
+
+        if payload is None:
+            payload = extractor.finish()
+        synthesized_response = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": "".join(content_parts)}}]}
+        )
+        LlmResponseCache.put(cut_off_cache_key if cut_off else cache_key, synthesized_response)
+        return payload
+
+    @staticmethod
+    def _usage(raw_response: str) -> dict:
+        """Returns the 'usage' field (prompt, completion and total token counts) of a raw API response, or {}."""
+        try:
+            usage = json.loads(raw_response).get("usage")
+        except (ValueError, AttributeError):
+            return {}
+        return usage if isinstance(usage, dict) else {}
+
+    @staticmethod
+    async def acall(prompt: str, semaphore: Optional["asyncio.Semaphore"] = None) -> str:
+        """
+        Async variant of call(). The blocking request runs in a worker thread over the
+        shared pooled session, so several calls can be in flight at once.
+
+        Args:
+            prompt: The user prompt to send to the model.
+            semaphore: Optional semaphore bounding the number of concurrent calls.
+
+        Returns:
+            The raw JSON response body from the API as a string.
+        """
+        import asyncio
+
+        if semaphore is None:
+            return await asyncio.to_thread(MistralClient.call, prompt)
+        async with semaphore:
+            return await asyncio.to_thread(MistralClient.call, prompt)
+
+    @staticmethod
+    async def acall_many(prompts: List[str], max_concurrency: Optional[int] = None, return_exceptions: bool = False) -> list:
+        """
+        Calls the Mistral API for several prompts concurrently.
+
+        Args:
+            prompts: The user prompts to send to the model.
+            max_concurrency: Maximum number of calls in flight. Defaults to POOL_SIZE.
+            return_exceptions: If True, a failed call yields its exception in the result list
+                               instead of failing the whole batch.
+
+        Returns:
+            The raw JSON response bodies, in the same order as the prompts.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(max_concurrency or MistralClient.POOL_SIZE)
+        return await asyncio.gather(
+            *(MistralClient.acall(prompt, semaphore) for prompt in prompts),
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,153 @@
+# src/page_fingerprint.py
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .files_util import FilesUtil
+from .html_distiller import HtmlDistiller
+from .rule_based_page_object_generator import RuleBasedPageObjectGenerator
+
+
+@dataclass
+class StructureDiff:
+    """Locators added to and removed from a page since its Page Object was generated."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def to_text(self) -> str:
+        if not self.added and not self.removed:
+            return "No locator changes (structure changed elsewhere in the page)."
+        lines = [f"+ {locator}" for locator in self.added] + [f"- {locator}" for locator in self.removed]
+        return "\n".join(lines)
+
+
+class _StructureHasher(HTMLParser):
+    """
+    Hashes the tag structure of a document, its stable identifying attributes and the
+    classes of its status/error elements.
+    """
+    STABLE_ATTRIBUTES = ("id", "name", "type", "role", "for", "data-test", "data-testid", "aria-label")
+    # Values generated Page Objects use verbatim in locators, so they are hashed as they are
+    ADDRESSING_ATTRIBUTES = {"id", "name", "data-test", "data-testid"}
+    SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg"}
+    # Digit runs and long hex strings are typical of generated values (e.g. 'ember123', ':r1f:')
+    VOLATILE_VALUE = re.compile(r"[0-9a-f]{8,}|\d+", re.IGNORECASE)
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._hash = hashlib.sha256()
+        self._skipping: Optional[str] = None
+        self._skip_nesting = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skipping is not None:
+            if tag == self._skipping:
+                self._skip_nesting += 1
+            return
+        if tag in _StructureHasher.SKIPPED_TAGS:
+            self._skipping, self._skip_nesting = tag, 1
+            return
+        attr_map = dict(attrs)
+        stable = [
+            f"{name}={_StructureHasher._stable_value(name, attr_map[name] or '')}"
+            for name in _StructureHasher.STABLE_ATTRIBUTES
+            if name in attr_map
+        ]
+        # Status/error elements known only by their class get a class locator (e.g. '.error-message-container')
+        status_classes = [
+            class_name for class_name in (attr_map.get("class") or "").split()
+            if HtmlDistiller.STATUS_CLASS.search(class_name)
+        ]
+        if status_classes:
+            stable.append(f"class={' '.join(status_classes)}")
+        self._hash.update(f"<{tag} {','.join(stable)}>".encode("utf-8"))
+
+    @staticmethod
+    def _stable_value(name: str, value: str) -> str:
+        if name in _StructureHasher.ADDRESSING_ATTRIBUTES:
+            return value
+        return _StructureHasher.VOLATILE_VALUE.sub("#", value)
+
+    def handle_endtag(self, tag):
+        if self._skipping is not None:
+            if tag == self._skipping:
+                self._skip_nesting -= 1
+                if self._skip_nesting == 0:
+                    self._skipping = None
+            return
+        self._hash.update(f"</{tag}>".encode("utf-8"))
+
+    def hexdigest(self) -> str:
+        self.close()
+        return self._hash.hexdigest()
+
+
+class PageFingerprint:
+    """
+    A structural fingerprint of a page: a hash of its tag tree, its stable identifying
+    attributes and the classes of its status/error elements, ignoring text, other classes,
+    inline styles, scripts and nonces. Two fetches of an unchanged page have the same
+    fingerprint even if their content differs; any change to a value a generated locator
+    uses (an id, name, data-test or status class) changes it.
+
+    The fingerprint is stored next to the generated Page Object so regeneration can be skipped.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def _read_chunks(html_path: str) -> Iterable[str]:
+        try:
+            with open(html_path, "r", encoding="utf-8", errors="replace") as f:
+                yield from iter(lambda: f.read(PageFingerprint.CHUNK_SIZE), "")
+        except OSError as e:
+            raise RuntimeError(f"Cannot read file: {html_path}") from e
+
+    @staticmethod
+    def compute(html_path: str) -> str:
+        """Returns the structural fingerprint of an HTML file."""
+        hasher = _StructureHasher()
+        for chunk in PageFingerprint._read_chunks(html_path):
+            hasher.feed(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def locators(html_path: str) -> List[str]:
+        """Returns the locators a rule-based Page Object would use for the page, as 'STRATEGY=value' strings."""
+        distiller = HtmlDistiller()
+        for chunk in PageFingerprint._read_chunks(html_path):
+            distiller.feed(chunk)
+        distiller.close()
+        elements = distiller.elements
+        return sorted(
+            f"{locator.strategy}={locator.value}"
+            for locator in RuleBasedPageObjectGenerator.extract_locators(elements)
+        )
+
+    @staticmethod
+    def path_for(page_object_path: str) -> Path:
+        """Returns where the fingerprint of a Page Object is stored (e.g. pages/login_page.fingerprint.json)."""
+        return Path(page_object_path).with_suffix(".fingerprint.json")
+
+    @staticmethod
+    def load(page_object_path: str) -> Optional[dict]:
+        """Loads the stored fingerprint of a Page Object, or None if there is none."""
+        try:
+            return json.loads(FilesUtil.read(str(PageFingerprint.path_for(page_object_path))))
+        except (RuntimeError, ValueError):
+            return None
+
+    @staticmethod
+    def save(page_object_path: str, fingerprint: str, locators: List[str], strategy: str):
+        """Stores the fingerprint of the page a Page Object was generated from."""
+        data = {"fingerprint": fingerprint, "strategy": strategy, "locators": locators}
+        FilesUtil.write(str(PageFingerprint.path_for(page_object_path)), json.dumps(data, indent=2))
+
+    @staticmethod
+    def diff(old_locators: List[str], new_locators: List[str]) -> StructureDiff:
+        """Compares the locators of two versions of a page."""
+        old, new = set(old_locators), set(new_locators)
+        return StructureDiff(added=sorted(new - old), removed=sorted(old - new))
@@ -0,0 +1,80 @@
+# src/page_object_generation_check.py
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+
+from .files_util import FilesUtil
+from .page_object_generator import PageObjectGenerator
+from .tracing import Tracer
+
+# The SauceDemo login page (https://www.saucedemo.com/) as served, trimmed to its markup
+SAUCEDEMO_LOGIN_URL = "https://www.saucedemo.com/"
+SAUCEDEMO_LOGIN_HTML = """<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Swag Labs</title></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript>
+<div id="root"><div class="login_container"><div class="login_logo">Swag Labs</div>
+<div class="login_wrapper" data-test="login-container"><div class="login_wrapper-inner">
+<div id="login_button_container" class="form_column"><div class="login-box"><form>
+<div class="form_group"><input class="input_error form_input" placeholder="Username" type="text" data-test="username" id="user-name" name="user-name" autocorrect="off" autocapitalize="none" value=""></div>
+<div class="form_group"><input class="input_error form_input" placeholder="Password" type="password" data-test="password" id="password" name="password" autocorrect="off" autocapitalize="none" value=""></div>
+<div class="error-message-container"></div>
+<input type="submit" class="submit-button btn_action" data-test="login-button" id="login-button" name="login-button" value="Login">
+</form></div></div></div>
+<div class="login_credentials_wrap"><div class="login_credentials_wrap-inner">
+<div id="login_credentials" class="login_credentials" data-test="login-credentials"><h4>Accepted usernames are:</h4>standard_user<br>locked_out_user<br>problem_user<br></div>
+<div class="login_password" data-test="login-password"><h4>Password for all users:</h4>secret_sauce</div>
+</div></div></div></div></div>
+</body></html>
+"""
+# Locators the login tests rely on (see pages/login_page.py)
+EXPECTED_LOCATORS = (
+    'USERNAME_FIELD = (By.ID, "user-name")',
+    'PASSWORD_FIELD = (By.ID, "password")',
+    'LOGIN_BUTTON = (By.ID, "login-button")',
+    'ERROR_MESSAGE_CONTAINER = (By.CSS_SELECTOR, ".error-message-container")',
+)
+
+
+def check() -> List[str]:
+    """
+    Generates the SauceDemo login Page Object with the 'auto' strategy and returns the problems found:
+    LLM calls made (the page must be generated from rules alone) and expected locators missing.
+    """
+    Tracer.enable()
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            html_path = str(Path(output_dir) / "login.html")
+            FilesUtil.write(html_path, SAUCEDEMO_LOGIN_HTML)
+            page_object_path = PageObjectGenerator.generate_page_object(
+                html_path, "login", SAUCEDEMO_LOGIN_URL, strategy="auto", force=True, output_dir=output_dir
+            )
+            code = FilesUtil.read(page_object_path)
+        llm_calls = [event["name"] for event in Tracer.events() if event["cat"] == "llm"]
+    finally:
+        Tracer.disable()
+
+    problems = [f"{len(llm_calls)} LLM call(s): {', '.join(llm_calls)}"] if llm_calls else []
+    problems += [f"missing locator: {locator}" for locator in EXPECTED_LOCATORS if locator not in code]
+    return problems
+
+
+def main():
+    """
+    Checks that simple pages get their Page Object without an LLM call, e.g.:
+
+        python -m src.page_object_generation_check     # exit status 1 if the check fails
+    """
+    argparse.ArgumentParser(
+        description="Check that the SauceDemo login Page Object is generated from HTML rules, without an LLM call."
+    ).parse_args()
+    problems = check()
+    if problems:
+        print("\nPage Object generation check failed:")
+        for problem in problems:
+            print(f"  - {problem}")
+        raise SystemExit(1)
+    print("\nPage Object generation check passed: SauceDemo login page generated without an LLM call.")
+
+
+if __name__ == "__main__":
+    main()
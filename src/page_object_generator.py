@@ -1,66 +1,227 @@
 # src/page_object_generator.py
+import argparse
 import codecs
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
 
 from .files_util import FilesUtil
+from .html_distiller import HtmlDistiller
+from .page_fingerprint import PageFingerprint
 from .mistral_client import MistralClient
+from .page_source_getter import PageSource, PageSourceGetter
+from .rule_based_page_object_generator import RuleBasedPageObjectGenerator
 from .test_case_parser import extract_assistant_content, extract_code_from_response # Updated imports
 
 class PageObjectGenerator:
     GENERATION_PROMPT_PATH = "prompts/01_page_object_from_html.txt"
+    ENRICHMENT_PROMPT_PATH = "prompts/07_page_object_enrichment.txt"
     OUTPUT_DIR = "pages" # Where the generated page objects will live
+    HTML_DIR = "generated/pages_html" # Where crawled page sources are saved
+    MAX_WORKERS = 4
+    DISTILL_HTML = True # Send distilled HTML instead of the raw page source to the LLM
+    STRATEGY = "auto" # 'llm', 'rules', 'rules+llm' or 'auto' (see generate_page_object)
+    SKIP_UNCHANGED = True # Keep the existing Page Object if the page's structural fingerprint is unchanged
 
     @staticmethod
-    def generate_page_object(html_content_path: str, page_name: str) -> str:
+    def page_name_from_url(url: str) -> str:
+        """Derives a page name from a URL path (e.g. '/inventory.html' -> 'inventory', '/' -> 'home')."""
+        path = urlparse(url).path.rstrip("/")
+        last_segment = path.rsplit("/", 1)[-1].split(".", 1)[0]
+        name = re.sub(r"[^a-zA-Z0-9]+", "_", last_segment).strip("_").lower()
+        return name or "home"
+
+    @staticmethod
+    def generate_page_objects(page_sources: List[PageSource]) -> Dict[str, str]:
+        """
+        Generates one Page Object per crawled page.
+
+        Args:
+            page_sources: Pages fetched by PageSourceGetter.crawl. Pages that failed to load are skipped.
+
+        Returns:
+            A mapping of page URL to the path of its generated Page Object file.
+        """
+        jobs = []
+        used_names = set()
+        for page_source in page_sources:
+            if page_source.error:
+                continue
+            base_name = PageObjectGenerator.page_name_from_url(page_source.url)
+            page_name, suffix = base_name, 2
+            while page_name in used_names:
+                page_name, suffix = f"{base_name}_{suffix}", suffix + 1
+            used_names.add(page_name)
+
+            html_path = str(Path(PageObjectGenerator.HTML_DIR) / f"{page_name}.html")
+            FilesUtil.write(html_path, page_source.html)
+            jobs.append((page_source.url, html_path, page_name))
+
+        generated = {}
+        with ThreadPoolExecutor(max_workers=PageObjectGenerator.MAX_WORKERS) as executor:
+            futures = {
+                url: executor.submit(PageObjectGenerator.generate_page_object, html_path, page_name, url)
+                for url, html_path, page_name in jobs
+            }
+            for url, future in futures.items():
+                try:
+                    generated[url] = future.result()
+                except Exception as e:
+                    print(f"Error generating Page Object for {url}: {e}")
+        return generated
+
+    @staticmethod
+    def _generate_with_llm(prompt_for_llm: str) -> str:
+        """Calls the LLM with a prompt and returns the Python code from its response."""
+        raw_llm_response = "N/A"
+        try:
+            raw_llm_response = MistralClient.call(prompt_for_llm)
+
+            # Extract the assistant's content from the raw API response JSON
+            llm_response_content = extract_assistant_content(raw_llm_response)
+
+            # Extract clean code from markdown fences within the content
+            generated_code_str = extract_code_from_response(llm_response_content)
+
+            # Decode escape sequences like \n and \t into real characters
+            return codecs.decode(generated_code_str, 'unicode_escape')
+        except Exception:
+            print(f"Raw LLM response (for debugging): {raw_llm_response}")
+            raise
+
+    @staticmethod
+    def _compiles(code: str, path: Path) -> bool:
+        """Returns True if the code is valid Python (printing the syntax error otherwise)."""
+        try:
+            compile(code, str(path), "exec")
+            return True
+        except (SyntaxError, ValueError) as e:
+            print(f"Syntax error in generated Page Object '{path}': {e}")
+            return False
+
+    @staticmethod
+    def generate_page_object(
+        html_content_path: str, page_name: str, url: str = "", strategy: Optional[str] = None, force: bool = False,
+        output_dir: str = "."
+    ) -> str:
         """
         Generates a Page Object Model (POM) class based on provided HTML content.
 
         Args:
             html_content_path: Path to the HTML content file.
             page_name: The name of the page (e.g., "login", "products") to determine class name and file name.
+            url: The URL of the page, used by rule-based generation for the Page Object's `url`.
+            strategy: 'llm' asks the LLM to write the Page Object, 'rules' derives it from the HTML
+                      without an LLM call, 'rules+llm' derives it and lets the LLM enrich the methods,
+                      and 'auto' uses 'rules' when every form control is addressable and 'llm' otherwise.
+                      Defaults to STRATEGY.
+            force: Regenerate even if the page structure matches the stored fingerprint.
+            output_dir: Directory the pages/ directory is created in.
 
         Returns:
             The path to the generated Page Object file.
         """
+        strategy = requested_strategy = strategy or PageObjectGenerator.STRATEGY
+        if strategy not in ("llm", "rules", "rules+llm", "auto"):
+            raise ValueError(f"Unknown page object generation strategy: {strategy}")
+
+        # Determine file name (e.g., "login" -> "login_page.py")
+        file_name = f"{page_name.lower()}_page.py"
+        pages_dir = Path(output_dir) / PageObjectGenerator.OUTPUT_DIR
+        output_file_path = pages_dir / file_name
+
+        # Skip regeneration when the page structure is unchanged since the last run
+        fingerprint = PageFingerprint.compute(html_content_path)
+        locators = PageFingerprint.locators(html_content_path)
+        stored_fingerprint = PageFingerprint.load(str(output_file_path))
+        if stored_fingerprint and output_file_path.exists():
+            if (
+                PageObjectGenerator.SKIP_UNCHANGED and not force
+                and stored_fingerprint.get("fingerprint") == fingerprint
+                and stored_fingerprint.get("strategy") == requested_strategy
+                # The Page Object hard-codes its locators, so any locator change means regenerating it
+                and stored_fingerprint.get("locators") == locators
+            ):
+                print(f"-> Page structure of '{page_name}' unchanged, keeping '{output_file_path}'")
+                return str(output_file_path)
+            structure_diff = PageFingerprint.diff(stored_fingerprint.get("locators", []), locators)
+            print(f"-> Page structure of '{page_name}' changed since the last generation:")
+            print(structure_diff.to_text())
+
         try:
-            html_content = FilesUtil.read(html_content_path)
+            if PageObjectGenerator.DISTILL_HTML:
+                # Keep only locator-relevant elements to cut prompt tokens
+                distillation = HtmlDistiller.distill_file(html_content_path)
+                html_content = distillation.html
+                distilled_path = str(Path(html_content_path).with_suffix(".distilled.html"))
+                FilesUtil.write(distilled_path, html_content)
+                print(f"-> Distilled HTML saved to '{distilled_path}': {distillation.summary()}")
+            else:
+                html_content = FilesUtil.read(html_content_path)
         except Exception as e:
             print(f"Error: Could not read HTML content from '{html_content_path}': {e}")
             raise
 
-        generation_prompt_template = FilesUtil.read(PageObjectGenerator.GENERATION_PROMPT_PATH)
+        if strategy == "auto":
+            is_simple = RuleBasedPageObjectGenerator.is_simple_page(HtmlDistiller.parse_elements(html_content))
+            strategy = "rules" if is_simple else "llm"
 
-        # Prepare the prompt for the LLM
-        prompt_for_llm = generation_prompt_template.replace("{{PAGE_HTML}}", html_content)
-        
-        print(f"\nGenerating Page Object for page '{page_name}'...")
+        print(f"\nGenerating Page Object for page '{page_name}' (strategy: {strategy})...")
         try:
-            raw_llm_response = MistralClient.call(prompt_for_llm)
-            
-            # Extract the assistant's content from the raw API response JSON
-            llm_response_content = extract_assistant_content(raw_llm_response)
-            
-            # Extract clean code from markdown fences within the content
-            generated_code_str = extract_code_from_response(llm_response_content)
-            
-            # Decode escape sequences like \n and \t into real characters
-            final_code = codecs.decode(generated_code_str, 'unicode_escape')
+            if strategy != "llm":
+                final_code = RuleBasedPageObjectGenerator.generate(html_content, page_name, url)
+                if requested_strategy == "auto" and not PageObjectGenerator._compiles(final_code, output_file_path):
+                    print("-> Rule-based Page Object does not compile, generating it with the LLM instead")
+                    strategy = "llm"
+                elif strategy == "rules+llm":
+                    enrichment_prompt_template = FilesUtil.read(PageObjectGenerator.ENRICHMENT_PROMPT_PATH)
+                    prompt_for_llm = enrichment_prompt_template.replace("{{PAGE_OBJECT_CODE}}", final_code)
+                    prompt_for_llm = prompt_for_llm.replace("{{PAGE_HTML}}", html_content)
+                    final_code = PageObjectGenerator._generate_with_llm(prompt_for_llm)
+            if strategy == "llm":
+                generation_prompt_template = FilesUtil.read(PageObjectGenerator.GENERATION_PROMPT_PATH)
+                # Prepare the prompt for the LLM
+                prompt_for_llm = generation_prompt_template.replace("{{PAGE_HTML}}", html_content)
+                final_code = PageObjectGenerator._generate_with_llm(prompt_for_llm)
 
-            # Determine class name (e.g., "Login" -> "LoginPage")
-            class_name = f"{page_name.capitalize()}Page"
-            # Determine file name (e.g., "login" -> "login_page.py")
-            file_name = f"{page_name.lower()}_page.py"
-            output_file_path = Path(PageObjectGenerator.OUTPUT_DIR) / file_name
+            # A Page Object that does not compile would fail every generated test at import
+            if not PageObjectGenerator._compiles(final_code, output_file_path):
+                raise RuntimeError(f"Generated Page Object code ({strategy}) is not valid Python")
 
             # Make sure the output directory exists
-            Path(PageObjectGenerator.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-            
+            pages_dir.mkdir(parents=True, exist_ok=True)
+
             FilesUtil.write(str(output_file_path), final_code)
+            PageFingerprint.save(str(output_file_path), fingerprint, locators, requested_strategy)
             print(f"-> Generated Page Object saved to '{output_file_path}'")
             return str(output_file_path)
 
         except Exception as e:
             print(f"Error generating Page Object for '{page_name}': {e}")
-            print(f"Raw LLM response (for debugging): {raw_llm_response}")
             raise
+
+
+def main():
+    """
+    Crawls one or more URLs and generates a Page Object per page, e.g.:
+
+        python -m src.page_object_generator https://www.saucedemo.com/ --depth 1
+    """
+    parser = argparse.ArgumentParser(description="Crawl pages and generate one Page Object per page.")
+    parser.add_argument("urls", nargs="+", help="URLs to crawl.")
+    parser.add_argument("--depth", type=int, default=0, help="Levels of same-origin links to follow.")
+    parser.add_argument("--browsers", type=int, default=3, help="Number of reused headless browsers.")
+    parser.add_argument("--max-pages", type=int, default=50)
+    args = parser.parse_args()
+
+    page_sources = PageSourceGetter.crawl(
+        args.urls, max_browsers=args.browsers, follow_links_depth=args.depth, max_pages=args.max_pages
+    )
+    for url, path in PageObjectGenerator.generate_page_objects(page_sources).items():
+        print(f"{url} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,285 @@
 # src/page_source_getter.py
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+# selenium and webdriver_manager are imported when a browser is first needed,
+# so modules that only use BrowserPool or same_origin_links import quickly
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@dataclass(frozen=True)
+class PageSource:
+    """The page source fetched for one URL, with the time it took to fetch it."""
+    url: str
+    html: str
+    seconds: float
+    error: Optional[str] = None
+
+
+class _LinkCollector(HTMLParser):
+    """Collects the href of every <a> tag of an HTML document."""
+
+    def __init__(self):
+        super().__init__()
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href)
+
+
+class BrowserPool:
+    """
+    A small pool of reusable headless Chrome drivers.
+    Drivers are started lazily, up to `size`, and quit when the pool is closed.
+    A driver whose `with` block raised (a crashed or dead session) is quit instead of
+    returned, and the next checkout starts a fresh browser in its place.
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = max(1, size)
+        # Idle drivers, and None for each slot freed by a discarded driver
+        self._idle: "queue.Queue[Optional[WebDriver]]" = queue.Queue()
+        self._drivers: List["WebDriver"] = []
+        self._lock = threading.Lock()
+
+    def _start_driver(self) -> "WebDriver":
+        """Starts a driver in a free slot; the caller holds the lock."""
+        driver = PageSourceGetter.create_driver()
+        self._drivers.append(driver)
+        return driver
+
+    @contextmanager
+    def driver(self) -> Iterator["WebDriver"]:
+        """Borrows a driver from the pool for the duration of the `with` block."""
+        driver = None
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._drivers) < self.size:
+                    driver = self._start_driver()
+            if driver is None:
+                driver = self._idle.get()
+        if driver is None:
+            # The slot of a discarded driver
+            try:
+                with self._lock:
+                    driver = self._start_driver()
+            except BaseException:
+                self._idle.put(None)
+                raise
+        try:
+            yield driver
+        except Exception:
+            # Possibly a crashed browser or dead session: never hand this driver out again
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._idle.put(driver)
+            raise
+        self._idle.put(driver)
+
+    def _discard(self, driver: "WebDriver"):
+        """Quits a driver that failed and frees its slot for a new one."""
+        with self._lock:
+            if driver not in self._drivers:
+                return
+            self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Warning: Failed to quit browser: {e}")
+        self._idle.put(None)
+
+    def close(self):
+        """Quits every driver started by the pool."""
+        with self._lock:
+            for driver in self._drivers:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    print(f"Warning: Failed to quit browser: {e}")
+            self._drivers = []
+            self._idle = queue.Queue()
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 class PageSourceGetter:
     """A utility to get the page source HTML of a given URL."""
 
+    PAGE_LOAD_TIMEOUT_SECONDS = 15
+
+    _driver_path: Optional[str] = None
+    _driver_path_lock = threading.Lock()
+
+    @staticmethod
+    def get_driver_path() -> str:
+        """Resolves the chromedriver binary once per process."""
+        if PageSourceGetter._driver_path is None:
+            with PageSourceGetter._driver_path_lock:
+                if PageSourceGetter._driver_path is None:
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    PageSourceGetter._driver_path = ChromeDriverManager().install()
+        return PageSourceGetter._driver_path
+
     @staticmethod
-    def get_source(url: str) -> str:
+    def create_driver() -> "WebDriver":
+        """Starts a new headless Chrome driver."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in headless mode
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+
+        service = Service(PageSourceGetter.get_driver_path())
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    @staticmethod
+    def _fetch(driver: "WebDriver", url: str) -> str:
+        """Loads a URL in the given driver and returns its page source."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver.get(url)
+        # Wait for the body tag to be present, a good sign the page has started loading
+        WebDriverWait(driver, PageSourceGetter.PAGE_LOAD_TIMEOUT_SECONDS).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        return driver.page_source
+
+    @staticmethod
+    def get_source(url: str, pool: Optional[BrowserPool] = None) -> str:
         """
         Opens a URL in a headless browser and returns its page source.
 
         Args:
             url: The URL to fetch.
+            pool: A browser pool to borrow an already running browser from; a new browser
+                  is started (and quit afterwards) otherwise.
 
         Returns:
             The page source HTML as a string.
         """
         print(f"Fetching page source for: {url}")
-        
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in headless mode
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
+        if pool is not None:
+            try:
+                with pool.driver() as driver:
+                    page_source = PageSourceGetter._fetch(driver, url)
+            except Exception as e:
+                print(f"Error fetching page source for {url}: {e}")
+                raise
+            print("-> Successfully fetched page source.")
+            return page_source
+
+        driver = PageSourceGetter.create_driver()
+
         page_source = ""
         try:
-            driver.get(url)
-            # Wait for the body tag to be present, a good sign the page has started loading
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            page_source = driver.page_source
+            page_source = PageSourceGetter._fetch(driver, url)
             print("-> Successfully fetched page source.")
         except Exception as e:
             print(f"Error fetching page source for {url}: {e}")
             raise
         finally:
             driver.quit()
-            
+
         return page_source
+
+    @staticmethod
+    def same_origin_links(page_url: str, html: str) -> List[str]:
+        """Returns the distinct same-origin links of a page, resolved to absolute URLs without fragments."""
+        collector = _LinkCollector()
+        collector.feed(html)
+        origin = urlparse(page_url)
+        links = []
+        for href in collector.hrefs:
+            link = urldefrag(urljoin(page_url, href))[0]
+            parsed = urlparse(link)
+            if (parsed.scheme, parsed.netloc) == (origin.scheme, origin.netloc) and link not in links:
+                links.append(link)
+        return links
+
+    @staticmethod
+    def crawl(
+        urls: List[str],
+        max_browsers: int = 3,
+        follow_links_depth: int = 0,
+        max_pages: int = 50,
+        pool: Optional[BrowserPool] = None,
+    ) -> List[PageSource]:
+        """
+        Fetches several pages concurrently over a small pool of reused headless browsers.
+
+        Args:
+            urls: The URLs to fetch.
+            max_browsers: Number of browsers (and concurrent fetches) in the pool.
+            follow_links_depth: How many levels of same-origin links to follow from the given URLs.
+            max_pages: Upper bound on the number of pages fetched.
+            pool: An existing browser pool to use; a temporary one is created and closed otherwise.
+
+        Returns:
+            One PageSource per fetched URL, in discovery order. Pages that failed to load
+            have an empty `html` and the error message set.
+        """
+        owns_pool = pool is None
+        pool = pool or BrowserPool(max_browsers)
+
+        def fetch(url: str) -> PageSource:
+            started_at = time.perf_counter()
+            try:
+                with pool.driver() as driver:
+                    html = PageSourceGetter._fetch(driver, url)
+                return PageSource(url, html, time.perf_counter() - started_at)
+            except Exception as e:
+                return PageSource(url, "", time.perf_counter() - started_at, error=str(e))
+
+        results: List[PageSource] = []
+        seen = set()
+        level = [url for url in dict.fromkeys(urls)]
+        crawl_started_at = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                for depth in range(follow_links_depth + 1):
+                    level = [url for url in level if url not in seen][:max_pages - len(results)]
+                    if not level:
+                        break
+                    seen.update(level)
+                    print(f"Crawling {len(level)} page(s) at depth {depth}...")
+                    page_sources = list(executor.map(fetch, level))
+                    results.extend(page_sources)
+
+                    next_level = []
+                    for page_source in page_sources:
+                        if page_source.error:
+                            print(f"   Error fetching {page_source.url}: {page_source.error}")
+                            continue
+                        print(f"   Fetched {page_source.url} ({page_source.seconds:.1f}s)")
+                        next_level.extend(PageSourceGetter.same_origin_links(page_source.url, page_source.html))
+                    level = list(dict.fromkeys(next_level))
+        finally:
+            if owns_pool:
+                pool.close()
+
+        print(f"-> Crawled {len(results)} page(s) in {time.perf_counter() - crawl_started_at:.1f}s.")
+        return results
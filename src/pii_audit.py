@@ -0,0 +1,237 @@
+# src/pii_audit.py
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .pii_finding import PiiFinding
+from .pii_finding_store import PiiFindingStore
+from .pii_masker import PiiMasker
+from .pii_report import PiiReport
+from .pii_stream_scanner import PiiStreamScanner
+
+
+class PiiAudit:
+    """
+    Audits artifact directories for leaked PII before they are uploaded or shared.
+
+    Files are scanned in a process pool; each worker process creates its scanner once (a
+    warm Presidio analyzer) and streams its files chunk by chunk, so large logs don't need
+    to fit in memory. Reports are written as JSON Lines, one per file, as files complete.
+    """
+    DEFAULT_PATHS = ["generated", "tests", "pages"]
+    SKIPPED_DIRS = {".git", "__pycache__", ".pytest_cache", ".venv", "venv", "node_modules", ".llm_cache"}
+    # Bytes sniffed to tell binary files (screenshots, archives) from text
+    SNIFF_BYTES = 8192
+    CHUNK_SIZE = 1024 * 1024
+    # Surrogate escapes keep undecodable bytes intact when a file is masked in place
+    ENCODING_ERRORS = "surrogateescape"
+    # Line endings are read and written untranslated, so offsets and CRLF files stay byte for byte
+    NEWLINE = ""
+
+    _scan: Optional[Callable[[str], PiiReport]] = None
+
+    @staticmethod
+    def iter_files(paths: List[str], exclude: Optional[List[str]] = None) -> Iterator[str]:
+        """Yields the files under the given files and directories, skipping caches and VCS folders."""
+        excluded = {os.path.abspath(path) for path in exclude or []}
+        for path in paths:
+            if os.path.isfile(path):
+                if os.path.abspath(path) not in excluded:
+                    yield path
+                continue
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in PiiAudit.SKIPPED_DIRS)
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    if os.path.abspath(file_path) not in excluded:
+                        yield file_path
+
+    @staticmethod
+    def is_binary(path: str) -> bool:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(PiiAudit.SNIFF_BYTES)
+
+    @staticmethod
+    def _init_worker(engine: str):
+        """Creates the scanner of a worker process once, before it receives any file."""
+        if engine == "regex":
+            from .pii_scanner import PiiScanner
+            PiiAudit._scan = PiiScanner.scan
+        else:
+            from .presidio_pii_scanner import PresidioPiiScanner
+            PresidioPiiScanner._get_analyzer()
+            PiiAudit._scan = PresidioPiiScanner.scan
+
+    @staticmethod
+    def _mask_file(path: str, findings: Iterable[PiiFinding]) -> int:
+        """
+        Rewrites a file with its findings masked, streaming it chunk by chunk.
+        The new content replaces the file atomically. Returns the number of masked findings.
+        """
+        masks = []
+        for finding in PiiMasker.resolve_overlaps(findings):
+            replacement = PiiMasker.replacement_for(finding)
+            if replacement is not None:
+                masks.append((finding.start, finding.end, replacement))
+        if not masks:
+            return 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".pii_audit_")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", errors=PiiAudit.ENCODING_ERRORS, newline=PiiAudit.NEWLINE) as out:
+                position = 0 # Offset of the current chunk in the file
+                index = 0
+                chunks = PiiStreamScanner.read_chunks(
+                    path, PiiAudit.CHUNK_SIZE, errors=PiiAudit.ENCODING_ERRORS, newline=PiiAudit.NEWLINE
+                )
+                for chunk in chunks:
+                    cursor = 0 # Position in the chunk
+                    chunk_end = position + len(chunk)
+                    while index < len(masks) and masks[index][0] < chunk_end:
+                        start, end, replacement = masks[index]
+                        if start >= position + cursor:
+                            out.write(chunk[cursor:start - position])
+                            out.write(replacement)
+                        if end > chunk_end:
+                            # The finding continues in the next chunk
+                            cursor = len(chunk)
+                            break
+                        cursor = end - position
+                        index += 1
+                    out.write(chunk[cursor:])
+                    position = chunk_end
+            os.chmod(tmp_path, os.stat(path).st_mode)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return len(masks)
+
+    @staticmethod
+    def audit_file(path: str, mask_in_place: bool = False, show_values: bool = False) -> Dict[str, Any]:
+        """
+        Scans one file (in the calling worker process) and optionally masks it in place.
+
+        Returns:
+            The file's report: path, size, findings (type and offsets; values only if
+            show_values), counts per PII type, seconds, and masked/error where applicable.
+        """
+        started_at = time.perf_counter()
+        report: Dict[str, Any] = {"path": path, "bytes": 0, "findings": [], "counts": {}}
+        try:
+            report["bytes"] = os.path.getsize(path)
+            if PiiAudit.is_binary(path):
+                report["skipped"] = "binary"
+                return report
+            if PiiAudit._scan is None:
+                PiiAudit._init_worker("presidio")
+
+            chunks = PiiStreamScanner.read_chunks(
+                path, PiiAudit.CHUNK_SIZE, errors=PiiAudit.ENCODING_ERRORS, newline=PiiAudit.NEWLINE
+            )
+            # Values are only kept when they are reported or needed for masking
+            keep_values = show_values or mask_in_place
+            findings = PiiFindingStore()
+            for finding in PiiStreamScanner.scan_chunks(chunks, PiiAudit._scan):
+                findings.add(finding.pii_type, finding.start, finding.end, finding.value if keep_values else None)
+            report["counts"] = dict(Counter(finding.pii_type for finding in findings))
+            report["findings"] = [
+                {"type": f.pii_type, "start": f.start, "end": f.end, **({"value": f.value} if show_values else {})}
+                for f in findings
+            ]
+            if mask_in_place and len(findings):
+                report["masked"] = PiiAudit._mask_file(path, findings)
+        except Exception as e:
+            report["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            report["seconds"] = round(time.perf_counter() - started_at, 4)
+        return report
+
+    @staticmethod
+    def run(
+        paths: List[str],
+        output,
+        workers: Optional[int] = None,
+        engine: str = "presidio",
+        mask_in_place: bool = False,
+        show_values: bool = False,
+        exclude: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Audits all files under `paths` in a process pool, writing one JSON line per file to `output`.
+
+        Returns:
+            Totals: files, bytes, files with findings, findings per type, errors and throughput.
+        """
+        files = list(PiiAudit.iter_files(paths, exclude))
+        totals: Dict[str, Any] = {"files": 0, "bytes": 0, "files_with_findings": 0, "errors": 0, "counts": Counter()}
+        started_at = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=PiiAudit._init_worker, initargs=(engine,)) as executor:
+            futures = [executor.submit(PiiAudit.audit_file, path, mask_in_place, show_values) for path in files]
+            for future in as_completed(futures):
+                report = future.result()
+                output.write(json.dumps(report, ensure_ascii=False) + "\n")
+                output.flush()
+                totals["files"] += 1
+                totals["bytes"] += report["bytes"]
+                totals["errors"] += 1 if "error" in report else 0
+                if report["findings"]:
+                    totals["files_with_findings"] += 1
+                    totals["counts"].update(report["counts"])
+
+        totals["seconds"] = time.perf_counter() - started_at
+        totals["counts"] = dict(totals["counts"])
+        return totals
+
+    @staticmethod
+    def summary(totals: Dict[str, Any]) -> str:
+        seconds = max(totals["seconds"], 1e-9)
+        counts = ", ".join(f"{name}: {count}" for name, count in sorted(totals["counts"].items())) or "none"
+        return (
+            f"Audited {totals['files']} file(s), {totals['bytes'] / 1e6:.1f} MB in {totals['seconds']:.2f}s "
+            f"({totals['files'] / seconds:.1f} files/s, {totals['bytes'] / 1e6 / seconds:.2f} MB/s). "
+            f"{totals['files_with_findings']} file(s) with PII ({counts}), {totals['errors']} error(s)."
+        )
+
+
+def main():
+    """
+    Audits artifact directories for PII, e.g.:
+
+        python -m src.pii_audit generated tests pages --output generated/pii_audit.jsonl --mask-in-place
+    """
+    parser = argparse.ArgumentParser(description="Scan artifact directories for PII in parallel.")
+    parser.add_argument("paths", nargs="*", default=PiiAudit.DEFAULT_PATHS, help="Files and directories to audit.")
+    parser.add_argument("--output", default="-", help="JSON Lines report file ('-' for stdout).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--engine", choices=["presidio", "regex"], default="presidio")
+    parser.add_argument("--mask-in-place", action="store_true", help="Rewrite files with their PII masked.")
+    parser.add_argument("--show-values", action="store_true", help="Include the PII values in the report.")
+    parser.add_argument("--fail-on-findings", action="store_true", help="Exit with status 1 if PII is found.")
+    args = parser.parse_args()
+
+    paths = [path for path in args.paths if os.path.exists(path)]
+    if args.output == "-":
+        totals = PiiAudit.run(paths, sys.stdout, args.workers, args.engine, args.mask_in_place, args.show_values)
+    else:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as output:
+            totals = PiiAudit.run(paths, output, args.workers, args.engine, args.mask_in_place,
+                                  args.show_values, exclude=[args.output])
+    # The summary goes to stderr so stdout stays valid JSON Lines
+    print(PiiAudit.summary(totals), file=sys.stderr)
+    if args.fail_on_findings and totals["files_with_findings"] and not args.mask_in_place:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
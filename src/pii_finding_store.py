@@ -0,0 +1,170 @@
+# src/pii_finding_store.py
+import json
+from array import array
+from typing import IO, Dict, Iterator, List, Optional
+
+from .pii_finding import PiiFinding
+
+
+class PiiFindingView:
+    """
+    A read-only view of one finding in a PiiFindingStore, with the same attributes as a
+    PiiFinding. Its value is sliced from the scanned text only when accessed.
+    """
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "PiiFindingStore", index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def pii_type(self) -> str:
+        return self._store._types[self._store._type_ids[self._index]]
+
+    @property
+    def start(self) -> int:
+        return self._store._starts[self._index]
+
+    @property
+    def end(self) -> int:
+        return self._store._ends[self._index]
+
+    @property
+    def value(self) -> str:
+        return self._store.value_at(self._index)
+
+    def to_finding(self) -> PiiFinding:
+        return PiiFinding(self.pii_type, self.value, self.start, self.end)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (PiiFinding, PiiFindingView)):
+            return NotImplemented
+        return (self.pii_type, self.start, self.end, self.value) == (other.pii_type, other.start, other.end, other.value)
+
+    def __hash__(self) -> int:
+        return hash((self.pii_type, self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"PiiFindingView(pii_type={self.pii_type!r}, value={self.value!r}, start={self.start}, end={self.end})"
+
+    def __str__(self) -> str:
+        return f"{self.pii_type}: {self.value}"
+
+
+class PiiFindingStore:
+    """
+    A compact, column-oriented store of PII findings.
+
+    Start and end offsets and PII type ids are kept in typed arrays (18 bytes per finding)
+    instead of one PiiFinding object with its own copy of the value per finding. Values are
+    sliced from the scanned text when accessed; they are only stored for findings added
+    without a text.
+    """
+
+    def __init__(self, text: Optional[str] = None):
+        self.text = text
+        self._starts = array("q")
+        self._ends = array("q")
+        self._type_ids = array("H")
+        self._types: List[str] = []
+        self._type_index: Dict[str, int] = {}
+        # Values of findings added without a source text, by position
+        self._values: Dict[int, str] = {}
+
+    def _type_id(self, pii_type: str) -> int:
+        type_id = self._type_index.get(pii_type)
+        if type_id is None:
+            type_id = self._type_index[pii_type] = len(self._types)
+            self._types.append(pii_type)
+        return type_id
+
+    def add(self, pii_type: str, start: int, end: int, value: Optional[str] = None):
+        """
+        Adds a finding. `value` is only kept if it differs from the text slice
+        (e.g. the store has no text).
+        """
+        index = len(self._starts)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._type_ids.append(self._type_id(pii_type))
+        if value is not None and (self.text is None or self.text[start:end] != value):
+            self._values[index] = value
+
+    def add_finding(self, finding):
+        """Adds a PiiFinding (or a view of another store's finding)."""
+        self.add(finding.pii_type, finding.start, finding.end, finding.value)
+
+    def value_at(self, index: int) -> str:
+        value = self._values.get(index)
+        if value is not None:
+            return value
+        if self.text is None:
+            return ""
+        return self.text[self._starts[index]:self._ends[index]]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> PiiFindingView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("finding index out of range")
+        return PiiFindingView(self, index)
+
+    def __iter__(self) -> Iterator[PiiFindingView]:
+        for index in range(len(self._starts)):
+            yield PiiFindingView(self, index)
+
+    def _take(self, indices: List[int]) -> "PiiFindingStore":
+        """Returns a new store with the findings at `indices`, in that order."""
+        store = PiiFindingStore(self.text)
+        store._types = list(self._types)
+        store._type_index = dict(self._type_index)
+        starts, ends, type_ids = self._starts, self._ends, self._type_ids
+        store._starts = array("q", (starts[i] for i in indices))
+        store._ends = array("q", (ends[i] for i in indices))
+        store._type_ids = array("H", (type_ids[i] for i in indices))
+        if self._values:
+            store._values = {new: self._values[old] for new, old in enumerate(indices) if old in self._values}
+        return store
+
+    def _sorted_indices(self) -> List[int]:
+        # By start ascending, then by length descending (longer matches first); sorted() is stable
+        starts, ends = self._starts, self._ends
+        return sorted(range(len(starts)), key=lambda i: (starts[i], starts[i] - ends[i]))
+
+    def sorted(self) -> "PiiFindingStore":
+        """Returns the findings sorted by start, longer findings first at equal starts."""
+        return self._take(self._sorted_indices())
+
+    def filter_overlapping(self) -> "PiiFindingStore":
+        """
+        Returns the findings without overlaps, sorted by position: a finding overlapping an
+        earlier one is dropped, and of two findings starting together the longer one is kept.
+        """
+        kept = []
+        last_end = -1
+        starts, ends = self._starts, self._ends
+        for index in self._sorted_indices():
+            if starts[index] >= last_end:
+                kept.append(index)
+                last_end = ends[index]
+        return self._take(kept)
+
+    def to_findings(self) -> List[PiiFinding]:
+        """Materializes the findings as PiiFinding objects."""
+        return [view.to_finding() for view in self]
+
+    def write_jsonl(self, output: IO[str], include_values: bool = True, extra: Optional[dict] = None):
+        """
+        Writes one JSON object per finding ({"type", "start", "end"[, "value"]} plus `extra`)
+        to a text stream, without materializing the findings.
+        """
+        types, starts, ends, type_ids = self._types, self._starts, self._ends, self._type_ids
+        for index in range(len(starts)):
+            record = dict(extra) if extra else {}
+            record.update(type=types[type_ids[index]], start=starts[index], end=ends[index])
+            if include_values:
+                record["value"] = self.value_at(index)
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -1,89 +1,178 @@
 # src/pii_masker.py
+import bisect
 import re
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
 from .config_loader import config_loader
 from .pii_finding import PiiFinding
 
+# Replacement strings such as '\1[SECRET]' refer back to groups of the mask pattern
+_BACKREFERENCE = re.compile(r"\\(?:\d+|g<\w+>)")
+
+
+@dataclass(frozen=True)
+class MaskedSpan:
+    """One masked finding: where its replacement is in the masked text and what it replaced."""
+    masked_start: int
+    masked_end: int
+    finding: PiiFinding
+    replacement: str
+
+
+@dataclass
+class MaskResult:
+    """The masked text, with a map from masked offsets back to the original text."""
+    text: str
+    spans: List[MaskedSpan] = field(default_factory=list)
+
+    def to_original_offset(self, masked_offset: int) -> int:
+        """
+        Maps an offset in the masked text to the original text. Offsets inside a replacement
+        map to the start of the finding it replaced.
+        """
+        index = bisect.bisect_right([span.masked_start for span in self.spans], masked_offset) - 1
+        if index < 0:
+            return masked_offset
+        span = self.spans[index]
+        if masked_offset < span.masked_end:
+            return span.finding.start
+        return span.finding.end + (masked_offset - span.masked_end)
+
+    def unmask(self, text: Optional[str] = None) -> str:
+        """
+        Restores the original PII values.
+
+        Args:
+            text: Text produced from the masked text, e.g. an LLM answer. Each replacement
+                that stands for a single original value (e.g. '[EMAIL]' if only one email
+                was masked) is replaced by that value; ambiguous replacements and redactions
+                ('****') are left as is.
+                If omitted, the original text is rebuilt exactly from the offset map.
+
+        Returns:
+            The unmasked text.
+        """
+        if text is None:
+            parts = []
+            cursor = 0
+            for span in self.spans:
+                parts.append(self.text[cursor:span.masked_start])
+                parts.append(span.finding.value)
+                cursor = span.masked_end
+            parts.append(self.text[cursor:])
+            return "".join(parts)
+
+        values: Dict[str, set] = {}
+        for span in self.spans:
+            if span.replacement.strip("*"):
+                values.setdefault(span.replacement, set()).add(span.finding.value)
+        unambiguous = {replacement: found.pop() for replacement, found in values.items() if len(found) == 1}
+        if not unambiguous:
+            return text
+        # Longest first, so '[SECRET]' inside a longer replacement doesn't win
+        pattern = re.compile("|".join(re.escape(r) for r in sorted(unambiguous, key=len, reverse=True)))
+        return pattern.sub(lambda match: unambiguous[match.group(0)], text)
+
+
 class PiiMasker:
     """Masks PII in a given text based on specific findings."""
 
-    _rules_map: Dict[str, Dict[str, Any]] = {}
-
     @staticmethod
     def _get_rules_map() -> Dict[str, Dict[str, Any]]:
-        """Builds a map of pii_type to its rule for quick lookup."""
-        if not PiiMasker._rules_map:
-            rules = config_loader.get_rules()
-            # Assuming 'name' in rule is the pii_type
-            PiiMasker._rules_map = {rule["name"]: rule for rule in rules}
-        return PiiMasker._rules_map
+        """Returns the map of pii_type to its rule of the current rule set."""
+        return config_loader.get_rule_set().rules_by_name
 
     @staticmethod
-    def mask(text: str, findings: List[PiiFinding]) -> str:
+    def resolve_overlaps(findings: List[PiiFinding]) -> List[PiiFinding]:
         """
-        Masks PII in the input text based on a list of PiiFinding objects.
-        
+        Removes findings that overlap an earlier one, sorted by position.
+        Of two findings starting at the same position, the longer one is kept.
+        """
+        # Sort by start index ascending, and by length descending to prioritize longer matches
+        sorted_findings = sorted(findings, key=lambda f: (f.start, -(f.end - f.start)))
+
+        filtered_list = []
+        last_finding_end = -1
+        for finding in sorted_findings:
+            # Only keep the finding if it does not overlap with the last one kept
+            if finding.start >= last_finding_end:
+                filtered_list.append(finding)
+                last_finding_end = finding.end
+        return filtered_list
+
+    @staticmethod
+    def _replacement(finding: PiiFinding, rule: Dict[str, Any]) -> str:
+        """Returns the text a finding is replaced with, following its rule's strategy."""
+        redacted = '*' * len(finding.value)
+        strategy = rule.get("strategy", "replace") # Default to 'replace'
+        if strategy != "replace":
+            # 'redact', and unknown strategies fall back to redaction
+            return redacted
+
+        replacement = rule["mask_replacement"]
+        if not _BACKREFERENCE.search(replacement):
+            return replacement
+        # Expand references like '\1' against the precompiled mask pattern (e.g. keep 'password: ')
+        match = rule["compiled_mask_pattern"].match(finding.value)
+        if not match:
+            # Fallback if the pattern doesn't match finding.value itself, though it should
+            return redacted
+        return match.expand(replacement) + finding.value[match.end():]
+
+    @staticmethod
+    def replacement_for(finding: PiiFinding) -> Optional[str]:
+        """Returns the text a finding is masked with, or None if its PII type has no rule."""
+        rule = PiiMasker._get_rules_map().get(finding.pii_type)
+        return PiiMasker._replacement(finding, rule) if rule else None
+
+    @staticmethod
+    def mask_with_map(text: str, findings: List[PiiFinding]) -> MaskResult:
+        """
+        Masks PII in the input text in a single forward pass.
+
+        Overlapping findings are resolved first (see resolve_overlaps); findings of PII types
+        without a rule in config.yaml are left unmasked.
+
         Args:
             text: The original text.
             findings: A list of PiiFinding objects.
-            
+
         Returns:
-            The text with PII masked.
+            A MaskResult with the masked text and the offset map back to the original.
         """
-        # Convert text to a list of characters for efficient in-place replacement
-        masked_text_chars = list(text) 
         rules_map = PiiMasker._get_rules_map()
+        parts: List[str] = []
+        spans: List[MaskedSpan] = []
+        cursor = 0 # Position in the original text
+        masked_length = 0
 
-        # Iterate through findings in reverse order to avoid altering indices of subsequent findings
-        for finding in sorted(findings, key=lambda f: f.start, reverse=True):
+        for finding in PiiMasker.resolve_overlaps(findings):
             rule = rules_map.get(finding.pii_type)
             if not rule:
                 # If no rule is found for this PII type, skip masking it
                 continue
+            replacement = PiiMasker._replacement(finding, rule)
+            unchanged = text[cursor:finding.start]
+            parts.append(unchanged)
+            parts.append(replacement)
+            masked_start = masked_length + len(unchanged)
+            masked_length = masked_start + len(replacement)
+            spans.append(MaskedSpan(masked_start, masked_length, finding, replacement))
+            cursor = finding.end
 
-            strategy = rule.get("strategy", "replace") # Default to 'replace'
-            
-            replacement_str = ""
-            if strategy == "redact":
-                replacement_str = '*' * len(finding.value)
-            elif strategy == "replace":
-                # For 'replace' strategy, we use the mask_replacement from the rule.
-                # Special handling for PASSWORD where the replacement might contain backreferences like \1
-                # We need to re-evaluate the replacement string with actual group values if needed.
-                # However, since we are replacing a slice, simple string replacement is used.
-                # The regex-based masking with \1 was handled by re.sub in the previous version.
-                # Here, we need to apply the replacement to the *found value* if it has groups.
-                # For simplicity, if it's 'replace', we use the static mask_replacement defined.
-                # If the user wants dynamic \1 style replacement with finding.value,
-                # they need to specify the exact replacement logic in config.
-                replacement_str = rule["mask_replacement"]
-                
-                # A hack to handle the \1 in password replacement for now, as simple slicing doesn't support it.
-                # This assumes the original mask_replacement has \1 and we need to apply it to finding.value
-                # This part might need further refinement based on specific complex masking requirements.
-                # For this specific case (password: \1[SECRET]), it's better to make mask_replacement explicit
-                # like "password: [SECRET]" rather than using \1 if we replace by slice.
-                # Let's assume for 'replace' strategy, mask_replacement is already the final string.
-                # The current config.yaml has '\1[SECRET]' for password.
-                # This needs to be applied by finding the first group again in the exact match.
-                
-                # Re-applying a small regex to the exact finding.value to handle \1 if needed.
-                if '\\1' in replacement_str:
-                    # This is specifically for password, assuming it's the only one using \1
-                    original_mask_pattern = re.compile(rule["mask_pattern"])
-                    match_in_finding_value = original_mask_pattern.match(finding.value) # Use match to check from start
-                    if match_in_finding_value:
-                        # Reconstruct replacement using matched groups
-                        replacement_str = original_mask_pattern.sub(replacement_str, finding.value, count=1)
-                    else:
-                        # Fallback if pattern doesn't match finding.value itself, though it should.
-                        replacement_str = '*' * len(finding.value) # Fallback to redact
-                
-            else:
-                # Handle unknown strategy, default to redaction or raise an error
-                replacement_str = '*' * len(finding.value) # Fallback to redact
-
-            # Replace the characters in the list slice
-            masked_text_chars[finding.start:finding.end] = list(replacement_str)
+        parts.append(text[cursor:])
+        return MaskResult("".join(parts), spans)
+
+    @staticmethod
+    def mask(text: str, findings: List[PiiFinding]) -> str:
+        """
+        Masks PII in the input text based on a list of PiiFinding objects.
         
-        return "".join(masked_text_chars)
+        Args:
+            text: The original text.
+            findings: A list of PiiFinding objects.
+            
+        Returns:
+            The text with PII masked.
+        """
+        return PiiMasker.mask_with_map(text, findings).text
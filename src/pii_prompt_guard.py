@@ -0,0 +1,141 @@
+# src/pii_prompt_guard.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config_loader import config_loader
+from .pii_finding import PiiFinding
+from .pii_report import PiiReport
+
+
+class PiiPromptGuard:
+    """
+    Scans templated prompts for PII segment by segment.
+
+    A prompt is a static template from prompts/ with values inserted for its {{PLACEHOLDERS}}.
+    Each segment (template text between placeholders, or an inserted value) is scanned once
+    and its findings are cached by content hash, so the same template body or page-object
+    code is not rescanned for every prompt. Matches crossing a segment boundary are found by
+    scanning a small window around each boundary.
+    """
+    PLACEHOLDER = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+    # Longest match guaranteed to be found across a segment boundary is BOUNDARY_WINDOW characters
+    BOUNDARY_WINDOW = 256
+    MAX_CACHED_SEGMENTS = 512
+
+    hits = 0
+    misses = 0
+    _cache: "OrderedDict[str, List[PiiFinding]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def split_template(template: str, values: Dict[str, str]) -> List[str]:
+        """
+        Renders a template into its segments: template text and inserted values, in order.
+        Placeholders without a value are kept as template text. "".join(segments) is the prompt.
+        """
+        segments = []
+        cursor = 0
+        for match in PiiPromptGuard.PLACEHOLDER.finditer(template):
+            if match.group(1) not in values:
+                continue
+            segments.append(template[cursor:match.start()])
+            segments.append(values[match.group(1)])
+            cursor = match.end()
+        segments.append(template[cursor:])
+        return [segment for segment in segments if segment]
+
+    @staticmethod
+    def _default_scan(text: str) -> PiiReport:
+        from .presidio_pii_scanner import PresidioPiiScanner
+        return PresidioPiiScanner.scan(text)
+
+    @staticmethod
+    def _segment_findings(segment: str, scan: Callable[[str], PiiReport]) -> List[PiiFinding]:
+        """Returns the findings of a segment (offsets relative to the segment), scanning it on a cache miss."""
+        digest = hashlib.sha256(segment.encode("utf-8")).hexdigest()
+        # Findings depend on the scanner and the rules, so a rule reload invalidates them
+        rules_version = config_loader.get_rule_set().version
+        key = f"{getattr(scan, '__qualname__', repr(scan))}:{rules_version}:{digest}"
+        with PiiPromptGuard._lock:
+            findings = PiiPromptGuard._cache.get(key)
+            if findings is not None:
+                PiiPromptGuard._cache.move_to_end(key)
+                PiiPromptGuard.hits += 1
+                return findings
+            PiiPromptGuard.misses += 1
+
+        findings = list(scan(segment).get_findings())
+        with PiiPromptGuard._lock:
+            PiiPromptGuard._cache[key] = findings
+            while len(PiiPromptGuard._cache) > PiiPromptGuard.MAX_CACHED_SEGMENTS:
+                PiiPromptGuard._cache.popitem(last=False)
+        return findings
+
+    @staticmethod
+    def scan_segments(segments: List[str], scan: Optional[Callable[[str], PiiReport]] = None) -> PiiReport:
+        """
+        Scans the prompt made of `segments` for PII.
+
+        Args:
+            segments: The prompt, split into segments (see split_template).
+            scan: The scanner to use; defaults to PresidioPiiScanner.scan.
+
+        Returns:
+            A PiiReport with offsets into "".join(segments).
+        """
+        scan = scan or PiiPromptGuard._default_scan
+        text = "".join(segments)
+        window = PiiPromptGuard.BOUNDARY_WINDOW
+
+        # Matches crossing a boundary; they replace the partial matches found inside each segment
+        crossing: List[PiiFinding] = []
+        boundary = 0
+        for segment in segments[:-1]:
+            boundary += len(segment)
+            window_start = max(0, boundary - window)
+            for finding in scan(text[window_start:boundary + window]).get_findings():
+                start, end = window_start + finding.start, window_start + finding.end
+                if start < boundary < end:
+                    crossing.append(PiiFinding(finding.pii_type, finding.value, start, end))
+
+        report = PiiReport(text)
+        offset = 0
+        for segment in segments:
+            for finding in PiiPromptGuard._segment_findings(segment, scan):
+                start, end = offset + finding.start, offset + finding.end
+                if any(c.pii_type == finding.pii_type and c.start < end and start < c.end for c in crossing):
+                    continue
+                report.add_match(finding.pii_type, start, end)
+            offset += len(segment)
+
+        for finding in crossing:
+            report.add_match(finding.pii_type, finding.start, finding.end)
+        return report
+
+    @staticmethod
+    def scan_template(
+        template: str, values: Dict[str, str], scan: Optional[Callable[[str], PiiReport]] = None
+    ) -> Tuple[str, PiiReport]:
+        """
+        Renders a template and scans the rendered prompt for PII, reusing cached segment scans.
+
+        Returns:
+            The rendered prompt and its PiiReport.
+        """
+        segments = PiiPromptGuard.split_template(template, values)
+        return "".join(segments), PiiPromptGuard.scan_segments(segments, scan)
+
+    @staticmethod
+    def clear():
+        """Forgets all cached segment scans (e.g. after the PII rules changed)."""
+        with PiiPromptGuard._lock:
+            PiiPromptGuard._cache.clear()
+
+    @staticmethod
+    def summary() -> str:
+        total = PiiPromptGuard.hits + PiiPromptGuard.misses
+        rate = (PiiPromptGuard.hits / total * 100) if total else 0.0
+        return f"PII segment cache: {PiiPromptGuard.hits} hits, {PiiPromptGuard.misses} misses ({rate:.0f}% hit rate)"
@@ -1,33 +1,48 @@
 # src/pii_report.py
-from typing import List
+from typing import List, Optional
 from .pii_finding import PiiFinding
+from .pii_finding_store import PiiFindingStore
 
 class PiiReport:
     """A report class to hold structured findings from the PiiScanner."""
 
-    def __init__(self):
-        self._findings: List[PiiFinding] = []
+    def __init__(self, text: Optional[str] = None):
+        # Findings are kept column-wise; values are sliced from `text` when it is given
+        self._store = PiiFindingStore(text)
 
     def add(self, finding: PiiFinding):
         """Adds a new PiiFinding object to the report."""
-        self._findings.append(finding)
+        self._store.add_finding(finding)
+
+    def add_match(self, pii_type: str, start: int, end: int):
+        """Adds a finding by its offsets into the scanned text, without creating a PiiFinding."""
+        self._store.add(pii_type, start, end)
 
     def has_findings(self) -> bool:
         """Returns True if there are any findings, False otherwise."""
-        return bool(self._findings)
+        return len(self._store) > 0
 
     def get_findings(self) -> List[PiiFinding]:
         """Returns the list of all PiiFinding objects."""
-        return self._findings
+        return self._store.to_findings()
+
+    @property
+    def store(self) -> PiiFindingStore:
+        """The compact finding store backing this report."""
+        return self._store
+
+    def filter_overlapping(self):
+        """Removes findings that overlap an earlier (or, at the same start, a longer) finding."""
+        self._store = self._store.filter_overlapping()
 
     def to_text(self) -> str:
         """Generates a formatted text summary of the report."""
         if not self.has_findings():
             return "No PII detected"
 
-        # The __str__ method of PiiFinding is used implicitly here
+        # The __str__ method of PiiFindingView is used implicitly here
         header = "PII DETECTED:\n"
-        findings_list = "\n".join(f"- {f}" for f in self._findings)
+        findings_list = "\n".join(f"- {f}" for f in self._store)
         return header + findings_list + "\n"
 
     def __str__(self):
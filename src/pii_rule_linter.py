@@ -0,0 +1,182 @@
+# src/pii_rule_linter.py
+import argparse
+import json
+import math
+import re
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from .config_loader import config_loader
+from .pii_scanner_benchmark import generate_text
+
+
+class PiiRuleLinter:
+    """
+    Checks the PII rules of config.yaml for super-linear (backtracking) behaviour.
+
+    Each rule's pattern is timed with `finditer` on adversarial inputs (long digit,
+    whitespace, word and URL-like runs) and realistic log text of growing size. The growth
+    exponent k of time ~ size^k is fitted per input; a rule is flagged if k exceeds
+    MAX_EXPONENT or if it doesn't finish within TIMEOUT_SECONDS. Each rule runs in its own
+    subprocess, since a runaway regex cannot be interrupted in-process.
+    """
+    SIZES = [2000, 4000, 8000, 16000, 32000]
+    MAX_EXPONENT = 1.5
+    TIMEOUT_SECONDS = 30
+    # Each measurement is repeated until it takes at least this long, for stable timings
+    MIN_MEASURE_SECONDS = 0.02
+
+    INPUTS: Dict[str, Callable[[int], str]] = {
+        "digits": lambda n: "1" * n,
+        "digits_spaces": lambda n: "1 " * (n // 2),
+        "digits_dashes": lambda n: "(1)-" * (n // 4),
+        "word": lambda n: "a" * n,
+        "dotted": lambda n: "a." * (n // 2),
+        "url_like": lambda n: "http://www.a" + "a-" * (n // 2),
+        "keyword": lambda n: "password " * (n // 9),
+        "realistic": lambda n: generate_text(n),
+    }
+
+    @staticmethod
+    def time_pattern(pattern: re.Pattern, text: str) -> float:
+        """Returns the time of one full `finditer` pass of `pattern` over `text`, in seconds."""
+        best = float("inf")
+        for _ in range(3):
+            runs = 0
+            started_at = time.perf_counter()
+            while True:
+                for _ in pattern.finditer(text):
+                    pass
+                runs += 1
+                elapsed = time.perf_counter() - started_at
+                if elapsed >= PiiRuleLinter.MIN_MEASURE_SECONDS:
+                    break
+            best = min(best, elapsed / runs)
+        return best
+
+    @staticmethod
+    def growth_exponent(sizes: List[int], seconds: List[float]) -> float:
+        """Least-squares slope of log(seconds) over log(size): ~1 for linear, ~2 for quadratic."""
+        xs = [math.log(size) for size in sizes]
+        ys = [math.log(max(s, 1e-9)) for s in seconds]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        denominator = sum((x - mean_x) ** 2 for x in xs)
+        if not denominator:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+    @staticmethod
+    def _measure_rule(rule_name: str, sizes: List[int]):
+        """Child process: times one rule on every input and size, printing one JSON line per measurement."""
+        rule = next(r for r in config_loader.get_rules() if r["name"] == rule_name)
+        pattern = rule.get("compiled_pattern") or re.compile(rule["pattern"])
+        for input_name, make_input in PiiRuleLinter.INPUTS.items():
+            for size in sizes:
+                text = make_input(size)
+                seconds = PiiRuleLinter.time_pattern(pattern, text)
+                print(json.dumps({"input": input_name, "size": len(text), "seconds": seconds}), flush=True)
+
+    @staticmethod
+    def lint_rule(rule_name: str, sizes: Optional[List[int]] = None, timeout: Optional[float] = None) -> dict:
+        """
+        Times a rule in a subprocess and fits the growth exponent per input.
+
+        Returns:
+            A dict with the rule name, per-input exponents, the worst measured input, the realistic
+            throughput (MB/s at the largest size), a 'timeout' flag, the input being measured
+            when the time ran out ('timed_out_input') and 'flagged'.
+        """
+        sizes = sizes or PiiRuleLinter.SIZES
+        timeout = timeout or PiiRuleLinter.TIMEOUT_SECONDS
+        command = [sys.executable, "-m", "src.pii_rule_linter", "--child", rule_name,
+                   "--sizes", *[str(size) for size in sizes]]
+        timed_out = False
+        try:
+            stdout = subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=True).stdout
+        except subprocess.TimeoutExpired as e:
+            timed_out = True
+            stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to time rule {rule_name}: {e.stderr.strip()}") from e
+
+        measurements: Dict[str, List[tuple]] = {}
+        for line in stdout.splitlines():
+            if line.startswith("{"):
+                measurement = json.loads(line)
+                measurements.setdefault(measurement["input"], []).append((measurement["size"], measurement["seconds"]))
+
+        exponents = {
+            input_name: PiiRuleLinter.growth_exponent([m[0] for m in points], [m[1] for m in points])
+            for input_name, points in measurements.items() if len(points) >= 2
+        }
+        realistic = measurements.get("realistic", [])
+        throughput = realistic[-1][0] / realistic[-1][1] / 1e6 if realistic else None
+        worst_input = max(exponents, key=exponents.get) if exponents else None
+        timed_out_input = None
+        if timed_out:
+            # Inputs are measured in INPUTS order, so the first incomplete one was running out of time
+            timed_out_input = next((name for name in PiiRuleLinter.INPUTS
+                                    if len(measurements.get(name, [])) < len(sizes)), None)
+        return {
+            "rule": rule_name,
+            "exponents": exponents,
+            "worst_input": worst_input,
+            "worst_exponent": exponents.get(worst_input) if worst_input else None,
+            "realistic_mb_per_second": throughput,
+            "timeout": timed_out,
+            "timed_out_input": timed_out_input,
+            "flagged": timed_out or any(k > PiiRuleLinter.MAX_EXPONENT for k in exponents.values()),
+        }
+
+    @staticmethod
+    def format_result(result: dict) -> str:
+        status = "FLAG" if result["flagged"] else "ok"
+        exponent = f"{result['worst_exponent']:.2f}" if result["worst_exponent"] is not None else "-"
+        throughput = result["realistic_mb_per_second"]
+        throughput_text = f"{throughput:.1f} MB/s" if throughput else "-"
+        line = (f"{result['rule']:<12} {status:<5} worst input: {result['worst_input'] or '-':<14} "
+                f"growth exponent: {exponent:<8} realistic: {throughput_text}")
+        if result["timeout"]:
+            line += f"  timed out on: {result['timed_out_input'] or '-'}"
+        return line
+
+
+def main():
+    """
+    Lints the PII rules of config.yaml for super-linear run time, e.g.:
+
+        python -m src.pii_rule_linter --max-exponent 1.5
+
+    Exits with status 1 if a rule is flagged, so it can gate changes to the rule set.
+    """
+    parser = argparse.ArgumentParser(description="Detect PII rules with super-linear (backtracking) run time.")
+    parser.add_argument("--rule", action="append", help="Only lint these rules (repeatable).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=PiiRuleLinter.SIZES, help="Input sizes in characters.")
+    parser.add_argument("--max-exponent", type=float, default=PiiRuleLinter.MAX_EXPONENT)
+    parser.add_argument("--timeout", type=float, default=PiiRuleLinter.TIMEOUT_SECONDS, help="Seconds per rule.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        PiiRuleLinter._measure_rule(args.child, args.sizes)
+        return
+
+    PiiRuleLinter.MAX_EXPONENT = args.max_exponent
+    rule_names = args.rule or config_loader.get_configured_entity_names()
+    flagged = []
+    for rule_name in rule_names:
+        result = PiiRuleLinter.lint_rule(rule_name, args.sizes, args.timeout)
+        print(PiiRuleLinter.format_result(result))
+        if result["flagged"]:
+            flagged.append(rule_name)
+
+    if flagged:
+        print(f"{len(flagged)} rule(s) flagged: {', '.join(flagged)}")
+        sys.exit(1)
+    print("All rules scale linearly.")
+
+
+if __name__ == "__main__":
+    main()
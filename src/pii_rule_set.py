@@ -0,0 +1,75 @@
+# src/pii_rule_set.py
+import hashlib
+import re
+from typing import Any, Dict, List, Optional
+
+
+
+class PiiRuleSet:
+    """
+    The compiled PII rules of one version of config.yaml.
+
+    A rule set is immutable once built: reloading the config builds a new one and swaps it
+    in, so a scan never sees half-updated rules. Components that derive state from the rules
+    (e.g. the Presidio analyzer) key it by `version`, which is a hash of the file content.
+    """
+    EMPTY_VERSION = "empty"
+
+    def __init__(self, config: Optional[Dict[str, Any]], version: str, path: str = "", mtime: float = 0.0):
+        config = config or {}
+        self.version = version
+        self.path = path
+        self.mtime = mtime
+        self.rules: List[Dict[str, Any]] = [dict(rule) for rule in config.get("pii_rules") or []]
+        self.presidio: Dict[str, Any] = dict(config.get("presidio") or {})
+
+        # Compile regex patterns for efficiency
+        for rule in self.rules:
+            rule["compiled_pattern"] = re.compile(rule["pattern"])
+            # Use mask_pattern if it exists, otherwise fall back to the main pattern
+            mask_pattern_str = rule.get("mask_pattern", rule["pattern"])
+            rule["compiled_mask_pattern"] = re.compile(mask_pattern_str)
+        self.rules_by_name: Dict[str, Dict[str, Any]] = {rule["name"]: rule for rule in self.rules}
+
+    @staticmethod
+    def empty() -> "PiiRuleSet":
+        return PiiRuleSet({}, PiiRuleSet.EMPTY_VERSION)
+
+    @staticmethod
+    def version_of(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()[:12]
+
+    @staticmethod
+    def from_bytes(content: bytes, path: str = "", mtime: float = 0.0) -> "PiiRuleSet":
+        """
+        Parses and compiles a config file's content.
+
+        Raises:
+            RuntimeError: If the YAML or a pattern is invalid.
+        """
+        # Imported here: only processes that actually load rules pay for the YAML parser
+        import yaml
+
+        try:
+            config = yaml.safe_load(content) or {}
+            return PiiRuleSet(config, PiiRuleSet.version_of(content), path, mtime)
+        except (yaml.YAMLError, re.error, KeyError, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Invalid PII config: {e}") from e
+
+    @property
+    def entity_names(self) -> List[str]:
+        """The entity names of the PII rules, in config order."""
+        return [rule["name"] for rule in self.rules]
+
+    @property
+    def nlp_entities(self) -> List[str]:
+        """The NLP-based Presidio entities to detect (empty for regex-only scanning)."""
+        return list(self.presidio.get("nlp_entities") or [])
+
+    @property
+    def spacy_model(self) -> str:
+        """The spaCy model Presidio loads when NLP entities are configured."""
+        return self.presidio.get("spacy_model") or "en_core_web_lg"
+
+    def __repr__(self) -> str:
+        return f"PiiRuleSet(version={self.version!r}, rules={self.entity_names})"
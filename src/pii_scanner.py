@@ -1,8 +1,8 @@
 # src/pii_scanner.py
-import re
-from typing import Pattern
+from typing import Iterable, Iterator, Pattern
 from .pii_report import PiiReport
 from .pii_finding import PiiFinding
+from .pii_stream_scanner import PiiStreamScanner
 from .config_loader import config_loader
 
 class PiiScanner:
@@ -11,14 +11,9 @@ class PiiScanner:
     @staticmethod
     def _find(text: str, pattern: Pattern, pii_type: str, report: PiiReport):
         """Helper method to find all matches for a given pattern and add them to the report."""
-        for match in re.finditer(pattern, text):
-            finding = PiiFinding(
-                pii_type=pii_type,
-                value=match.group(0),
-                start=match.start(),
-                end=match.end()
-            )
-            report.add(finding)
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            report.add_match(pii_type, start, end)
 
     @staticmethod
     def scan(text: str) -> PiiReport:
@@ -31,13 +26,24 @@ class PiiScanner:
         Returns:
             A PiiReport object containing the findings.
         """
-        rules = config_loader.get_rules()
-        report = PiiReport()
+        rule_set = config_loader.get_rule_set()
+        report = PiiReport(text)
 
-        for rule in rules:
-            pii_type = rule["name"]
-            # Compile the scan pattern on the fly
-            pattern = re.compile(rule["pattern"])
-            PiiScanner._find(text, pattern, pii_type, report)
+        for rule in rule_set.rules:
+            # Use the pattern precompiled by the shared rule set
+            PiiScanner._find(text, rule["compiled_pattern"], rule["name"], report)
 
         return report
+
+    @staticmethod
+    def scan_stream(chunks: Iterable[str], overlap: int = PiiStreamScanner.OVERLAP) -> Iterator[PiiFinding]:
+        """
+        Scans text arriving in chunks with constant memory, yielding findings with absolute
+        offsets as they are found (see PiiStreamScanner).
+        """
+        return PiiStreamScanner.scan_chunks(chunks, PiiScanner.scan, overlap)
+
+    @staticmethod
+    def scan_file(path: str, chunk_size: int = PiiStreamScanner.CHUNK_SIZE) -> Iterator[PiiFinding]:
+        """Scans a (possibly huge) text file chunk by chunk, yielding findings as they are found."""
+        return PiiStreamScanner.scan_file(path, PiiScanner.scan, chunk_size)
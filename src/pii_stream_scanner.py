@@ -0,0 +1,93 @@
+# src/pii_stream_scanner.py
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from .pii_finding import PiiFinding
+from .pii_report import PiiReport
+
+
+class PiiStreamScanner:
+    """
+    Scans text arriving in chunks (e.g. a multi-GB log file) for PII with constant memory.
+
+    Each chunk is scanned together with the tail of the previous one, so matches crossing a
+    chunk boundary are found as long as they are no longer than `overlap` characters.
+    Findings are yielded as soon as their window is scanned, with offsets into the whole stream.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    OVERLAP = 4096
+
+    @staticmethod
+    def scan_chunks(
+        chunks: Iterable[str],
+        scan: Callable[[str], PiiReport],
+        overlap: int = OVERLAP,
+    ) -> Iterator[PiiFinding]:
+        """
+        Scans a stream of text chunks.
+
+        Args:
+            chunks: The text, in chunks of any size.
+            scan: The scanner applied to each window, e.g. PiiScanner.scan or PresidioPiiScanner.scan.
+            overlap: The longest match guaranteed to be found across a chunk boundary.
+
+        Yields:
+            PiiFinding objects with absolute start/end offsets (in characters), ordered by
+            position within each window.
+        """
+        window = ""
+        window_start = 0 # Offset of window[0] in the stream
+        committed = 0 # Findings starting before this offset have been yielded
+        # End of the last finding yielded per PII type, to drop re-found matches in the overlap
+        emitted_end: Dict[str, int] = {}
+
+        def emit(text: str, commit_end: int) -> Iterator[PiiFinding]:
+            findings = sorted(scan(text).get_findings(), key=lambda f: (f.start, f.end))
+            for finding in findings:
+                start, end = window_start + finding.start, window_start + finding.end
+                if start < committed or start >= commit_end or start < emitted_end.get(finding.pii_type, 0):
+                    continue
+                emitted_end[finding.pii_type] = end
+                yield PiiFinding(finding.pii_type, finding.value, start, end)
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            window += chunk
+            if len(window) <= 2 * overlap:
+                continue
+            # Findings starting in the last `overlap` characters may be cut off by the window end;
+            # they are yielded from the next window instead
+            commit_end = window_start + len(window) - overlap
+            yield from emit(window, commit_end)
+            committed = commit_end
+            # Keep `overlap` characters before the commit point as left context for the next window
+            carry_from = len(window) - 2 * overlap
+            window, window_start = window[carry_from:], window_start + carry_from
+
+        if window:
+            yield from emit(window, window_start + len(window))
+
+    @staticmethod
+    def read_chunks(
+        path: str, chunk_size: int = CHUNK_SIZE, encoding: str = "utf-8", errors: str = "replace",
+        newline: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Reads a text file in chunks of `chunk_size` characters; undecodable bytes are replaced by default.
+        Line endings are translated to '\n' unless `newline` is given (as for open(); '' keeps them as they are).
+        """
+        try:
+            with open(path, "r", encoding=encoding, errors=errors, newline=newline) as f:
+                yield from iter(lambda: f.read(chunk_size), "")
+        except OSError as e:
+            raise RuntimeError(f"Cannot read file: {path}") from e
+
+    @staticmethod
+    def scan_file(
+        path: str,
+        scan: Callable[[str], PiiReport],
+        chunk_size: int = CHUNK_SIZE,
+        overlap: int = OVERLAP,
+    ) -> Iterator[PiiFinding]:
+        """Scans a text file chunk by chunk; see scan_chunks."""
+        return PiiStreamScanner.scan_chunks(PiiStreamScanner.read_chunks(path, chunk_size), scan, overlap)
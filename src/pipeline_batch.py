@@ -0,0 +1,279 @@
+# src/pipeline_batch.py
+import argparse
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .files_util import FilesUtil
+from .mistral_client import MistralClient
+from .page_source_getter import BrowserPool
+from .pipeline_main import PipelineMain
+from .tracing import Tracer
+
+
+@dataclass
+class BatchJob:
+    """One pipeline run of a batch: a target page, its checklist and the directory its artifacts go to."""
+    name: str
+    target_url: str
+    checklist_path: str
+    page_name: str
+    output_dir: str
+    status: str = "pending" # 'pending', 'running', 'succeeded', 'failed'
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    stage_counts: Dict[str, int] = field(default_factory=dict)
+    serial_seconds: float = 0.0
+    critical_path_seconds: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "target_url": self.target_url,
+            "checklist_path": self.checklist_path,
+            "page_name": self.page_name,
+            "output_dir": self.output_dir,
+            "status": self.status,
+            "seconds": round(self.seconds, 3),
+            "serial_seconds": round(self.serial_seconds, 3),
+            "critical_path_seconds": round(self.critical_path_seconds, 3),
+            "stages": dict(self.stage_counts),
+            "error": self.error,
+        }
+
+
+class PipelineBatch:
+    """
+    Runs many pipeline jobs (target URL, checklist, page name) concurrently in one process.
+
+    Each job writes its generated/, tests/ and pages/ directories and its run manifest to its
+    own directory (BATCH_DIR/<job name> by default), so jobs never read each other's artifacts
+    and a rerun of the batch skips the stages of each job that are still up to date.
+    The expensive resources are shared: one global budget of LLM requests in flight
+    (MistralClient.set_max_concurrency), one pool of running browsers for Stage 1 and
+    one Presidio analyzer, built once before the first job starts.
+
+    Manifest (JSON or YAML), a list of jobs or {"jobs": [...]}:
+        [{"target_url": "https://www.saucedemo.com/", "checklist": "checklist_login.txt",
+          "page_name": "login", "name": "saucedemo-login"}, ...]
+    Only "target_url" is required; "name" defaults to '<number>-<page_name>'.
+    """
+    BATCH_DIR = "generated/batch"
+    REPORT_FILE_NAME = "batch_report.json"
+    # Jobs running at once; each runs up to PipelineMain.MAX_CONCURRENT_STAGES stages
+    MAX_CONCURRENT_JOBS = 2
+
+    def __init__(
+        self,
+        jobs: List[BatchJob],
+        max_jobs: int = MAX_CONCURRENT_JOBS,
+        llm_concurrency: Optional[int] = None,
+        browsers: int = 1,
+        force: bool = False,
+        batch_dir: str = BATCH_DIR,
+    ):
+        self.jobs = jobs
+        self.max_jobs = max(1, max_jobs)
+        if Tracer.ENABLED and self.max_jobs > 1:
+            raise RuntimeError("Tracing (PIPELINE_TRACE) records one process-wide trace per run; trace a batch with --jobs 1")
+        self.llm_concurrency = llm_concurrency
+        self.force = force
+        self.batch_dir = batch_dir
+        self.browser_pool = BrowserPool(browsers)
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _job_name(name: str) -> str:
+        """Makes a job name safe to use as a directory name."""
+        return re.sub(r"[^a-zA-Z0-9_.-]+", "_", name).strip("._") or "job"
+
+    @staticmethod
+    def load_jobs(manifest_path: str, batch_dir: str = BATCH_DIR) -> List[BatchJob]:
+        """
+        Reads a batch manifest.
+
+        Args:
+            manifest_path: JSON (or .yaml/.yml) file listing the jobs.
+            batch_dir: Directory the jobs' output directories are created in.
+
+        Returns:
+            The jobs, in manifest order.
+        """
+        content = FilesUtil.read(manifest_path)
+        try:
+            if Path(manifest_path).suffix.lower() in (".yaml", ".yml"):
+                import yaml
+
+                data = yaml.safe_load(content)
+            else:
+                data = json.loads(content)
+        except Exception as e:
+            raise RuntimeError(f"Cannot parse batch manifest '{manifest_path}': {e}") from e
+        entries = data.get("jobs") if isinstance(data, dict) else data
+        if not isinstance(entries, list) or not entries:
+            raise RuntimeError(f"Batch manifest '{manifest_path}' lists no jobs")
+
+        jobs, names = [], set()
+        for number, entry in enumerate(entries, start=1):
+            if not isinstance(entry, dict) or not entry.get("target_url"):
+                raise RuntimeError(f"Job {number} in '{manifest_path}' has no target_url")
+            page_name = entry.get("page_name") or PipelineMain.PAGE_NAME
+            checklist_path = entry.get("checklist") or entry.get("checklist_path") or PipelineMain.CHECKLIST_PATH
+            if not Path(checklist_path).is_file():
+                raise RuntimeError(f"Checklist of job {number} not found: {checklist_path}")
+            name = PipelineBatch._job_name(str(entry.get("name") or f"{number:02d}-{page_name}"))
+            if name in names:
+                raise RuntimeError(f"Duplicate job name in '{manifest_path}': {name}")
+            names.add(name)
+            jobs.append(BatchJob(
+                name=name,
+                target_url=entry["target_url"],
+                checklist_path=checklist_path,
+                page_name=page_name,
+                output_dir=str(Path(batch_dir) / name),
+            ))
+        return jobs
+
+    def _run_job(self, job: BatchJob):
+        job.status, job.started_at = "running", time.time()
+        print(f"\n[batch] {job.name}: started ({job.target_url} -> '{job.output_dir}')")
+        try:
+            scheduler = PipelineMain.run(
+                target_url=job.target_url,
+                checklist_path=job.checklist_path,
+                page_name=job.page_name,
+                force=self.force,
+                browser_pool=self.browser_pool,
+                keep_client_open=True,
+                output_dir=job.output_dir,
+            )
+            results = scheduler.results.values()
+            for result in results:
+                job.stage_counts[result.status] = job.stage_counts.get(result.status, 0) + 1
+            job.serial_seconds = sum(result.seconds for result in results)
+            job.critical_path_seconds = sum(scheduler.results[name].seconds for name in scheduler.critical_path())
+            job.status = "succeeded" if scheduler.succeeded else "failed"
+            if not scheduler.succeeded:
+                job.error = next((r.error for r in results if r.status == "failed"), None)
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            print(f"Error in {job.name}: {e}")
+        job.finished_at = time.time()
+        with self._lock:
+            done = sum(j.status in ("succeeded", "failed") for j in self.jobs)
+        print(f"[batch] {job.name}: {job.status} in {job.seconds:.1f}s ({done}/{len(self.jobs)} jobs done)")
+
+    def run(self, warm_up: bool = True) -> dict:
+        """
+        Runs every job, at most `max_jobs` at a time, and returns the batch report
+        (also written to <batch_dir>/REPORT_FILE_NAME).
+        """
+        if self.llm_concurrency is not None:
+            MistralClient.set_max_concurrency(self.llm_concurrency)
+        print(
+            f"=== AI QA PIPELINE BATCH: {len(self.jobs)} job(s), {self.max_jobs} at a time, "
+            f"{MistralClient.MAX_CONCURRENT_REQUESTS} LLM request(s) in flight ==="
+        )
+        llm_requests_before = MistralClient.RATE_LIMITER.metrics()["acquired"]
+        try:
+            if warm_up:
+                PipelineMain.warm_up(self.browser_pool)
+            self.started_at = time.time()
+            with ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="batch-job") as executor:
+                list(executor.map(self._run_job, self.jobs))
+            self.finished_at = time.time()
+        finally:
+            self.browser_pool.close()
+            MistralClient.close()
+
+        report = self.report(MistralClient.RATE_LIMITER.metrics()["acquired"] - llm_requests_before)
+        report_path = str(Path(self.batch_dir) / PipelineBatch.REPORT_FILE_NAME)
+        FilesUtil.write(report_path, json.dumps(report, indent=2))
+        print(f"\n{self.summary(report)}")
+        print(f"-> Batch report saved to '{report_path}'")
+        return report
+
+    def report(self, llm_requests: int = 0) -> dict:
+        """Per-job results and the batch's aggregate throughput."""
+        wall_seconds = self.finished_at - self.started_at
+        job_seconds = sum(job.seconds for job in self.jobs)
+        minutes = wall_seconds / 60 if wall_seconds > 0 else 0.0
+        return {
+            "jobs": [job.to_dict() for job in self.jobs],
+            "total": {
+                "jobs": len(self.jobs),
+                "succeeded": sum(job.status == "succeeded" for job in self.jobs),
+                "failed": sum(job.status == "failed" for job in self.jobs),
+                "wall_seconds": round(wall_seconds, 3),
+                "sum_of_job_seconds": round(job_seconds, 3),
+                # How many jobs' worth of work overlapped on average
+                "speedup": round(job_seconds / wall_seconds, 2) if wall_seconds > 0 else 1.0,
+                "jobs_per_minute": round(len(self.jobs) / minutes, 2) if minutes else 0.0,
+                "llm_requests": llm_requests,
+                "llm_requests_per_minute": round(llm_requests / minutes, 1) if minutes else 0.0,
+                "max_concurrent_jobs": self.max_jobs,
+                "max_concurrent_llm_requests": MistralClient.MAX_CONCURRENT_REQUESTS,
+            },
+        }
+
+    @staticmethod
+    def summary(report: dict) -> str:
+        """A table of the jobs' results followed by the aggregate throughput."""
+        lines = [f"{'job':<28} {'status':<10} {'seconds':>8} {'critical':>9} {'stages ok/cached/failed':>24}"]
+        for job in report["jobs"]:
+            stages = job["stages"]
+            counts = f"{stages.get('ok', 0)}/{stages.get('cached', 0)}/{stages.get('failed', 0)}"
+            lines.append(
+                f"{job['name'][:28]:<28} {job['status']:<10} {job['seconds']:>7.1f}s "
+                f"{job['critical_path_seconds']:>8.1f}s {counts:>24}"
+            )
+        total = report["total"]
+        lines.append(
+            f"Total: {total['succeeded']}/{total['jobs']} job(s) succeeded in {total['wall_seconds']:.1f}s wall "
+            f"({total['sum_of_job_seconds']:.1f}s of job time, speedup x{total['speedup']:.2f}), "
+            f"{total['jobs_per_minute']:.2f} job(s)/min, {total['llm_requests']} LLM request(s) "
+            f"({total['llm_requests_per_minute']:.1f}/min)."
+        )
+        return "\n".join(lines)
+
+
+def main():
+    """
+    Runs a batch of pipeline jobs, e.g.:
+
+        python -m src.pipeline_batch batch.json --jobs 3 --llm-concurrency 6 --browsers 2
+    """
+    parser = argparse.ArgumentParser(description="Run many pipeline jobs concurrently with shared resources.")
+    parser.add_argument("manifest", help="JSON or YAML file listing the jobs (target_url, checklist, page_name, name).")
+    parser.add_argument("--jobs", type=int, default=PipelineBatch.MAX_CONCURRENT_JOBS, help="Jobs run at the same time.")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="LLM requests in flight across all jobs (default MISTRAL_MAX_CONCURRENCY or 4).")
+    parser.add_argument("--browsers", type=int, default=1, help="Browsers shared by the jobs for Stage 1.")
+    parser.add_argument("--batch-dir", default=PipelineBatch.BATCH_DIR, help="Directory the jobs' outputs go to.")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if it is up to date.")
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip building the analyzer and starting a browser.")
+    args = parser.parse_args()
+
+    jobs = PipelineBatch.load_jobs(args.manifest, args.batch_dir)
+    batch = PipelineBatch(jobs, args.jobs, args.llm_concurrency, args.browsers, args.force, args.batch_dir)
+    report = batch.run(warm_up=not args.no_warm_up)
+    if report["total"]["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
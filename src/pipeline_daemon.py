@@ -0,0 +1,361 @@
+# src/pipeline_daemon.py
+import argparse
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .files_util import FilesUtil
+from .mistral_client import MistralClient
+from .page_source_getter import BrowserPool
+from .pipeline_main import PipelineMain
+from .stage_scheduler import StageResult
+from .tracing import Tracer
+
+
+@dataclass
+class PipelineJob:
+    """A pipeline run requested over the daemon's API, with its progress events."""
+    id: str
+    target_url: str
+    checklist_path: str
+    page_name: str
+    output_dir: str
+    from_stage: Optional[str] = None
+    force: bool = False
+    status: str = "queued" # 'queued', 'running', 'succeeded', 'failed'
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    events: List[dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "target_url": self.target_url,
+            "checklist_path": self.checklist_path,
+            "page_name": self.page_name,
+            "output_dir": self.output_dir,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "events": list(self.events),
+        }
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+
+class PipelineDaemon:
+    """
+    A long-running pipeline service on localhost. It pays the startup costs once (imports,
+    the Presidio analyzer, chromedriver resolution, running browsers, pooled HTTP connections),
+    then runs pipeline jobs from a bounded queue on a fixed number of worker threads.
+
+    API (JSON):
+        POST /jobs                  {"target_url", "checklist" (text) or "checklist_path", "page_name",
+                                     "from_stage", "force", "workspace"} -> 202 {"id"}, or 429 if the queue is full
+        GET  /jobs                  all known jobs
+        GET  /jobs/<id>             a job's status and progress events
+        GET  /jobs/<id>/events      the job's progress events as JSON Lines, streamed until it finishes
+        GET  /health                queue length, running jobs and uptime
+
+    Each job writes its generated/, tests/ and pages/ directories and its run manifest to its
+    own workspace, JOBS_DIR/<workspace>, so concurrent jobs never touch each other's artifacts.
+    The workspace defaults to the job id; naming an earlier job's workspace reuses its
+    up-to-date stages (or resumes it with "from_stage"). Unfinished jobs never share a workspace.
+    With PIPELINE_TRACE=1 each job writes its own trace, which needs a single worker.
+    """
+    MAX_QUEUED_JOBS = 16
+    # Finished jobs kept for status queries; older ones are forgotten
+    MAX_FINISHED_JOBS = 200
+    JOBS_DIR = "generated/jobs"
+    WORKSPACE_NAME = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+    EVENT_POLL_SECONDS = 15.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = 1, browsers: int = 1,
+                 max_queued_jobs: int = MAX_QUEUED_JOBS):
+        self.workers = max(1, workers)
+        if Tracer.ENABLED and self.workers > 1:
+            raise RuntimeError("Tracing (PIPELINE_TRACE) records one process-wide trace per run; trace jobs with one worker")
+        self.browser_pool = BrowserPool(browsers)
+        self._queue: "queue.Queue[Optional[PipelineJob]]" = queue.Queue(maxsize=max_queued_jobs)
+        self._jobs: Dict[str, PipelineJob] = {}
+        self._ids = itertools.count(1)
+        self._changed = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._started_at = time.time()
+        self._server = ThreadingHTTPServer((host, port), PipelineDaemon._make_handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def warm_up(self):
+        """Pays the one-off startup costs before the first job arrives."""
+        PipelineMain.warm_up(self.browser_pool)
+
+    def submit(self, request: dict) -> PipelineJob:
+        """
+        Queues a job.
+
+        Raises:
+            ValueError: If the request is invalid.
+            queue.Full: If MAX_QUEUED_JOBS jobs are already waiting.
+        """
+        job_id = f"job-{next(self._ids)}"
+        workspace = str(request.get("workspace") or job_id)
+        if not PipelineDaemon.WORKSPACE_NAME.match(workspace):
+            raise ValueError(f"Invalid workspace name: {workspace}")
+        output_dir = str(Path(PipelineDaemon.JOBS_DIR) / workspace)
+        from_stage = request.get("from_stage")
+        with self._changed:
+            if any(job.output_dir == output_dir and not job.done for job in self._jobs.values()):
+                raise ValueError(f"Workspace '{workspace}' is in use by an unfinished job")
+            checklist_path = request.get("checklist_path") or PipelineMain.CHECKLIST_PATH
+            if request.get("checklist"):
+                checklist_path = str(Path(output_dir) / "checklist.txt")
+            elif not Path(checklist_path).is_file():
+                raise ValueError(f"Checklist not found: {checklist_path}")
+            job = PipelineJob(
+                id=job_id,
+                target_url=request.get("target_url") or PipelineMain.TARGET_URL,
+                checklist_path=checklist_path,
+                page_name=request.get("page_name") or PipelineMain.PAGE_NAME,
+                output_dir=output_dir,
+                from_stage=str(from_stage) if from_stage is not None else None,
+                force=bool(request.get("force", False)),
+            )
+            self._queue.put_nowait(job)
+            self._jobs[job.id] = job
+            # Written only once the queue has accepted the job, so a rejected job leaves no file behind;
+            # a worker cannot start the job before this, since it does so under self._changed
+            if request.get("checklist"):
+                try:
+                    FilesUtil.write(checklist_path, str(request["checklist"]))
+                except RuntimeError as e:
+                    job.status, job.error, job.finished_at = "failed", str(e), time.time()
+                    self._add_event(job, {"event": "job_finished", "status": job.status, "error": job.error})
+            self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - PipelineDaemon.MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[PipelineJob]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def _add_event(self, job: PipelineJob, event: dict):
+        with self._changed:
+            job.events.append({"time": time.time(), **event})
+            self._changed.notify_all()
+
+    def _run_job(self, job: PipelineJob):
+        def on_event(event: str, result: StageResult):
+            self._add_event(job, {
+                "event": event,
+                "stage": result.name,
+                "status": result.status,
+                "seconds": round(result.seconds, 3),
+                "error": result.error,
+            })
+
+        with self._changed:
+            if job.done:
+                # Failed while being submitted
+                return
+            job.status, job.started_at = "running", time.time()
+        self._add_event(job, {"event": "job_started"})
+        try:
+            scheduler = PipelineMain.run(
+                target_url=job.target_url,
+                checklist_path=job.checklist_path,
+                page_name=job.page_name,
+                from_stage=job.from_stage,
+                force=job.force,
+                on_event=on_event,
+                browser_pool=self.browser_pool,
+                keep_client_open=True,
+                output_dir=job.output_dir,
+            )
+            job.status = "succeeded" if scheduler.succeeded else "failed"
+            if not scheduler.succeeded:
+                job.error = next((r.error for r in scheduler.results.values() if r.status == "failed"), None)
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            print(f"Error in {job.id}: {e}")
+        job.finished_at = time.time()
+        self._add_event(job, {"event": "job_finished", "status": job.status, "error": job.error})
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run_job(job)
+
+    def start(self) -> "PipelineDaemon":
+        """Starts the workers and serves the API in background threads."""
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"pipeline-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        server_thread = threading.Thread(target=self._server.serve_forever, name="pipeline-api", daemon=True)
+        server_thread.start()
+        self._threads.append(server_thread)
+        return self
+
+    def stop(self):
+        """Stops accepting requests, lets running jobs finish and releases the browsers and connections."""
+        self._server.shutdown()
+        self._server.server_close()
+        for _ in range(self.workers):
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self.browser_pool.close()
+        MistralClient.close()
+
+    def health(self) -> dict:
+        with self._changed:
+            running = sum(job.status == "running" for job in self._jobs.values())
+        return {
+            "status": "ok",
+            "queued": self._queue.qsize(),
+            "running": running,
+            "workers": self.workers,
+            "uptime_seconds": round(time.time() - self._started_at, 1),
+        }
+
+    def stream_events(self, job: PipelineJob, write):
+        """Writes the job's events as JSON Lines as they happen, until the job finishes."""
+        sent = 0
+        while True:
+            with self._changed:
+                while sent == len(job.events) and not job.done:
+                    self._changed.wait(PipelineDaemon.EVENT_POLL_SECONDS)
+                events, done = job.events[sent:], job.done
+            for event in events:
+                write(json.dumps(event) + "\n")
+            sent += len(events)
+            if done and sent == len(job.events):
+                return
+
+    @staticmethod
+    def _make_handler(daemon: "PipelineDaemon"):
+        class PipelineDaemonRequestHandler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_events(self, job: PipelineJob):
+                # HTTP/1.0 without Content-Length: the stream ends when the connection closes
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+
+                def write(line: str):
+                    self.wfile.write(line.encode("utf-8"))
+                    self.wfile.flush()
+
+                try:
+                    daemon.stream_events(job, write)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def do_GET(self):
+                parts = [part for part in self.path.split("?")[0].split("/") if part]
+                if parts == ["health"]:
+                    self._send_json(200, daemon.health())
+                elif parts == ["jobs"]:
+                    with daemon._changed:
+                        jobs = [job.to_dict() for job in daemon._jobs.values()]
+                    self._send_json(200, jobs)
+                elif len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["events"]):
+                    job = daemon.get(parts[1])
+                    if job is None:
+                        self._send_json(404, {"message": f"Unknown job: {parts[1]}"})
+                    elif parts[2:] == ["events"]:
+                        self._send_events(job)
+                    else:
+                        with daemon._changed:
+                            payload = job.to_dict()
+                        self._send_json(200, payload)
+                else:
+                    self._send_json(404, {"message": f"Unknown endpoint: {self.path}"})
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/jobs":
+                    self._send_json(404, {"message": f"Unknown endpoint: {self.path}"})
+                    return
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    if not isinstance(request, dict):
+                        raise ValueError("Request body must be a JSON object")
+                    job = daemon.submit(request)
+                except ValueError as e:
+                    self._send_json(400, {"message": str(e)})
+                    return
+                except queue.Full:
+                    self._send_json(429, {"message": "Job queue is full, retry later"})
+                    return
+                self._send_json(202, {"id": job.id, "status": job.status, "events": f"/jobs/{job.id}/events"})
+
+            def log_message(self, format, *args):
+                pass
+
+        return PipelineDaemonRequestHandler
+
+
+def main():
+    """
+    Runs the pipeline daemon, e.g.:
+
+        python -m src.pipeline_daemon --port 8765 --workers 1
+        curl -X POST localhost:8765/jobs -d '{"target_url": "https://www.saucedemo.com/", "checklist_path": "checklist_login.txt"}'
+        curl -N localhost:8765/jobs/job-1/events
+    """
+    parser = argparse.ArgumentParser(description="Run pipeline jobs from a warm, long-running process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Jobs run at the same time.")
+    parser.add_argument("--browsers", type=int, default=1, help="Browsers kept running for Stage 1.")
+    parser.add_argument("--max-queued-jobs", type=int, default=PipelineDaemon.MAX_QUEUED_JOBS)
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip building the analyzer and starting a browser.")
+    args = parser.parse_args()
+
+    daemon = PipelineDaemon(args.host, args.port, args.workers, args.browsers, args.max_queued_jobs)
+    if not args.no_warm_up:
+        daemon.warm_up()
+    daemon.start()
+    print(f"Pipeline daemon listening on {daemon.url} ({daemon.workers} worker(s)). Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nStopping pipeline daemon...")
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
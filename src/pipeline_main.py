@@ -1,29 +1,44 @@
+import argparse
 import json
 import os # New import
+import threading
+import time
 from pathlib import Path # New import
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from .prompt_engine import PromptEngine
 from .files_util import FilesUtil
 from .mistral_client import MistralClient
-from .presidio_pii_scanner import PresidioPiiScanner
+from .llm_response_cache import LlmResponseCache
 from .pii_masker import PiiMasker
+from .pii_prompt_guard import PiiPromptGuard
 from .pii_finding import PiiFinding
-from .test_case_models import TestSuite, BugReport, BugDetectionReport, TestRunAnalysisOutput # Updated import
-from .test_case_parser import extract_json_from_response, parse_test_suite, extract_assistant_content # Updated import
-from .autotest_generator import AutotestGenerator
-from .page_source_getter import PageSourceGetter
-from .page_object_generator import PageObjectGenerator
-from .bug_report_generator import BugReportGenerator
-from .bug_detector import BugDetector # New import
+from .page_source_getter import BrowserPool, PageSourceGetter
 from .test_runner import TestRunner # New import
-from .test_run_analyzer import TestRunAnalyzer # New import
+from .stage_scheduler import Stage, StageResult, StageScheduler
+from .run_manifest import RunManifest
+from .config_loader import ConfigLoader, config_loader
+from .tracing import Tracer
 
 
 class PipelineMain:
     # Define the target URL for page object generation
     TARGET_URL = "https://www.saucedemo.com/" 
+    CHECKLIST_PATH = "checklist_login.txt"
+    TEST_CASES_PROMPT_PATH = "prompts/02_test_cases_from_checklist.txt"
+    PAGE_NAME = "login" # Or derive from TARGET_URL
     # This will be updated by Stage 2 with the path to the generated page object
     GENERATED_PAGE_OBJECT_PATH = "" 
+    # Stages running at once; LLM calls are further limited by MistralClient.MAX_CONCURRENT_REQUESTS
+    MAX_CONCURRENT_STAGES = 3
+    RUN_MANIFEST_PATH = RunManifest.PATH
+    # Stream the test-case completion and stop as soon as its top-level JSON object is complete
+    STREAM_TEST_CASES = True
+
+    # Tracer records one process-wide trace, so a traced run never overlaps another run
+    _runs_lock = threading.Lock()
+    _runs_in_progress = 0
+    _traced_run_in_progress = False
 
     @staticmethod
     def filter_overlapping_findings(findings: List[PiiFinding]) -> List[PiiFinding]:
@@ -31,223 +46,509 @@ class PipelineMain:
         Filters a list of PiiFinding objects to remove findings that overlap.
         If two findings overlap, the longer one is kept.
         """
-        if not findings:
-            return []
-
-        # Sort by start index ascending, and by length descending to prioritize longer matches
-        sorted_findings = sorted(findings, key=lambda f: (f.start, -(f.end - f.start)))
-        
-        filtered_list = []
-        last_finding_end = -1
-
-        for finding in sorted_findings:
-            # Only add the finding if it does not overlap with the last one added.
-            if finding.start >= last_finding_end:
-                filtered_list.append(finding)
-                last_finding_end = finding.end
-        
-        return filtered_list
+        return PiiMasker.resolve_overlaps(findings)
 
     # extract_assistant_content is now moved to test_case_parser.py
 
     @staticmethod
-    def run():
-        """
-        The main entry point for the AI QA Pipeline.
-        """
-        print("=== AI QA PIPELINE STARTED ===")
+    def _generated_path(ctx: dict, file_name: str) -> str:
+        """Path of an artifact in the run's generated/ directory (under ctx['output_dir'], the project root by default)."""
+        return str(Path(ctx.get("output_dir", ".")) / "generated" / file_name)
 
-        # STAGE 1. GET PAGE SOURCE
-        print("\nStage 1: Getting page source for URL...")
-        page_html_path = "generated/page_source.html"
+    # Each stage function takes the shared context (see `stages()`) and returns the values it produces
+    @staticmethod
+    def stage_get_page_source(ctx: dict) -> dict:
+        page_html_path = PipelineMain._generated_path(ctx, "page_source.html")
         try:
-            page_html = PageSourceGetter.get_source(PipelineMain.TARGET_URL)
+            page_html = PageSourceGetter.get_source(ctx["target_url"], pool=ctx.get("browser_pool"))
             FilesUtil.write(page_html_path, page_html)
-            print(f"-> Page source saved to '{page_html_path}' for {PipelineMain.TARGET_URL}")
         except Exception as e:
-            print(f"Error in Stage 1: Failed to get page source: {e}")
-            return # Exit pipeline on failure
+            raise RuntimeError(f"Failed to get page source: {e}") from e
+        print(f"-> Page source saved to '{page_html_path}' for {ctx['target_url']}")
+        return {"page_html_path": page_html_path}
+
+    @staticmethod
+    def stage_generate_page_object(ctx: dict) -> dict:
+        from .page_object_generator import PageObjectGenerator
 
-        # --- NEW STAGE 2: GENERATE PAGE OBJECT ---
-        print("\nStage 2: Generating Page Object...")
-        page_object_name = "login" # Or derive from TARGET_URL
         try:
-            generated_po_path = PageObjectGenerator.generate_page_object(page_html_path, page_object_name)
-            PipelineMain.GENERATED_PAGE_OBJECT_PATH = generated_po_path
-            print(f"-> Page Object generated and saved to '{generated_po_path}'")
+            generated_po_path = PageObjectGenerator.generate_page_object(
+                ctx["page_html_path"], ctx["page_name"], ctx["target_url"], output_dir=ctx.get("output_dir", ".")
+            )
         except Exception as e:
-            print(f"Error in Stage 2: Failed to generate Page Object: {e}")
-            return # Exit pipeline on failure
+            raise RuntimeError(f"Failed to generate Page Object: {e}") from e
+        PipelineMain.GENERATED_PAGE_OBJECT_PATH = generated_po_path
+        print(f"-> Page Object generated and saved to '{generated_po_path}'")
+        return {"page_object_path": generated_po_path}
 
-
-        # --- STAGE 3 (was 1). BUILD PROMPT FROM CHECKLIST ---
-        print("\nStage 3: Building prompt from checklist...")
-        generated_page_object_code = FilesUtil.read(PipelineMain.GENERATED_PAGE_OBJECT_PATH)
-        prompt = PromptEngine.build_prompt(
-            "prompts/02_test_cases_from_checklist.txt",
-            "checklist_login.txt",
+    @staticmethod
+    def stage_build_prompt(ctx: dict) -> dict:
+        generated_page_object_code = FilesUtil.read(ctx["page_object_path"])
+        prompt_segments = PromptEngine.build_prompt_segments(
+            PipelineMain.TEST_CASES_PROMPT_PATH,
+            ctx["checklist_path"],
             generated_page_object_code
         )
-        FilesUtil.write("generated/final_prompt_test_cases.txt", prompt)
-        print("-> Prompt for test cases successfully generated and saved to 'generated/final_prompt_test_cases.txt'")
+        prompt = "".join(prompt_segments)
+        prompt_path = PipelineMain._generated_path(ctx, "final_prompt_test_cases.txt")
+        FilesUtil.write(prompt_path, prompt)
+        print(f"-> Prompt for test cases successfully generated and saved to '{prompt_path}'")
+        return {"prompt": prompt, "prompt_segments": prompt_segments}
 
-        # --- STAGE 4 (was 2). PII CHECK ---
-        print("\nStage 4: Scanning prompt for PII...")
-        pii_report = PresidioPiiScanner.scan(prompt)
-        
-        if pii_report.has_findings():
-            original_findings = pii_report.get_findings()
-            filtered_findings = PipelineMain.filter_overlapping_findings(original_findings)
-            
-            pii_report._findings = filtered_findings
+    @staticmethod
+    def stage_check_pii(ctx: dict) -> dict:
+        from .presidio_pii_scanner import PresidioPiiScanner
+
+        prompt = ctx["prompt"]
+        # Template text and page-object code scanned by earlier runs or prompts come from the segment cache
+        pii_report = PiiPromptGuard.scan_segments(ctx["prompt_segments"], PresidioPiiScanner.scan)
+        print(f"-> {PiiPromptGuard.summary()}")
+
+        pii_report.filter_overlapping()
 
         prompt_to_send = prompt
         if pii_report.has_findings():
             pii_report_content = pii_report.to_text()
             print("PII Detected (after filtering overlaps):")
             print(pii_report_content)
-            FilesUtil.write("generated/pii_report.txt", pii_report_content)
-            print("-> PII report saved to 'generated/pii_report.txt'")
-            
+            pii_report_path = PipelineMain._generated_path(ctx, "pii_report.txt")
+            FilesUtil.write(pii_report_path, pii_report_content)
+            print(f"-> PII report saved to '{pii_report_path}'")
+
             prompt_to_send = PiiMasker.mask(prompt, pii_report.get_findings())
-            FilesUtil.write("generated/masked_prompt.txt", prompt_to_send)
-            print("-> PII found and masked. Masked prompt saved to 'generated/masked_prompt.txt'")
+            masked_prompt_path = PipelineMain._generated_path(ctx, "masked_prompt.txt")
+            FilesUtil.write(masked_prompt_path, prompt_to_send)
+            print(f"-> PII found and masked. Masked prompt saved to '{masked_prompt_path}'")
         else:
             print("-> No PII found in the prompt.")
+        return {"prompt_to_send": prompt_to_send}
 
-        # --- STAGE 5 (was 3). CALL MISTRAL API (for Test Cases) ---
-        print("\nStage 5: Calling Mistral API to generate Test Cases...")
-        raw_response = MistralClient.call(prompt_to_send)
-        FilesUtil.write("generated/raw_response_test_cases.json", raw_response)
-        print("-> Raw response for test cases saved to 'generated/raw_response_test_cases.json'")
+    @staticmethod
+    def stage_call_llm_for_test_cases(ctx: dict) -> dict:
+        if PipelineMain.STREAM_TEST_CASES:
+            from .test_case_parser import IncrementalJsonExtractor
+
+            test_suite_json = MistralClient.call_streaming(ctx["prompt_to_send"], IncrementalJsonExtractor())
+            # Same shape as a non-streamed response, so the next stages handle both alike
+            raw_response = json.dumps(
+                {"choices": [{"message": {"role": "assistant", "content": test_suite_json}}]}, ensure_ascii=False
+            )
+        else:
+            raw_response = MistralClient.call(ctx["prompt_to_send"])
+        raw_response_path = PipelineMain._generated_path(ctx, "raw_response_test_cases.json")
+        FilesUtil.write(raw_response_path, raw_response)
+        print(f"-> Raw response for test cases saved to '{raw_response_path}'")
+        return {"raw_response_test_cases": raw_response}
+
+    @staticmethod
+    def stage_extract_llm_content(ctx: dict) -> dict:
+        from .test_case_parser import extract_assistant_content
 
-        # --- STAGE 6 (was 4). EXTRACT LLM RESPONSE CONTENT (for Test Cases) ---
-        print("\nStage 6: Extracting content from LLM response (Test Cases)...")
-        llm_response_content_test_cases = extract_assistant_content(raw_response)
-        FilesUtil.write("generated/llm_response_content_test_cases.txt", llm_response_content_test_cases)
-        print("-> Extracted LLM response content for test cases saved to 'generated/llm_response_content_test_cases.txt'")
+        llm_response_content_test_cases = extract_assistant_content(ctx["raw_response_test_cases"])
+        content_path = PipelineMain._generated_path(ctx, "llm_response_content_test_cases.txt")
+        FilesUtil.write(content_path, llm_response_content_test_cases)
+        print(f"-> Extracted LLM response content for test cases saved to '{content_path}'")
+        return {"llm_response_content_test_cases": llm_response_content_test_cases}
 
-        # --- STAGE 7 (was 5). PARSE AND SAVE TEST CASES ---
-        print("\nStage 7: Parsing and saving test cases...")
+    @staticmethod
+    def stage_parse_test_cases(ctx: dict) -> dict:
+        from .test_case_parser import extract_json_from_response, parse_test_suite
+
+        test_suite_path = PipelineMain._generated_path(ctx, "test_suite.json")
         try:
-            cleaned_json_string = extract_json_from_response(llm_response_content_test_cases)
+            cleaned_json_string = extract_json_from_response(ctx["llm_response_content_test_cases"])
             test_suite = parse_test_suite(cleaned_json_string)
-            FilesUtil.write("generated/test_suite.json", test_suite.model_dump_json(indent=2))
-            print("-> Structured test suite saved to 'generated/test_suite.json'")
+            FilesUtil.write(test_suite_path, test_suite.model_dump_json(indent=2))
         except Exception as e:
-            print(f"Error in Stage 7: Failed to parse test cases: {e}")
-            print("This usually means the LLM did not return a valid JSON format.")
-            return
+            raise RuntimeError(
+                f"Failed to parse test cases: {e}\n"
+                "This usually means the LLM did not return a valid JSON format."
+            ) from e
+        print(f"-> Structured test suite saved to '{test_suite_path}'")
+        return {"test_suite_path": test_suite_path}
+
+    @staticmethod
+    def stage_generate_autotests(ctx: dict) -> dict:
+        from .autotest_generator import AutotestGenerator
 
-        # --- STAGE 8 (was 6). GENERATE AUTOTESTS ---
-        print("\nStage 8: Generating autotests and performing consolidated code review...")
-        generated_page_object_code_for_autotests = FilesUtil.read(PipelineMain.GENERATED_PAGE_OBJECT_PATH)
+        output_dir = ctx.get("output_dir", ".")
+        generated_page_object_code_for_autotests = FilesUtil.read(ctx["page_object_path"])
         AutotestGenerator.generate_for_test_suite(
-            "generated/test_suite.json",
-            generated_page_object_code_for_autotests
+            ctx["test_suite_path"],
+            generated_page_object_code_for_autotests,
+            output_dir=output_dir
         )
+        autotest_dir = Path(output_dir) / AutotestGenerator.OUTPUT_DIR
+        # Tests generated outside the project root need the `driver` fixture next to them
+        TestRunner.ensure_conftest(autotest_dir)
         print("-> Autotest generation process initiated.")
+        return {
+            "autotest_dir": str(autotest_dir),
+            "code_reviews_path": PipelineMain._generated_path(ctx, "all_code_reviews.txt"),
+        }
 
-
-        # --- NEW STAGE 9: RUN AUTOTESTS & COLLECT RESULTS ---
-        print("\nStage 9: Running autotests and collecting results...")
-        pytest_output_path, allure_results_path, allure_report_path = TestRunner.run_tests_and_collect_results()
+    @staticmethod
+    def stage_run_autotests(ctx: dict) -> dict:
+        output_dir = ctx.get("output_dir", ".")
+        pytest_output_path, allure_results_path, allure_report_path = TestRunner.run_tests_and_collect_results(
+            os.path.relpath(ctx["autotest_dir"], output_dir), output_dir=output_dir
+        )
         print("-> Autotests run, results collected.")
+        return {
+            "pytest_output_path": pytest_output_path,
+            "allure_results_path": allure_results_path,
+            "allure_report_path": allure_report_path,
+        }
 
-        # --- NEW STAGE 10: GENERATE ALLURE REPORT ---
-        print("\nStage 10: Generating Allure report...")
+    @staticmethod
+    def stage_generate_allure_report(ctx: dict) -> dict:
         try:
-            TestRunner.generate_allure_report(allure_results_path, allure_report_path)
-            print("-> Allure report generated.")
+            TestRunner.generate_allure_report(ctx["allure_results_path"], ctx["allure_report_path"])
         except Exception as e:
-            print(f"Error in Stage 10: Failed to generate Allure report: {e}")
-            # Decide if pipeline should continue without Allure report
-            # For now, it will continue, but the report might be missing.
+            # Not critical: the pipeline continues, but the report might be missing
+            raise RuntimeError(f"Failed to generate Allure report: {e}") from e
+        print("-> Allure report generated.")
+        return {}
 
+    @staticmethod
+    def stage_analyze_test_run(ctx: dict) -> dict:
+        from .test_run_analyzer import TestRunAnalyzer
 
-        # --- STAGE 11 (was 9). AI ANALYZE TEST RUN RESULTS ---
-        print("\nStage 11: AI Analyzing test run results...")
         try:
-            test_run_analysis_output_path = TestRunAnalyzer.analyze_test_run(pytest_output_path)
-            # Store the analysis output for subsequent stages
-            # If you need to access the content later:
-            # test_run_analysis_content = FilesUtil.read(test_run_analysis_output_path)
-            print("-> AI test run analysis completed.")
+            test_run_analysis_output_path = TestRunAnalyzer.analyze_test_run(
+                ctx["pytest_output_path"], output_dir=ctx.get("output_dir", ".")
+            )
         except Exception as e:
-            print(f"Error in Stage 11: Failed to analyze test run results: {e}")
-            return # Exit pipeline on failure
+            raise RuntimeError(f"Failed to analyze test run results: {e}") from e
+        print("-> AI test run analysis completed.")
+        return {"test_run_analysis_path": test_run_analysis_output_path}
 
+    @staticmethod
+    def stage_detect_bugs(ctx: dict) -> dict:
+        from .bug_detector import BugDetector
 
-        # --- STAGE 12 (was 10). DETECT POTENTIAL BUGS FROM ARTIFACTS ---
-        print("\nStage 12: Detecting potential bugs from generated artifacts (design-time analysis)...")
         try:
             # Gather all necessary artifacts
-            original_checklist_content = FilesUtil.read("checklist_login.txt")
-            generated_test_cases_json_content = FilesUtil.read("generated/test_suite.json")
-            ai_code_review_content = FilesUtil.read("generated/all_code_reviews.txt")
-            
+            original_checklist_content = FilesUtil.read(ctx["checklist_path"])
+            generated_test_cases_json_content = FilesUtil.read(ctx["test_suite_path"])
+            ai_code_review_content = FilesUtil.read(ctx["code_reviews_path"])
+
             # Read all generated autotest files
-            autotest_dir = AutotestGenerator.OUTPUT_DIR
+            autotest_dir = ctx["autotest_dir"]
             all_autotest_code = ""
             # Ensure 'tests' directory exists before listing
-            Path(autotest_dir).mkdir(parents=True, exist_ok=True) 
-            for filename in os.listdir(autotest_dir):
+            Path(autotest_dir).mkdir(parents=True, exist_ok=True)
+            for filename in sorted(os.listdir(autotest_dir)):
                 if filename.endswith(".py"):
                     file_path = Path(autotest_dir) / filename
                     all_autotest_code += f"\n--- FILE: {filename} ---\n\n"
                     all_autotest_code += FilesUtil.read(str(file_path))
-            
-            BugDetector.detect_bugs_from_artifacts(
+
+            bug_detection_path = BugDetector.detect_bugs_from_artifacts(
                 original_checklist=original_checklist_content,
                 generated_test_cases_json=generated_test_cases_json_content,
                 generated_autotests_code=all_autotest_code,
-                ai_code_review=ai_code_review_content
+                ai_code_review=ai_code_review_content,
+                output_dir=ctx.get("output_dir", ".")
             )
-            print("-> Bug detection from artifacts completed.")
         except Exception as e:
-            print(f"Error in Stage 12: Failed to detect bugs from artifacts: {e}")
-            return # Exit pipeline on failure
+            raise RuntimeError(f"Failed to detect bugs from artifacts: {e}") from e
+        print("-> Bug detection from artifacts completed.")
+        return {"bug_detection_path": bug_detection_path}
 
+    @staticmethod
+    def stage_generate_bug_reports(ctx: dict) -> dict:
+        from .bug_report_generator import BugReportGenerator
+        from .test_case_models import TestRunAnalysisOutput
 
-        # --- STAGE 13 (was 12). GENERATE BUG REPORT (from real analysis) ---
-        print("\nStage 13: Generating bug report (from real test run analysis)...")
         try:
-            # Read the analysis output from Stage 11
-            test_run_analysis_content = FilesUtil.read(str(test_run_analysis_output_path))
-            
             # This content contains 'qa_summary' and 'detected_bugs'
-            # We need to extract the bug reports from it if any
+            test_run_analysis_content = FilesUtil.read(str(ctx["test_run_analysis_path"]))
             test_run_analysis_output = TestRunAnalysisOutput.model_validate_json(test_run_analysis_content)
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to generate bug reports from analysis: {e}\n"
+                "This usually means the LLM did not return a valid JSON format in Stage 11."
+            ) from e
+
+        detected_bugs = test_run_analysis_output.detected_bugs
+        if not detected_bugs:
+            print("-> No bugs detected in test run, skipping bug report generation.")
+            return {"bug_report_paths": []}
+
+        # One LLM call per bug; the calls run concurrently, bounded by MistralClient's global limit.
+        # BugReportGenerator expects failure_facts as a string, so each bug is passed as its JSON
+        with ThreadPoolExecutor(max_workers=min(len(detected_bugs), MistralClient.MAX_CONCURRENT_REQUESTS)) as executor:
+            futures = [
+                executor.submit(
+                    BugReportGenerator.generate_bug_report,
+                    bug_report_data.model_dump_json(indent=2), f"_{idx+1}", ctx.get("output_dir", ".")
+                )
+                for idx, bug_report_data in enumerate(detected_bugs)
+            ]
+        bug_report_paths, errors = [], []
+        for future in futures:
+            try:
+                bug_report_paths.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+        if errors:
+            raise RuntimeError(f"Failed to generate {len(errors)} of {len(detected_bugs)} bug report(s): {errors[0]}")
+        print(f"-> {len(bug_report_paths)} bug report(s) generated from test run analysis.")
+        return {"bug_report_paths": bug_report_paths}
 
-            if test_run_analysis_output.detected_bugs:
-                for idx, bug_report_data in enumerate(test_run_analysis_output.detected_bugs):
-                    # Convert Pydantic BugDetectionReport to string for BugReportGenerator
-                    # BugReportGenerator expects failure_facts as a string, not structured data directly
-                    # Re-prompting for each bug to fit the BugReportGenerator's prompt
-                    # This is slightly redundant but keeps BugReportGenerator simple
-                    bug_report_json_string = bug_report_data.model_dump_json(indent=2)
-                    
-                    # Call BugReportGenerator (which uses the old prompt for formatting)
-                    # The prompt expects "failure_facts" so we pass the JSON representing the bug
-                    BugReportGenerator.generate_bug_report(bug_report_json_string, suffix=f"_{idx+1}")
-                print(f"-> {len(test_run_analysis_output.detected_bugs)} bug report(s) generated from test run analysis.")
-            else:
-                print("-> No bugs detected in test run, skipping bug report generation.")
+    @staticmethod
+    def stages() -> List[Stage]:
+        """
+        The pipeline stages with the context values each one consumes and produces.
+        Stages 1-8 form a chain; after that, Allure report generation and the test-run
+        analysis (both need the test run) and the design-time bug detection (needs only
+        the generated artifacts) are independent of each other.
 
-        except Exception as e:
-            print(f"Error in Stage 13: Failed to generate bug reports from analysis: {e}")
-            print("This usually means the LLM did not return a valid JSON format in Stage 11.")
-            return # Exit pipeline on failure
+        Stages 1 and 9 are volatile: they depend on the live site, so they always run
+        (unless resumed past), while the other stages are skipped when their inputs are unchanged.
+        """
+        # Stage modules (and their pydantic/presidio dependencies) are imported when the
+        # pipeline runs rather than with this module, so `--help` and single stages start fast
+        from .autotest_generator import AutotestGenerator
+        from .bug_detector import BugDetector
+        from .bug_report_generator import BugReportGenerator
+        from .page_object_generator import PageObjectGenerator
+        from .test_run_analyzer import TestRunAnalyzer
+
+        return [
+            Stage("get_page_source", PipelineMain.stage_get_page_source,
+                  inputs=("target_url",), outputs=("page_html_path",), volatile=True,
+                  title="Stage 1: Getting page source for URL..."),
+            Stage("generate_page_object", PipelineMain.stage_generate_page_object,
+                  inputs=("page_html_path", "page_name", "target_url"), outputs=("page_object_path",),
+                  files=(PageObjectGenerator.GENERATION_PROMPT_PATH, PageObjectGenerator.ENRICHMENT_PROMPT_PATH),
+                  title="Stage 2: Generating Page Object..."),
+            Stage("build_prompt", PipelineMain.stage_build_prompt,
+                  inputs=("page_object_path", "checklist_path"), outputs=("prompt", "prompt_segments"),
+                  files=(PipelineMain.TEST_CASES_PROMPT_PATH,),
+                  title="Stage 3: Building prompt from checklist..."),
+            Stage("check_pii", PipelineMain.stage_check_pii,
+                  inputs=("prompt", "prompt_segments"), outputs=("prompt_to_send",),
+                  files=(ConfigLoader.CONFIG_PATH,),
+                  title="Stage 4: Scanning prompt for PII..."),
+            Stage("call_llm_for_test_cases", PipelineMain.stage_call_llm_for_test_cases,
+                  inputs=("prompt_to_send",), outputs=("raw_response_test_cases",),
+                  title="Stage 5: Calling Mistral API to generate Test Cases..."),
+            Stage("extract_llm_content", PipelineMain.stage_extract_llm_content,
+                  inputs=("raw_response_test_cases",), outputs=("llm_response_content_test_cases",),
+                  title="Stage 6: Extracting content from LLM response (Test Cases)..."),
+            Stage("parse_test_cases", PipelineMain.stage_parse_test_cases,
+                  inputs=("llm_response_content_test_cases",), outputs=("test_suite_path",),
+                  title="Stage 7: Parsing and saving test cases..."),
+            Stage("generate_autotests", PipelineMain.stage_generate_autotests,
+                  inputs=("test_suite_path", "page_object_path"), outputs=("autotest_dir", "code_reviews_path"),
+                  files=(AutotestGenerator.GENERATION_PROMPT_PATH, AutotestGenerator.CODE_REVIEW_PROMPT_PATH),
+                  title="Stage 8: Generating autotests and performing consolidated code review..."),
+            Stage("run_autotests", PipelineMain.stage_run_autotests,
+                  inputs=("autotest_dir",), outputs=("pytest_output_path", "allure_results_path", "allure_report_path"),
+                  volatile=True,
+                  title="Stage 9: Running autotests and collecting results..."),
+            Stage("generate_allure_report", PipelineMain.stage_generate_allure_report,
+                  inputs=("allure_results_path", "allure_report_path"), critical=False,
+                  title="Stage 10: Generating Allure report..."),
+            Stage("analyze_test_run", PipelineMain.stage_analyze_test_run,
+                  inputs=("pytest_output_path",), outputs=("test_run_analysis_path",),
+                  files=(TestRunAnalyzer.ANALYSIS_PROMPT_PATH,),
+                  title="Stage 11: AI Analyzing test run results..."),
+            Stage("detect_bugs", PipelineMain.stage_detect_bugs,
+                  inputs=("test_suite_path", "code_reviews_path", "autotest_dir", "checklist_path"),
+                  outputs=("bug_detection_path",), files=(BugDetector.BUG_DETECTION_PROMPT_PATH,),
+                  title="Stage 12: Detecting potential bugs from generated artifacts (design-time analysis)..."),
+            Stage("generate_bug_reports", PipelineMain.stage_generate_bug_reports,
+                  inputs=("test_run_analysis_path",), outputs=("bug_report_paths",),
+                  files=(BugReportGenerator.BUG_REPORT_PROMPT_PATH,),
+                  title="Stage 13: Generating bug report (from real test run analysis)..."),
+        ]
+
+    @staticmethod
+    def _stage_name(stages: List[Stage], stage: str) -> str:
+        """Resolves a stage given by number (as in the logs, 1-based) or by name."""
+        if stage.isdigit() and 1 <= int(stage) <= len(stages):
+            return stages[int(stage) - 1].name
+        if any(s.name == stage for s in stages):
+            return stage
+        raise RuntimeError(f"Unknown stage: {stage} (expected 1-{len(stages)} or one of {', '.join(s.name for s in stages)})")
+
+    @staticmethod
+    def plan(from_stage: Optional[str] = None, only_stage: Optional[str] = None, force: bool = False) -> Tuple[List[Stage], Dict[str, str]]:
+        """
+        Selects the stages of a run and the scheduler policy of each.
+
+        Args:
+            from_stage: Rerun this stage and every later one; earlier stages they need are restored from the run manifest.
+            only_stage: Run just this stage, with its inputs restored from the run manifest.
+            force: Run the selected stages even if they are up to date.
 
+        Returns:
+            The stages to schedule and their policies ('auto', 'force' or 'restore').
+        """
+        stages = PipelineMain.stages()
+        graph = StageScheduler(stages)
+        names = [stage.name for stage in stages]
+        if only_stage is not None:
+            selected = [PipelineMain._stage_name(stages, only_stage)]
+        elif from_stage is not None:
+            selected = names[names.index(PipelineMain._stage_name(stages, from_stage)):]
+        else:
+            return stages, {name: "force" if force else "auto" for name in names}
 
-        print("\n=== AI QA PIPELINE FINISHED ===")
+        restored = [name for name in graph.ancestors(selected) if name not in selected]
+        policies = {name: "restore" for name in restored}
+        policies.update({name: "force" for name in selected})
+        return [stage for stage in stages if stage.name in policies], policies
+
+    @staticmethod
+    def warm_up(browser_pool: Optional[BrowserPool] = None):
+        """
+        Pays the one-off startup costs shared by every run in this process: the Presidio
+        analyzer, the pooled LLM connections, chromedriver resolution and a running browser.
+        """
+        from .presidio_pii_scanner import PresidioPiiScanner
+
+        started_at = time.perf_counter()
+        PresidioPiiScanner._get_analyzer(config_loader.get_rule_set())
+        MistralClient.get_session()
+        if browser_pool is not None:
+            try:
+                PageSourceGetter.get_driver_path()
+                with browser_pool.driver():
+                    pass
+            except Exception as e:
+                # Runs will retry starting a browser; the stages after Stage 1 do not need one
+                print(f"Warning: Could not start a browser during warm-up: {e}")
+        print(f"-> Warmed up in {time.perf_counter() - started_at:.1f}s.")
+
+    @staticmethod
+    def run(
+        target_url: Optional[str] = None,
+        checklist_path: Optional[str] = None,
+        page_name: Optional[str] = None,
+        from_stage: Optional[str] = None,
+        only_stage: Optional[str] = None,
+        force: bool = False,
+        trace: bool = False,
+        on_event: Optional[Callable[[str, StageResult], None]] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        keep_client_open: bool = False,
+        output_dir: str = ".",
+    ) -> StageScheduler:
+        """
+        The main entry point for the AI QA Pipeline.
+        Stages run as soon as their inputs are ready; independent stages run concurrently.
+        Stages whose inputs are unchanged since their last run (see RunManifest) are skipped.
+
+        Args:
+            target_url: The page to test (default TARGET_URL).
+            checklist_path: The checklist to generate test cases from (default CHECKLIST_PATH).
+            page_name: The name of the page, used for the Page Object (default PAGE_NAME).
+            from_stage: Resume the pipeline at this stage (number or name), rerunning it and every later stage.
+            only_stage: Rerun only this stage (number or name).
+            force: Rerun every selected stage even if it is up to date.
+            trace: Record stage and LLM call spans to Tracer.TRACE_PATH (also enabled by PIPELINE_TRACE=1).
+                   The trace holds only this run's spans, so a traced run cannot overlap another run.
+            on_event: Called with each stage event ('started', 'finished', ...) and the stage's StageResult.
+            browser_pool: Running browsers to fetch the page with, instead of starting a new one.
+            keep_client_open: Keep MistralClient's HTTP connections open after the run (for long-running callers).
+            output_dir: Directory the run's generated/, tests/ and pages/ directories and its run manifest
+                        live in (the project root by default); concurrent runs each need their own.
+
+        Returns:
+            The scheduler of the run, with the result of every stage.
+
+        Raises:
+            RuntimeError: If the run is traced and another run is in progress, or the other way round.
+        """
+        tracing_was_enabled = Tracer.ENABLED
+        tracing = trace or tracing_was_enabled
+        with PipelineMain._runs_lock:
+            if PipelineMain._traced_run_in_progress or (tracing and PipelineMain._runs_in_progress):
+                raise RuntimeError(
+                    "A traced pipeline run cannot overlap another run (the trace is process-wide); "
+                    "run one job at a time or turn tracing off"
+                )
+            PipelineMain._runs_in_progress += 1
+            PipelineMain._traced_run_in_progress = tracing
+        if tracing:
+            # Start from an empty trace, so it holds only this run's spans
+            Tracer.enable()
+        try:
+            print("=== AI QA PIPELINE STARTED ===")
+
+            stages, policies = PipelineMain.plan(from_stage, only_stage, force)
+            scheduler = StageScheduler(
+                stages,
+                max_workers=PipelineMain.MAX_CONCURRENT_STAGES,
+                on_event=on_event,
+                manifest=RunManifest(str(Path(output_dir) / PipelineMain.RUN_MANIFEST_PATH)),
+                policies=policies,
+            )
+            ctx = {
+                "target_url": target_url or PipelineMain.TARGET_URL,
+                "checklist_path": checklist_path or PipelineMain.CHECKLIST_PATH,
+                "page_name": page_name or PipelineMain.PAGE_NAME,
+                "browser_pool": browser_pool,
+                "output_dir": output_dir,
+            }
+            try:
+                scheduler.run(ctx)
+            finally:
+                if not keep_client_open:
+                    MistralClient.close()
+
+            print(f"\n{scheduler.summary()}")
+            print(f"\n{LlmResponseCache.summary()}")
+            print(MistralClient.RATE_LIMITER.summary())
+            if tracing:
+                print(f"\n{Tracer.summary()}")
+                trace_path = Tracer.write(str(Path(output_dir) / Tracer.TRACE_PATH))
+                print(f"-> Trace saved to '{trace_path}' (open it in chrome://tracing or https://ui.perfetto.dev)")
+            if not scheduler.succeeded:
+                print("\n=== AI QA PIPELINE FINISHED WITH ERRORS ===")
+            else:
+                print("\n=== AI QA PIPELINE FINISHED ===")
+            return scheduler
+        finally:
+            if not tracing_was_enabled:
+                Tracer.disable()
+            with PipelineMain._runs_lock:
+                PipelineMain._runs_in_progress -= 1
+                PipelineMain._traced_run_in_progress = False
 
 
 def main():
     """
-    Script entry point, runs the main pipeline logic.
+    Script entry point, runs the main pipeline logic, e.g.:
+
+        python -m src.pipeline_main                   # skips stages whose inputs are unchanged
+        python -m src.pipeline_main --from-stage 12   # reruns Stages 12 and 13 only
+        python -m src.pipeline_main --only-stage detect_bugs
+        python -m src.pipeline_main --list-stages
     """
-    PipelineMain.run()
+    parser = argparse.ArgumentParser(description="Run the AI QA pipeline.")
+    parser.add_argument("--target-url", default=PipelineMain.TARGET_URL, help="The page to test.")
+    parser.add_argument("--checklist", default=PipelineMain.CHECKLIST_PATH, help="The checklist to generate test cases from.")
+    parser.add_argument("--page-name", default=PipelineMain.PAGE_NAME, help="The page's name, used for the Page Object.")
+    stage_choice = parser.add_mutually_exclusive_group()
+    stage_choice.add_argument("--from-stage", help="Rerun this stage (number or name) and every later one.")
+    stage_choice.add_argument("--only-stage", help="Rerun only this stage (number or name).")
+    parser.add_argument("--force", action="store_true", help="Run stages even if they are up to date.")
+    parser.add_argument("--trace", action="store_true", help="Write a Chrome trace of stages and LLM calls.")
+    parser.add_argument("--list-stages", action="store_true", help="Print the stages and their inputs, then exit.")
+    args = parser.parse_args()
+    if args.list_stages:
+        for number, stage in enumerate(PipelineMain.stages(), start=1):
+            inputs = ", ".join(stage.inputs) or "-"
+            print(f"{number:>2}  {stage.name:<26} needs: {inputs}")
+        return
+    PipelineMain.run(
+        target_url=args.target_url, checklist_path=args.checklist, page_name=args.page_name,
+        from_stage=args.from_stage, only_stage=args.only_stage, force=args.force, trace=args.trace)
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -1,43 +1,132 @@
 # src/presidio_pii_scanner.py
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngine
 from presidio_analyzer.pattern import Pattern
 from presidio_analyzer.pattern_recognizer import PatternRecognizer
 from presidio_analyzer.recognizer_registry import RecognizerRegistry # New import
 from .pii_report import PiiReport
 from .pii_finding import PiiFinding
+from .pii_stream_scanner import PiiStreamScanner
 from .config_loader import config_loader
+from .pii_rule_set import PiiRuleSet
+
+
+class RegexOnlyNlpEngine(NlpEngine):
+    """
+    A stand-in NLP engine that loads no model and returns empty NLP artifacts.
+    Pattern recognizers don't need NLP artifacts, so this is all a regex-only analyzer needs.
+    """
+
+    def __init__(self, languages: Optional[List[str]] = None):
+        self.languages = languages or ["en"]
+
+    def load(self) -> None:
+        pass
+
+    def is_loaded(self) -> bool:
+        return True
+
+    def process_text(self, text: str, language: str) -> NlpArtifacts:
+        return NlpArtifacts(entities=[], tokens=[], tokens_indices=[], lemmas=[], nlp_engine=self, language=language)
+
+    def process_batch(
+        self, texts: Iterable[str], language: str, batch_size: int = 1, n_process: int = 1, **kwargs
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        for text in texts:
+            yield text, self.process_text(text, language)
+
+    def is_stopword(self, word: str, language: str) -> bool:
+        return False
+
+    def is_punct(self, word: str, language: str) -> bool:
+        return False
+
+    def get_supported_entities(self) -> List[str]:
+        return []
+
+    def get_supported_languages(self) -> List[str]:
+        return self.languages
+
 
 class PresidioPiiScanner:
     """
-    A PII scanner that uses the Presidio NLP library for detection,
-    configured with custom regex rules from config.yaml only.
+    A PII scanner that uses the Presidio library for detection, configured with the
+    custom regex rules from config.yaml.
+
+    The spaCy model is only loaded if NLP-based entities are enabled (`presidio.nlp_entities`
+    in config.yaml); otherwise Presidio runs regex-only with a RegexOnlyNlpEngine.
     """
     _analyzer = None
+    # Version of the rule set the analyzer was built from
+    _analyzer_version: Optional[str] = None
+    # Loaded spaCy NLP engines by model name, kept across rule reloads
+    _nlp_engines: Dict[str, NlpEngine] = {}
+    _lock = threading.Lock()
 
     @staticmethod
-    def _get_analyzer() -> AnalyzerEngine:
-        """Initializes and returns a singleton instance of the AnalyzerEngine,
-        registering custom regex recognizers from config.yaml."""
-        if PresidioPiiScanner._analyzer is None:
-            custom_registry = RecognizerRegistry() # Create a new, empty registry
-
-            # Register custom regex recognizers from config.yaml
-            rules = config_loader.get_rules()
-            for rule in rules:
-                if "pattern" in rule and rule["pattern"]:
-                    pattern = Pattern(name=f"pattern_for_{rule['name']}", regex=rule["pattern"], score=1.0)
-                    
-                    custom_recognizer = PatternRecognizer(
-                        supported_entity=rule["name"],
-                        name=f"recognizer_for_{rule['name']}",
-                        patterns=[pattern]
-                    )
-                    custom_registry.add_recognizer(custom_recognizer)
-            
-            # Initialize AnalyzerEngine with our custom registry, effectively disabling built-in NLP recognizers
-            PresidioPiiScanner._analyzer = AnalyzerEngine(registry=custom_registry)
+    def _get_analyzer(rule_set: Optional[PiiRuleSet] = None) -> AnalyzerEngine:
+        """
+        Returns the AnalyzerEngine for the current rule set, creating it on first use and
+        again whenever config.yaml changed.
+        """
+        rule_set = rule_set or config_loader.get_rule_set()
+        if PresidioPiiScanner._analyzer is None or PresidioPiiScanner._analyzer_version != rule_set.version:
+            with PresidioPiiScanner._lock:
+                if PresidioPiiScanner._analyzer is None or PresidioPiiScanner._analyzer_version != rule_set.version:
+                    analyzer = PresidioPiiScanner.create_analyzer(rule_set.nlp_entities, rule_set)
+                    PresidioPiiScanner._analyzer = analyzer
+                    PresidioPiiScanner._analyzer_version = rule_set.version
         return PresidioPiiScanner._analyzer
 
+    @staticmethod
+    def create_analyzer(nlp_entities: List[str], rule_set: Optional[PiiRuleSet] = None) -> AnalyzerEngine:
+        """
+        Creates an AnalyzerEngine with the custom regex recognizers from config.yaml.
+
+        Args:
+            nlp_entities: NLP-based entities to detect as well (e.g. ["PERSON"]). If empty,
+                no NLP model is loaded.
+            rule_set: The rules to register; defaults to the current rule set.
+
+        Returns:
+            The AnalyzerEngine.
+        """
+        rule_set = rule_set or config_loader.get_rule_set()
+        custom_registry = RecognizerRegistry() # Create a new, empty registry
+
+        # Register custom regex recognizers from config.yaml
+        for rule in rule_set.rules:
+            if "pattern" in rule and rule["pattern"]:
+                pattern = Pattern(name=f"pattern_for_{rule['name']}", regex=rule["pattern"], score=1.0)
+
+                custom_recognizer = PatternRecognizer(
+                    supported_entity=rule["name"],
+                    name=f"recognizer_for_{rule['name']}",
+                    patterns=[pattern]
+                )
+                custom_registry.add_recognizer(custom_recognizer)
+
+        if not nlp_entities:
+            # Regex-only: skip loading the spaCy model (hundreds of MB) entirely
+            return AnalyzerEngine(registry=custom_registry, nlp_engine=RegexOnlyNlpEngine())
+
+        from presidio_analyzer.nlp_engine import NlpEngineProvider
+        from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+
+        model_name = rule_set.spacy_model
+        nlp_engine = PresidioPiiScanner._nlp_engines.get(model_name)
+        if nlp_engine is None:
+            print(f"Loading spaCy model '{model_name}' for Presidio NLP entities: {', '.join(nlp_entities)}")
+            nlp_engine = NlpEngineProvider(nlp_configuration={
+                "nlp_engine_name": "spacy",
+                "models": [{"lang_code": "en", "model_name": model_name}],
+            }).create_engine()
+            PresidioPiiScanner._nlp_engines[model_name] = nlp_engine
+        custom_registry.add_recognizer(SpacyRecognizer(supported_entities=list(nlp_entities)))
+        return AnalyzerEngine(registry=custom_registry, nlp_engine=nlp_engine)
+
     @staticmethod
     def scan(text: str) -> PiiReport:
         """
@@ -50,23 +139,19 @@ class PresidioPiiScanner:
         Returns:
             A PiiReport object containing the findings.
         """
-        analyzer = PresidioPiiScanner._get_analyzer()
-        report = PiiReport()
+        # One rule set for the whole scan, even if config.yaml is reloaded meanwhile
+        rule_set = config_loader.get_rule_set()
+        analyzer = PresidioPiiScanner._get_analyzer(rule_set)
+        report = PiiReport(text)
 
         try:
             # Presidio's analyze method will now use only the recognizers in our custom registry.
             # We still pass entities from config to ensure a clear list of what to look for.
-            analyzer_results = analyzer.analyze(text=text, language="en", 
-                                                entities=config_loader.get_configured_entity_names())
+            entities = rule_set.entity_names + rule_set.nlp_entities
+            analyzer_results = analyzer.analyze(text=text, language="en", entities=entities)
 
             for result in analyzer_results:
-                finding = PiiFinding(
-                    pii_type=result.entity_type,
-                    value=text[result.start:result.end],
-                    start=result.start,
-                    end=result.end
-                )
-                report.add(finding)
+                report.add_match(result.entity_type, result.start, result.end)
                 
         except Exception as e:
             # This can happen if the required spaCy model is not downloaded.
@@ -75,3 +160,16 @@ class PresidioPiiScanner:
             print("python -m spacy download en_core_web_lg")
 
         return report
+
+    @staticmethod
+    def scan_stream(chunks: Iterable[str], overlap: int = PiiStreamScanner.OVERLAP) -> Iterator[PiiFinding]:
+        """
+        Scans text arriving in chunks with constant memory, yielding findings with absolute
+        offsets as they are found (see PiiStreamScanner).
+        """
+        return PiiStreamScanner.scan_chunks(chunks, PresidioPiiScanner.scan, overlap)
+
+    @staticmethod
+    def scan_file(path: str, chunk_size: int = PiiStreamScanner.CHUNK_SIZE) -> Iterator[PiiFinding]:
+        """Scans a (possibly huge) text file chunk by chunk, yielding findings as they are found."""
+        return PiiStreamScanner.scan_file(path, PresidioPiiScanner.scan, chunk_size)
@@ -0,0 +1,79 @@
+# src/presidio_startup_benchmark.py
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+SAMPLE_TEXT = "Login as standard_user@example.com with password: secret_sauce, call +1 (555) 123-4567."
+
+
+def measure(mode: str, nlp_entities: list) -> dict:
+    """Measures the Presidio startup in the current process: imports, analyzer creation and the first scan."""
+    started_at = time.perf_counter()
+    from .presidio_pii_scanner import PresidioPiiScanner
+    from .config_loader import config_loader
+    imported_at = time.perf_counter()
+
+    result = {"mode": mode, "import_seconds": imported_at - started_at}
+    try:
+        analyzer = PresidioPiiScanner.create_analyzer(nlp_entities)
+        created_at = time.perf_counter()
+        PresidioPiiScanner._analyzer = analyzer
+        PresidioPiiScanner._analyzer_version = config_loader.get_rule_set().version
+        findings = PresidioPiiScanner.scan(SAMPLE_TEXT).get_findings()
+        scanned_at = time.perf_counter()
+        result.update(
+            analyzer_seconds=created_at - imported_at,
+            first_scan_seconds=scanned_at - created_at,
+            total_seconds=scanned_at - started_at,
+            findings=len(findings),
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["max_rss_mb"] = max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return result
+
+
+def run_in_subprocess(mode: str, nlp_entities: list) -> dict:
+    """Runs `measure` in a fresh interpreter, so each mode starts cold."""
+    command = [sys.executable, "-m", "src.presidio_startup_benchmark", "--child", mode, "--nlp-entities", *nlp_entities]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"mode": mode, "error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+
+
+def main():
+    """
+    Compares Presidio's startup time and memory with and without the spaCy model, e.g.:
+
+        python -m src.presidio_startup_benchmark --nlp-entities PERSON
+    """
+    parser = argparse.ArgumentParser(description="Benchmark PresidioPiiScanner startup time and memory.")
+    parser.add_argument("--nlp-entities", nargs="*", default=["PERSON"],
+                        help="NLP entities enabled in the 'nlp' mode (default: PERSON).")
+    parser.add_argument("--child", choices=["regex", "nlp"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        nlp_entities = args.nlp_entities if args.child == "nlp" else []
+        print(json.dumps(measure(args.child, nlp_entities)))
+        return
+
+    print(f"{'mode':>6} {'import':>8} {'analyzer':>9} {'1st scan':>9} {'total':>8} {'max RSS':>9}")
+    for mode in ("regex", "nlp"):
+        result = run_in_subprocess(mode, args.nlp_entities)
+        if "error" in result:
+            print(f"{mode:>6} failed: {result['error']}")
+            continue
+        print(f"{mode:>6} {result['import_seconds']:>7.2f}s {result['analyzer_seconds']:>8.2f}s "
+              f"{result['first_scan_seconds']:>8.2f}s {result['total_seconds']:>7.2f}s {result['max_rss_mb']:>7.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+from typing import List
 from .files_util import FilesUtil
+from .pii_prompt_guard import PiiPromptGuard
 
 class PromptEngine:
     @staticmethod
@@ -14,10 +16,18 @@ class PromptEngine:
         Returns:
             The constructed prompt string.
         """
+        return "".join(PromptEngine.build_prompt_segments(prompt_template_path, checklist_path, page_object_code))
+
+    @staticmethod
+    def build_prompt_segments(prompt_template_path: str, checklist_path: str, page_object_code: str = "") -> List[str]:
+        """
+        Builds a prompt like build_prompt, but returns it as segments (template text and
+        inserted values), so PiiPromptGuard can reuse the PII scans of unchanged segments.
+        """
         template = FilesUtil.read(prompt_template_path)
         checklist = FilesUtil.read(checklist_path)
 
-        template = template.replace("{{CHECKLIST}}", checklist)
-        template = template.replace("{{PAGE_OBJECT_CODE}}", page_object_code)
-
-        return template
+        return PiiPromptGuard.split_template(template, {
+            "CHECKLIST": checklist,
+            "PAGE_OBJECT_CODE": page_object_code,
+        })
@@ -0,0 +1,275 @@
+# src/rule_based_page_object_generator.py
+import keyword
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .html_distiller import DistilledElement, HtmlDistiller
+
+
+def _literal(value: str) -> str:
+    """A Python string literal for a value (repr), double-quoted like the rest of the Page Object code when possible."""
+    literal = repr(value)
+    if literal.startswith("'") and '"' not in value:
+        return f'"{literal[1:-1]}"'
+    return literal
+
+
+@dataclass(frozen=True)
+class Locator:
+    """A locator constant of a generated Page Object, e.g. USERNAME_FIELD = (By.ID, "user-name")."""
+    name: str
+    strategy: str
+    value: str
+    kind: str # 'field', 'button', 'link', 'checkbox', 'dropdown' or 'text'
+    label: str # Human-readable name used in method names and docstrings
+
+    def to_code(self) -> str:
+        return f"{self.name} = ({self.strategy}, {_literal(self.value)})"
+
+
+class RuleBasedPageObjectGenerator:
+    """
+    Generates Page Object code straight from parsed HTML, without an LLM.
+
+    Every element with an id, data-test or name becomes a locator constant, as does every
+    status or error element known only by its class (a By.CSS_SELECTOR class locator), and inputs,
+    buttons, links and text elements get the usual enter_/click_/get_ methods, in the
+    same style as the LLM-generated Page Objects (see prompts/01_page_object_from_html.txt).
+    """
+    FIELD_INPUT_TYPES = {"", "text", "password", "email", "search", "tel", "url", "number", "date"}
+    BUTTON_INPUT_TYPES = {"submit", "button", "reset", "image"}
+    SUFFIXES = {"field": "FIELD", "button": "BUTTON", "link": "LINK", "checkbox": "CHECKBOX", "dropdown": "DROPDOWN"}
+    INTERACTIVE_TAGS = {"input", "button", "select", "textarea"}
+    # Generic wrappers; identified only by an id and holding other kept elements, they are page layout
+    LAYOUT_TAGS = {"body", "main", "div", "section", "article", "header", "footer", "nav", "aside", "span"}
+    ADDRESSING_ATTRIBUTES = ("id", "data-test", "data-testid", "name")
+    # Class names usable as-is in a '.class' CSS selector
+    CSS_CLASS_NAME = re.compile(r"^-?[_a-zA-Z][_a-zA-Z0-9-]*$")
+
+    @staticmethod
+    def _kind(element: DistilledElement, attrs: dict) -> Optional[str]:
+        tag = element.tag
+        if tag == "input":
+            input_type = attrs.get("type", "").lower()
+            if input_type in RuleBasedPageObjectGenerator.BUTTON_INPUT_TYPES:
+                return "button"
+            if input_type in ("checkbox", "radio"):
+                return "checkbox"
+            if input_type == "hidden":
+                return None
+            return "field"
+        if tag == "textarea":
+            return "field"
+        if tag == "select":
+            return "dropdown"
+        if tag == "button" or attrs.get("role") == "button":
+            return "button"
+        if tag == "a":
+            return "link"
+        if tag in ("form", "label", "option", "title"):
+            return None
+        if RuleBasedPageObjectGenerator._status_class(attrs):
+            # Error and status containers are often empty until a message is shown
+            return "text"
+        if (
+            tag in RuleBasedPageObjectGenerator.LAYOUT_TAGS and element.has_children
+            and not any(attrs.get(name) for name in ("data-test", "data-testid", "name", "role", "aria-label"))
+        ):
+            return None
+        return "text" if element.text else None
+
+    @staticmethod
+    def _status_class(attrs: dict) -> Optional[str]:
+        """The first class of an error or status element (e.g. 'error-message-container'), or None."""
+        return next(
+            (
+                class_name for class_name in attrs.get("class", "").split()
+                if HtmlDistiller.STATUS_CLASS.search(class_name)
+                and RuleBasedPageObjectGenerator.CSS_CLASS_NAME.match(class_name)
+            ),
+            None,
+        )
+
+    @staticmethod
+    def _constant_name(raw_name: str, kind: str) -> str:
+        name = re.sub(r"[^a-zA-Z0-9]+", "_", raw_name).strip("_").upper()
+        if not name:
+            return ""
+        if name[0].isdigit():
+            name = f"ELEMENT_{name}"
+        if kind == "text":
+            # A bare "error" element reads better as ERROR_MESSAGE, as in the hand-written examples
+            return f"{name}_MESSAGE" if name == "ERROR" else name
+        suffix = RuleBasedPageObjectGenerator.SUFFIXES[kind]
+        return name if name.endswith(suffix) else f"{name}_{suffix}"
+
+    @staticmethod
+    def _label(constant_name: str, kind: str) -> str:
+        """The name used in method names: the constant without its '_FIELD' suffix for fields, never empty."""
+        suffix = f"_{RuleBasedPageObjectGenerator.SUFFIXES['field']}"
+        if kind == "field" and constant_name.endswith(suffix):
+            constant_name = constant_name[:-len(suffix)]
+        return constant_name.lower() or kind
+
+    @staticmethod
+    def _parameter_name(label: str) -> str:
+        """A label as a parameter name; keywords such as 'for' or 'class' get a trailing underscore."""
+        return f"{label}_" if keyword.iskeyword(label) else label
+
+    @staticmethod
+    def _css_string(value: str) -> str:
+        """Quotes a value for a CSS attribute selector."""
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    @staticmethod
+    def extract_locators(elements: List[DistilledElement]) -> List[Locator]:
+        """
+        Builds one locator per addressable element, preferring By.ID, then data-test, then By.NAME,
+        then the class of a status or error element.
+        """
+        locators: List[Locator] = []
+        used_names, used_class_selectors = set(), set()
+        for element in elements:
+            attrs = dict(element.attrs)
+            kind = RuleBasedPageObjectGenerator._kind(element, attrs)
+            if kind is None:
+                continue
+
+            data_test = attrs.get("data-test") or attrs.get("data-testid")
+            data_test_attribute = "data-test" if attrs.get("data-test") else "data-testid"
+            if attrs.get("id"):
+                strategy, value = "By.ID", attrs["id"]
+            elif data_test:
+                strategy, value = "By.CSS_SELECTOR", f"[{data_test_attribute}={RuleBasedPageObjectGenerator._css_string(data_test)}]"
+            elif attrs.get("name"):
+                strategy, value = "By.NAME", attrs["name"]
+            elif RuleBasedPageObjectGenerator._status_class(attrs):
+                strategy, value = "By.CSS_SELECTOR", f".{RuleBasedPageObjectGenerator._status_class(attrs)}"
+                # A class shared by several elements addresses only the first of them
+                if value in used_class_selectors:
+                    continue
+                used_class_selectors.add(value)
+            else:
+                continue
+
+            # data-test values are usually the most meaningful names ('username' vs 'user-name')
+            raw_name = data_test or attrs.get("id") or attrs.get("name") or value[1:]
+            name = RuleBasedPageObjectGenerator._constant_name(raw_name, kind)
+            if not name:
+                continue
+            label = RuleBasedPageObjectGenerator._label(name, kind)
+            unique_name, unique_label, index = name, label, 2
+            while unique_name in used_names:
+                unique_name, unique_label, index = f"{name}_{index}", f"{label}_{index}", index + 1
+            used_names.add(unique_name)
+            locators.append(Locator(unique_name, strategy, value, kind, unique_label))
+        return locators
+
+    @staticmethod
+    def is_simple_page(elements: List[DistilledElement]) -> bool:
+        """
+        Returns True if every form control on the page is addressable by id, data-test or name,
+        and every status or error element by one of those or a plain class name
+        (e.g. div.error-message-container), i.e. the rule-based locators cover the page without an LLM.
+        """
+        controls = [e for e in elements if e.tag in RuleBasedPageObjectGenerator.INTERACTIVE_TAGS]
+        if not controls:
+            return False
+        for element in elements:
+            attrs = dict(element.attrs)
+            if any(attrs.get(name) for name in RuleBasedPageObjectGenerator.ADDRESSING_ATTRIBUTES):
+                continue
+            if element.tag in RuleBasedPageObjectGenerator.INTERACTIVE_TAGS and attrs.get("type", "").lower() != "hidden":
+                return False
+            # Status/error elements that tests check but rules cannot address
+            if (
+                HtmlDistiller.STATUS_CLASS.search(attrs.get("class", ""))
+                and not RuleBasedPageObjectGenerator._status_class(attrs)
+            ):
+                return False
+        return True
+
+    @staticmethod
+    def _method_code(locator: Locator) -> List[str]:
+        label = locator.label
+        readable = label.replace("_", " ")
+        if locator.kind == "field":
+            parameter = RuleBasedPageObjectGenerator._parameter_name(label)
+            return [
+                f"    def enter_{label}(self, {parameter}: str):",
+                f'        """Enters text into the {readable} field."""',
+                f"        self.driver.find_element(*self.{locator.name}).send_keys({parameter})",
+            ]
+        if locator.kind in ("button", "link", "checkbox"):
+            return [
+                f"    def click_{label}(self):",
+                f'        """Clicks the {readable}."""',
+                f"        self.driver.find_element(*self.{locator.name}).click()",
+            ]
+        if locator.kind == "dropdown":
+            return [
+                f"    def select_{label}(self, visible_text: str):",
+                f'        """Selects an option of the {readable} by its visible text."""',
+                f"        Select(self.driver.find_element(*self.{locator.name})).select_by_visible_text(visible_text)",
+            ]
+        return [
+            f"    def get_{label}(self) -> str:",
+            f'        """Returns the text of the {readable}."""',
+            f"        return self.driver.find_element(*self.{locator.name}).text",
+        ]
+
+    @staticmethod
+    def generate(html: str, page_name: str, url: str = "") -> str:
+        """
+        Generates the Python code of a Page Object class for a page.
+
+        Args:
+            html: The page source (raw or distilled).
+            page_name: The name of the page (e.g. "login"), used for the class name.
+            url: The URL the Page Object opens.
+
+        Returns:
+            The generated Python code.
+        """
+        elements = HtmlDistiller.parse_elements(html)
+        locators = RuleBasedPageObjectGenerator.extract_locators(elements)
+        title = next((" ".join(e.text) for e in elements if e.tag == "title" and e.text), "")
+        # The title goes into a docstring
+        title = title.replace("\\", "").replace('"', "'")
+        class_name = f"{page_name.capitalize()}Page"
+
+        lines = [
+            "from selenium.webdriver.common.by import By",
+            "from selenium.webdriver.remote.webdriver import WebDriver",
+            "from selenium.webdriver.support.ui import WebDriverWait",
+            "from selenium.webdriver.support import expected_conditions as EC",
+        ]
+        if any(locator.kind == "dropdown" for locator in locators):
+            lines.append("from selenium.webdriver.support.ui import Select")
+        lines += [
+            "",
+            f"class {class_name}:",
+            f'    """Page object for the {(title + " ") if title else ""}{page_name} page."""',
+            "",
+            "    # Locators",
+        ]
+        lines += [f"    {locator.to_code()}" for locator in locators]
+        lines += [
+            "",
+            "    def __init__(self, driver: WebDriver):",
+            "        self.driver = driver",
+            f"        self.url = {_literal(url)}",
+            "",
+            "    def open(self):",
+            f'        """Opens the {page_name} page."""',
+            "        self.driver.get(self.url)",
+        ]
+        # Wait for the first interactive element, or just the body if there is none
+        wait_target = next((f"self.{l.name}" for l in locators if l.kind != "text"), '(By.TAG_NAME, "body")')
+        lines.append(f"        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located({wait_target}))")
+
+        for locator in locators:
+            lines.append("")
+            lines += RuleBasedPageObjectGenerator._method_code(locator)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,169 @@
+# src/run_manifest.py
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .stage_scheduler import Stage
+
+
+class RunManifest:
+    """
+    Records, per pipeline stage, a hash of everything the stage consumed (its input values,
+    the content of the files and directories they point to, and the extra files the stage
+    reads such as prompt templates) together with the outputs it produced and their content hashes.
+
+    A stage whose input hash matches its last successful run, and whose output files are
+    unchanged since, can be skipped and its recorded outputs reused, like a `make` target.
+    """
+    PATH = "generated/run_manifest.json"
+    FORMAT_VERSION = 1
+    CHUNK_SIZE = 1024 * 1024
+    # Directory entries that change without the directory's meaning changing
+    IGNORED_NAMES = {"__pycache__", ".pytest_cache"}
+    # Longer strings (prompts, LLM responses) are values, never paths
+    MAX_PATH_CHARS = 1024
+
+    def __init__(self, path: str = PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stages: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format_version") == RunManifest.FORMAT_VERSION:
+                self.stages = data.get("stages", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable run manifest '{path}': {e}")
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        """Converts a context value to JSON, tagging Paths so they are restored as Paths."""
+        if isinstance(value, Path):
+            return {"__path__": str(value)}
+        if isinstance(value, (list, tuple)):
+            return [RunManifest._encode(item) for item in value]
+        if isinstance(value, dict):
+            return {str(key): RunManifest._encode(item) for key, item in value.items()}
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        raise RuntimeError(f"Cannot record a stage output of type {type(value).__name__}")
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        if isinstance(value, list):
+            return [RunManifest._decode(item) for item in value]
+        if isinstance(value, dict):
+            if set(value) == {"__path__"}:
+                return Path(value["__path__"])
+            return {key: RunManifest._decode(item) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def _paths_in(value: Any) -> Iterable[str]:
+        """Yields the values (also inside lists) that name existing files or directories."""
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                yield from RunManifest._paths_in(item)
+        elif isinstance(value, (str, Path)):
+            candidate = str(value)
+            if candidate and len(candidate) <= RunManifest.MAX_PATH_CHARS and "\n" not in candidate:
+                try:
+                    if os.path.exists(candidate):
+                        yield candidate
+                except (OSError, ValueError):
+                    pass
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(RunManifest.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_path(path: str) -> Optional[str]:
+        """Content hash of a file, or of a directory's relative file names and contents; None if missing."""
+        if os.path.isfile(path):
+            return RunManifest.hash_file(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in RunManifest.IGNORED_NAMES)
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8", "surrogateescape"))
+                digest.update(RunManifest.hash_file(file_path).encode("ascii"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _file_hashes(values: Iterable[Any]) -> Dict[str, Optional[str]]:
+        hashes = {}
+        for value in values:
+            for path in RunManifest._paths_in(value):
+                hashes[path] = RunManifest.hash_path(path)
+        return hashes
+
+    @staticmethod
+    def input_hash(stage: Stage, ctx: Dict[str, Any]) -> str:
+        """Hashes the stage's input values, the content of the paths among them and the stage's extra files."""
+        inputs = {name: ctx.get(name) for name in stage.inputs}
+        files = RunManifest._file_hashes(list(inputs.values()))
+        files.update({path: RunManifest.hash_path(path) for path in stage.files})
+        material = {"stage": stage.name, "inputs": RunManifest._encode(inputs), "files": files}
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, stage: Stage, ctx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the recorded outputs of a stage if it is up to date: its inputs hash as in its
+        last successful run and its output files are unchanged since. Returns None otherwise.
+        """
+        with self._lock:
+            record = self.stages.get(stage.name)
+        if record is None or record.get("input_hash") != RunManifest.input_hash(stage, ctx):
+            return None
+        for path, recorded_hash in record.get("output_files", {}).items():
+            if recorded_hash is None or RunManifest.hash_path(path) != recorded_hash:
+                return None
+        return RunManifest._decode(record.get("outputs", {}))
+
+    def restore(self, stage: Stage) -> Dict[str, Any]:
+        """Returns the recorded outputs of a stage without checking them, for resuming a run mid-pipeline."""
+        with self._lock:
+            record = self.stages.get(stage.name)
+        if record is None:
+            raise RuntimeError(f"No recorded outputs for stage '{stage.name}' in '{self.path}'; run it first")
+        return RunManifest._decode(record.get("outputs", {}))
+
+    def record(self, stage: Stage, ctx: Dict[str, Any], outputs: Dict[str, Any], seconds: float):
+        """Records a successful run of a stage and saves the manifest."""
+        outputs = {name: outputs[name] for name in stage.outputs if name in outputs}
+        entry = {
+            "input_hash": RunManifest.input_hash(stage, ctx),
+            "outputs": RunManifest._encode(outputs),
+            "output_files": RunManifest._file_hashes(list(outputs.values())),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seconds": round(seconds, 3),
+        }
+        with self._lock:
+            self.stages[stage.name] = entry
+            self._save()
+
+    def _save(self):
+        data = {"format_version": RunManifest.FORMAT_VERSION, "stages": self.stages}
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first so an interrupted run never leaves a truncated manifest
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            raise RuntimeError(f"Cannot write run manifest: {self.path}") from e
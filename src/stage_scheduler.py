@@ -0,0 +1,275 @@
+# src/stage_scheduler.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .run_manifest import RunManifest
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline. `func` receives the shared context dict and returns a dict of
+    the values it produces (its `outputs`), which are merged into the context.
+    A stage runs once every stage producing one of its `inputs` has finished.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    # A failed critical stage stops the pipeline; other failures only skip the stages depending on it
+    critical: bool = True
+    title: str = ""
+    # Files read by the stage besides its inputs (e.g. prompt templates); part of its input hash
+    files: Tuple[str, ...] = ()
+    # Depends on the outside world (a live site, a browser), so it is never skipped as up to date
+    volatile: bool = False
+
+
+@dataclass
+class StageResult:
+    """
+    What happened to a stage: 'ok', 'cached' (outputs reused from the run manifest),
+    'failed', 'skipped' (a dependency failed) or 'cancelled'.
+    """
+    name: str
+    status: str
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    error: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
+
+
+class StageScheduler:
+    """
+    Runs a DAG of stages, starting each stage as soon as its inputs are available, with up
+    to `max_workers` stages running concurrently. Dependencies are derived from the stages'
+    declared inputs and outputs.
+
+    After a run, `critical_path()` returns the chain of stages that bounded the total run time.
+
+    With a RunManifest, each stage has a policy: 'auto' skips it if it is up to date,
+    'force' always runs it and 'restore' reuses its recorded outputs without running it.
+    """
+    SUCCESS_STATUSES = ("ok", "cached")
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        max_workers: int = 4,
+        on_event: Optional[Callable[[str, StageResult], None]] = None,
+        manifest: Optional["RunManifest"] = None,
+        policies: Optional[Dict[str, str]] = None,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise RuntimeError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self.max_workers = max(1, max_workers)
+        # Called with ('started' | 'finished' | 'failed' | 'skipped' | 'cancelled', result)
+        self.on_event = on_event
+        self.manifest = manifest
+        self.policies = policies or {}
+        self.results: Dict[str, StageResult] = {}
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+        self._producers: Dict[str, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise RuntimeError(f"Output '{output}' is produced by both {self._producers[output]} and {stage.name}")
+                self._producers[output] = stage.name
+        self.dependencies: Dict[str, List[str]] = {
+            stage.name: sorted({self._producers[i] for i in stage.inputs if i in self._producers})
+            for stage in stages
+        }
+        self._check_acyclic()
+
+    def ancestors(self, names: List[str]) -> List[str]:
+        """Returns the stages the given stages depend on, directly or transitively."""
+        found, stack = set(), list(names)
+        while stack:
+            for dependency in self.dependencies[stack.pop()]:
+                if dependency not in found:
+                    found.add(dependency)
+                    stack.append(dependency)
+        return [name for name in self.stages if name in found]
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str, path: List[str]):
+            if name in done:
+                return
+            if name in visiting:
+                raise RuntimeError(f"Stage dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self.dependencies[name]:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    def _emit(self, event: str, result: StageResult):
+        if self.on_event is not None:
+            try:
+                self.on_event(event, result)
+            except Exception as e:
+                print(f"Warning: Stage event handler failed: {e}")
+
+    def _run_stage(self, stage: Stage, ctx: Dict[str, Any], ctx_lock: threading.Lock) -> StageResult:
+        with Tracer.span(stage.name, "stage") as span:
+            result = self._run_stage_untraced(stage, ctx, ctx_lock)
+            span.set(status=result.status)
+            if result.error:
+                span.set(error=result.error)
+        return result
+
+    def _run_stage_untraced(self, stage: Stage, ctx: Dict[str, Any], ctx_lock: threading.Lock) -> StageResult:
+        result = StageResult(stage.name, "running", started_at=time.perf_counter())
+        self._emit("started", result)
+        if stage.title:
+            print(f"\n{stage.title}")
+        try:
+            with ctx_lock:
+                stage_ctx = dict(ctx)
+            policy = self.policies.get(stage.name, "auto")
+            outputs = None
+            if self.manifest is not None and policy == "restore":
+                outputs = self.manifest.restore(stage)
+            elif self.manifest is not None and policy == "auto" and not stage.volatile:
+                outputs = self.manifest.lookup(stage, stage_ctx)
+            if outputs is not None:
+                print("-> Reusing the outputs recorded in the run manifest.")
+                result.status = "cached"
+            else:
+                outputs = stage.func(stage_ctx) or {}
+                result.status = "ok"
+            missing = [output for output in stage.outputs if output not in outputs]
+            if missing:
+                raise RuntimeError(f"Stage {stage.name} did not produce: {', '.join(missing)}")
+            if self.manifest is not None and result.status == "ok":
+                self.manifest.record(stage, stage_ctx, outputs, time.perf_counter() - result.started_at)
+            with ctx_lock:
+                ctx.update(outputs)
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)
+            print(f"Error in {stage.title.split(':')[0] if stage.title else stage.name}: {e}")
+        result.finished_at = time.perf_counter()
+        return result
+
+    def run(self, ctx: Optional[Dict[str, Any]] = None) -> Dict[str, StageResult]:
+        """
+        Runs all stages.
+
+        Args:
+            ctx: The initial context (values not produced by any stage); updated in place
+                with the stages' outputs.
+
+        Returns:
+            The StageResult of every stage, by name.
+        """
+        ctx = ctx if ctx is not None else {}
+        ctx_lock = threading.Lock()
+        for stage in self.stages.values():
+            missing = [i for i in stage.inputs if i not in self._producers and i not in ctx]
+            if missing:
+                raise RuntimeError(f"Stage {stage.name} needs inputs nobody provides: {', '.join(missing)}")
+
+        self.results = {}
+        self.started_at = time.perf_counter()
+        pending = dict(self.stages)
+        running: Dict[Future, str] = {}
+        stopped = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                # Skip stages whose dependencies failed; start the ready ones (in declaration order)
+                for name in list(pending):
+                    dependency_results = [self.results.get(d) for d in self.dependencies[name]]
+                    if any(r is not None and r.status not in self.SUCCESS_STATUSES for r in dependency_results):
+                        now = time.perf_counter()
+                        self.results[name] = StageResult(name, "skipped", now, now, "a dependency did not succeed")
+                        self._emit("skipped", self.results[name])
+                        del pending[name]
+                    elif not stopped and all(r is not None for r in dependency_results):
+                        running[executor.submit(self._run_stage, pending.pop(name), ctx, ctx_lock)] = name
+
+                if stopped:
+                    for name in list(pending):
+                        now = time.perf_counter()
+                        self.results[name] = StageResult(name, "cancelled", now, now, "the pipeline stopped")
+                        self._emit("cancelled", self.results[name])
+                        del pending[name]
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    self.results[name] = result
+                    self._emit("failed" if result.status == "failed" else "finished", result)
+                    if result.status == "failed" and self.stages[name].critical:
+                        stopped = True
+
+        self.finished_at = time.perf_counter()
+        return self.results
+
+    @property
+    def succeeded(self) -> bool:
+        """True if every critical stage ran successfully (non-critical failures are tolerated)."""
+        return bool(self.results) and all(
+            result.status in self.SUCCESS_STATUSES for name, result in self.results.items() if self.stages[name].critical
+        )
+
+    def critical_path(self) -> List[str]:
+        """
+        Returns the stages that bounded the run time, in order: starting from the stage that
+        finished last, each step goes to the dependency that finished last (the one it waited for).
+        """
+        ran = {name: r for name, r in self.results.items() if r.status in ("ok", "cached", "failed")}
+        if not ran:
+            return []
+        path = [max(ran, key=lambda name: ran[name].finished_at)]
+        while True:
+            dependencies = [d for d in self.dependencies[path[-1]] if d in ran]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=lambda name: ran[name].finished_at))
+        return list(reversed(path))
+
+    def summary(self) -> str:
+        """A table of stage timings, with the critical path and the time saved by running stages concurrently."""
+        critical = self.critical_path()
+        lines = [f"{'stage':<26} {'status':<9} {'start':>7} {'seconds':>8}"]
+        for name in self.stages:
+            result = self.results.get(name)
+            if result is None:
+                continue
+            marker = " *" if name in critical else ""
+            offset = result.started_at - self.started_at if result.started_at else 0.0
+            lines.append(f"{name:<26} {result.status:<9} {offset:>6.1f}s {result.seconds:>7.1f}s{marker}")
+        total = self.finished_at - self.started_at
+        serial = sum(result.seconds for result in self.results.values())
+        cached = [name for name, result in self.results.items() if result.status == "cached"]
+        critical_seconds = sum(self.results[name].seconds for name in critical)
+        lines.append(f"Total: {total:.1f}s wall, {serial:.1f}s if run serially.")
+        if cached:
+            lines.append(f"Reused {len(cached)} up-to-date stage(s) from the run manifest.")
+        lines.append(f"Critical path (*, {critical_seconds:.1f}s): {' -> '.join(critical)}")
+        return "\n".join(lines)
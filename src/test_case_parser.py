@@ -62,3 +62,111 @@ def extract_code_from_response(text: str) -> str:
         # raise ValueError("No Python code block found in LLM output (expected ```python\\n...```).")
         print("Warning: No ```python code block found in LLM output. Returning raw text.")
         return text.strip()
+
+
+class IncrementalCodeExtractor:
+    """
+    Incremental counterpart of extract_code_from_response for streamed LLM output.
+    Feed it content deltas; it returns the code as soon as the ```python block is closed.
+    """
+    OPENING_FENCE = "```python\n"
+    CLOSING_FENCE = "```"
+
+    def __init__(self):
+        self.text = ""
+        self.result = None
+        self._code_start = -1
+        self._scan_from = 0
+
+    def feed(self, delta: str):
+        """
+        Appends a content delta.
+
+        Returns:
+            The extracted code once the closing fence has arrived, otherwise None.
+        """
+        if self.result is not None:
+            return self.result
+        self.text += delta
+
+        if self._code_start == -1:
+            fence_index = self.text.find(self.OPENING_FENCE, self._scan_from)
+            if fence_index == -1:
+                # Keep a fence-sized tail so a fence split across deltas is still found
+                self._scan_from = max(0, len(self.text) - len(self.OPENING_FENCE))
+                return None
+            self._code_start = fence_index + len(self.OPENING_FENCE)
+            self._scan_from = self._code_start
+
+        closing_index = self.text.find(self.CLOSING_FENCE, self._scan_from)
+        if closing_index == -1:
+            self._scan_from = max(self._code_start, len(self.text) - len(self.CLOSING_FENCE))
+            return None
+        self.result = self.text[self._code_start:closing_index].strip()
+        return self.result
+
+    def finish(self) -> str:
+        """Returns the code at the end of the stream, falling back to extract_code_from_response."""
+        if self.result is not None:
+            return self.result
+        return extract_code_from_response(self.text)
+
+
+class IncrementalJsonExtractor:
+    """
+    Incremental counterpart of extract_json_from_response for streamed LLM output.
+    Feed it content deltas; it returns the top-level JSON object as soon as its braces balance.
+    Braces inside JSON strings (including escaped quotes) are not counted.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.result = None
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._scan_from = 0
+
+    def feed(self, delta: str):
+        """
+        Appends a content delta.
+
+        Returns:
+            The JSON object string once it is complete, otherwise None.
+        """
+        if self.result is not None:
+            return self.result
+        self.text += delta
+
+        for index in range(self._scan_from, len(self.text)):
+            char = self.text[index]
+            if self._start == -1:
+                if char == "{":
+                    self._start = index
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = self.text[self._start:index + 1]
+                    return self.result
+        self._scan_from = len(self.text)
+        return None
+
+    def finish(self) -> str:
+        """Returns the JSON object at the end of the stream, falling back to extract_json_from_response."""
+        if self.result is not None:
+            return self.result
+        return extract_json_from_response(self.text)
@@ -12,12 +12,13 @@ class TestRunAnalyzer:
     OUTPUT_FILE_NAME = "test_run_analysis.json"
 
     @staticmethod
-    def analyze_test_run(pytest_output_path: str) -> Path:
+    def analyze_test_run(pytest_output_path: str, output_dir: str = ".") -> Path:
         """
         Analyzes raw pytest output using LLM to generate a QA summary and detect bugs.
 
         Args:
             pytest_output_path: Path to the raw pytest output file.
+            output_dir: Directory the generated/ directory is created in.
 
         Returns:
             Path to the generated JSON file with analysis output.
@@ -45,9 +46,10 @@ class TestRunAnalyzer:
             analysis_output = TestRunAnalysisOutput.model_validate_json(json_str)
             
             # Ensure output directory exists
-            Path("generated").mkdir(parents=True, exist_ok=True)
+            generated_dir = Path(output_dir) / "generated"
+            generated_dir.mkdir(parents=True, exist_ok=True)
             
-            output_file_path = Path("generated") / TestRunAnalyzer.OUTPUT_FILE_NAME
+            output_file_path = generated_dir / TestRunAnalyzer.OUTPUT_FILE_NAME
             FilesUtil.write(str(output_file_path), analysis_output.model_dump_json(indent=2))
             
             print(f"-> Test run analysis saved to '{output_file_path}'")
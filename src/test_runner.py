@@ -1,13 +1,10 @@
 # src/test_runner.py
-import pytest
 import os
 import subprocess
-import io
 import shutil
 from pathlib import Path
 from typing import Tuple
 import sys 
-from contextlib import redirect_stdout
 from .files_util import FilesUtil # New import
 
 
@@ -15,27 +12,43 @@ class TestRunner:
     PYTEST_OUTPUT_FILE = "generated/pytest_output.txt"
     ALLURE_RESULTS_DIR = "generated/allure-results"
     ALLURE_REPORT_DIR = "generated/allure-report"
+    # Provides the `driver` fixture; copied next to tests generated outside the project root
+    CONFTEST_PATH = Path(__file__).resolve().parent.parent / "tests" / "conftest.py"
+    TIMEOUT_SECONDS = 1800
 
     @staticmethod
-    def _clean_old_results():
+    def _clean_old_results(output_dir: str = "."):
         """Cleans up old Allure results and report directories."""
-        if Path(TestRunner.ALLURE_RESULTS_DIR).exists():
-            shutil.rmtree(TestRunner.ALLURE_RESULTS_DIR)
-        if Path(TestRunner.ALLURE_REPORT_DIR).exists():
-            shutil.rmtree(TestRunner.ALLURE_REPORT_DIR)
+        root = Path(output_dir)
+        if (root / TestRunner.ALLURE_RESULTS_DIR).exists():
+            shutil.rmtree(root / TestRunner.ALLURE_RESULTS_DIR)
+        if (root / TestRunner.ALLURE_REPORT_DIR).exists():
+            shutil.rmtree(root / TestRunner.ALLURE_REPORT_DIR)
         
         # Also clean up old pytest output
-        if Path(TestRunner.PYTEST_OUTPUT_FILE).exists():
-            os.remove(TestRunner.PYTEST_OUTPUT_FILE)
+        if (root / TestRunner.PYTEST_OUTPUT_FILE).exists():
+            os.remove(root / TestRunner.PYTEST_OUTPUT_FILE)
 
+    @staticmethod
+    def ensure_conftest(test_dir: Path):
+        """Copies the project's conftest.py (the `driver` fixture) into a test directory that has none."""
+        conftest_path = test_dir / "conftest.py"
+        if not conftest_path.exists() and TestRunner.CONFTEST_PATH.exists():
+            test_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(TestRunner.CONFTEST_PATH, conftest_path)
 
     @staticmethod
-    def run_tests_and_collect_results(test_dir: str = "tests") -> Tuple[str, Path, Path]:
+    def run_tests_and_collect_results(test_dir: str = "tests", output_dir: str = ".") -> Tuple[str, Path, Path]:
         """
         Runs pytest tests, captures output, and collects Allure results.
 
+        pytest runs in a separate process started in `output_dir`, so the generated tests import
+        the Page Objects next to them (`from pages.login_page import ...`), and concurrent
+        pipelines never share pytest's module state or the redirected stdout of this process.
+
         Args:
-            test_dir: The directory containing the tests to run.
+            test_dir: The directory containing the tests to run, relative to `output_dir`.
+            output_dir: Directory holding the tests/, pages/ and generated/ directories of the run.
 
         Returns:
             A tuple containing:
@@ -43,45 +56,45 @@ class TestRunner:
             - Path to the Allure results directory (Path).
             - Path to the Allure report directory (Path).
         """
-        TestRunner._clean_old_results()
+        root = Path(output_dir)
+        TestRunner._clean_old_results(output_dir)
         
         # Ensure 'generated' directory exists
-        Path("generated").mkdir(parents=True, exist_ok=True)
-        Path(TestRunner.ALLURE_RESULTS_DIR).mkdir(parents=True, exist_ok=True)
-
-
-        # Capture stdout of pytest.main()
-        captured_output_buffer = io.StringIO()
-        original_stdout = sys.stdout # Save original stdout
-
+        (root / "generated").mkdir(parents=True, exist_ok=True)
+        (root / TestRunner.ALLURE_RESULTS_DIR).mkdir(parents=True, exist_ok=True)
+        TestRunner.ensure_conftest(root / test_dir)
+
+        # -s to show print statements, -q for quiet output, --alluredir to collect allure data
+        # -W ignore to ignore warnings that might clutter the output
+        pytest_args = [
+            test_dir,
+            "--alluredir", TestRunner.ALLURE_RESULTS_DIR,
+            "-s", "-q", "-W", "ignore::DeprecationWarning", # Ignore some common warnings
+        ]
+        print(f"Running pytest with args: {pytest_args} in '{output_dir}'")
         try:
-            sys.stdout = captured_output_buffer # Redirect sys.stdout
-            
-            # Run pytest programmatically
-            # -s to show print statements, -q for quiet output, --alluredir to collect allure data
-            # -W ignore to ignore warnings that might clutter the output
-            pytest_args = [
-                test_dir,
-                "--alluredir", TestRunner.ALLURE_RESULTS_DIR,
-                "-s", "-q", "-W", "ignore::DeprecationWarning", # Ignore some common warnings
-            ]
-            
-            print(f"Running pytest with args: {pytest_args}", file=original_stdout) # Print to original stdout
-            pytest.main(pytest_args)
-        finally:
-            sys.stdout = original_stdout # Restore original stdout
-
-        captured_output = captured_output_buffer.getvalue()
+            # `python -m pytest` puts the working directory on sys.path, making pages/ importable
+            completed = subprocess.run(
+                [sys.executable, "-m", "pytest", *pytest_args],
+                cwd=output_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=TestRunner.TIMEOUT_SECONDS,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"pytest did not finish within {TestRunner.TIMEOUT_SECONDS}s") from e
+        captured_output = completed.stdout
 
         # Save captured pytest output to a file
-        FilesUtil.write(TestRunner.PYTEST_OUTPUT_FILE, captured_output)
-        print(f"-> Pytest raw output saved to '{TestRunner.PYTEST_OUTPUT_FILE}'")
-
+        pytest_output_path = str(root / TestRunner.PYTEST_OUTPUT_FILE)
+        FilesUtil.write(pytest_output_path, captured_output)
+        print(f"-> Pytest raw output saved to '{pytest_output_path}' (exit code {completed.returncode})")
 
         return (
-            TestRunner.PYTEST_OUTPUT_FILE,
-            Path(TestRunner.ALLURE_RESULTS_DIR),
-            Path(TestRunner.ALLURE_REPORT_DIR)
+            pytest_output_path,
+            root / TestRunner.ALLURE_RESULTS_DIR,
+            root / TestRunner.ALLURE_REPORT_DIR
         )
 
     @staticmethod
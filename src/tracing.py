@@ -0,0 +1,191 @@
+# src/tracing.py
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class Span:
+    """
+    A timed section of the run, recorded as a Chrome trace 'complete' event when it exits.
+    Attributes set with `set` / `add` (token counts, bytes, retries...) become the event's args.
+    """
+    __slots__ = ("name", "category", "args", "_started_at")
+
+    enabled = True
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self._started_at = 0.0
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def add(self, key: str, amount: float = 1):
+        self.args[key] = self.args.get(key, 0) + amount
+
+    def __enter__(self) -> "Span":
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        finished_at = time.perf_counter()
+        # A generator closed early (e.g. a stream cut off once its payload is complete) is not an error
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        Tracer._record(self, self._started_at, finished_at)
+        return False
+
+
+class _NoOpSpan:
+    """Returned by Tracer.span while tracing is off: every operation does nothing."""
+    __slots__ = ()
+
+    enabled = False
+
+    def set(self, **args):
+        pass
+
+    def add(self, key: str, amount: float = 1):
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+class Tracer:
+    """
+    Process-wide span recorder for pipeline stages and LLM calls.
+
+    Tracing is off unless enabled (PIPELINE_TRACE=1 or `python -m src.pipeline_main --trace`);
+    while off, `Tracer.span(...)` returns a shared no-op span, so instrumented code pays one
+    attribute check per span. The recorded spans are written as a Chrome trace
+    (load it in chrome://tracing or https://ui.perfetto.dev) and summarized in a table.
+    """
+    ENABLED = os.getenv("PIPELINE_TRACE", "").lower() in ("1", "true", "yes", "on")
+    TRACE_PATH = "generated/trace.json"
+    # Numeric span attributes totalled per span name in the summary
+    SUMMED_ARGS = ("prompt_tokens", "completion_tokens", "bytes_sent", "bytes_received", "retries", "cache_hit")
+
+    _events: List[dict] = []
+    _thread_names: Dict[int, str] = {}
+    _lock = threading.Lock()
+    _origin = time.perf_counter()
+
+    @staticmethod
+    def enable():
+        """Starts recording spans (clearing any recorded before)."""
+        with Tracer._lock:
+            Tracer._events = []
+            Tracer._thread_names = {}
+            Tracer._origin = time.perf_counter()
+        Tracer.ENABLED = True
+
+    @staticmethod
+    def disable():
+        Tracer.ENABLED = False
+
+    @staticmethod
+    def span(name: str, category: str = "stage", **args):
+        """
+        Returns a context manager timing the enclosed block, e.g.
+
+            with Tracer.span("MistralClient.call", "llm") as span:
+                ...
+                span.set(prompt_tokens=120)
+        """
+        if not Tracer.ENABLED:
+            return _NO_OP_SPAN
+        return Span(name, category, args)
+
+    @staticmethod
+    def _record(span: Span, started_at: float, finished_at: float):
+        thread = threading.current_thread()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            # Chrome trace timestamps and durations are in microseconds
+            "ts": round((started_at - Tracer._origin) * 1e6, 1),
+            "dur": round((finished_at - started_at) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": span.args,
+        }
+        with Tracer._lock:
+            Tracer._events.append(event)
+            Tracer._thread_names.setdefault(thread.ident, thread.name)
+
+    @staticmethod
+    def events() -> List[dict]:
+        with Tracer._lock:
+            return list(Tracer._events)
+
+    @staticmethod
+    def write(path: Optional[str] = None) -> str:
+        """Writes the recorded spans as a Chrome trace JSON file and returns its path."""
+        path = path or Tracer.TRACE_PATH
+        with Tracer._lock:
+            events = list(Tracer._events)
+            thread_names = dict(Tracer._thread_names)
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, default=str)
+        except OSError as e:
+            raise RuntimeError(f"Cannot write trace file: {path}") from e
+        return path
+
+    @staticmethod
+    def summary() -> str:
+        """A table of the recorded spans per category and name: count, total and max time, and LLM usage."""
+        totals: Dict[tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for event in Tracer.events():
+            row = totals[(event["cat"], event["name"])]
+            row["count"] += 1
+            row["seconds"] += event["dur"] / 1e6
+            row["max_seconds"] = max(row["max_seconds"], event["dur"] / 1e6)
+            row["errors"] += "error" in event["args"]
+            for key in Tracer.SUMMED_ARGS:
+                value = event["args"].get(key)
+                if isinstance(value, (int, float)):
+                    row[key] += value
+        if not totals:
+            return "Trace: no spans recorded."
+
+        lines = [
+            f"{'category':<8} {'name':<34} {'count':>5} {'total':>8} {'max':>7} {'errors':>6} "
+            f"{'prompt tok':>10} {'compl tok':>9} {'sent':>9} {'received':>9} {'retries':>7} {'cached':>6}"
+        ]
+        for (category, name), row in sorted(totals.items(), key=lambda item: (item[0][0], -item[1]["seconds"])):
+            lines.append(
+                f"{category:<8} {name[:34]:<34} {int(row['count']):>5} {row['seconds']:>7.2f}s {row['max_seconds']:>6.2f}s "
+                f"{int(row['errors']):>6} {int(row['prompt_tokens']):>10} {int(row['completion_tokens']):>9} "
+                f"{Tracer._format_bytes(row['bytes_sent']):>9} {Tracer._format_bytes(row['bytes_received']):>9} "
+                f"{int(row['retries']):>7} {int(row['cache_hit']):>6}"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_bytes(size: float) -> str:
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+            size /= 1024
+        return f"{size:.1f}GB"